@@ -1,5 +1,4 @@
-from tennis_logger.gui import TennisLoggerApp
+from tennis_logger.main import main
 
 if __name__ == "__main__":
-    app = TennisLoggerApp()
-    app.mainloop()
+    main()
@@ -0,0 +1,262 @@
+"""
+Rolling archive of closed daily logs.
+
+Closed days (every daily log except today's) are rolled into one archive per
+month: <base>_archive_YYYYMM.gz holds the rows as independently compressed
+gzip members of BLOCK_ROWS rows each, and <base>_archive_YYYYMM.json indexes
+every day's blocks. A single day, or a row range of a day, is read by seeking
+to its blocks without decompressing the rest of the month. The concatenated
+members are still a valid gzip stream, so `zcat` works on an archive too.
+Re-adding a day compacts the archive first: the month is rewritten without
+the day's old blocks, so replaced copies do not pile up.
+
+open_log()/read_log_bytes() hide the difference between live and archived
+days from readers and the analytics notebook.
+
+Usage:
+    python -m tennis_logger.archive            # roll every closed day
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import re
+from datetime import datetime
+
+from .livelog import has_commit_record, lock_path, read_committed
+from .logfiles import list_daily_logs, day_of
+from .reader import MatchLogReader
+
+BLOCK_ROWS = 1000
+ARCHIVE_VERSION = 1
+
+
+def archive_paths(directory, base_filename, month):
+    """(data path, index path) of the archive for month 'YYYYMM'"""
+    stem = os.path.join(directory, f"{os.path.basename(base_filename)}_archive_{month}")
+    return stem + ".gz", stem + ".json"
+
+
+class LogArchive:
+    def __init__(self, data_path, index_path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.days = {}  # day -> {"header", "blocks", "rows", "size", "mtime"}
+        if os.path.isfile(index_path):
+            with open(index_path, mode='r', encoding='utf-8') as f:
+                self.days = json.load(f).get("days", {})
+
+    @classmethod
+    def for_month(cls, directory, base_filename, month):
+        return cls(*archive_paths(directory, base_filename, month))
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump({"version": ARCHIVE_VERSION, "days": self.days}, f, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def add_day(self, day, csv_path):
+        """Compress a daily log into the archive (replacing an older copy of the day)"""
+        if day in self.days:
+            self.compact(drop=day)
+        st = os.stat(csv_path)
+        blocks = []
+        with MatchLogReader(csv_path) as reader, open(self.data_path, mode='ab') as out:
+            offset = out.tell()
+            for first in range(0, len(reader), BLOCK_ROWS):
+                stop = min(first + BLOCK_ROWS, len(reader))
+                member = gzip.compress(reader.raw_rows(first, stop), mtime=0)
+                out.write(member)
+                blocks.append({"offset": offset, "length": len(member),
+                               "first_row": first, "rows": stop - first})
+                offset += len(member)
+            header = reader.header
+            rows = len(reader)
+        # Index is written after the data, so a crash never indexes missing bytes
+        self.days[day] = {"header": header, "blocks": blocks, "rows": rows,
+                          "size": st.st_size, "mtime": st.st_mtime}
+        self._save_index()
+
+    def compact(self, drop=()):
+        """
+        Rewrite the data file with only the indexed blocks (tmp + os.replace), leaving out
+        the days in drop. Returns the bytes reclaimed.
+        """
+        drop = {drop} if isinstance(drop, str) else set(drop)
+        if not os.path.isfile(self.data_path):
+            return 0
+        before = os.path.getsize(self.data_path)
+        kept = sorted((day for day in self.days if day not in drop),
+                      key=lambda d: self.days[d]["blocks"][0]["offset"] if self.days[d]["blocks"] else 0)
+        days = {}
+        tmp_path = self.data_path + ".tmp"
+        with open(self.data_path, mode='rb') as src, open(tmp_path, mode='wb') as out:
+            for day in kept:
+                blocks = []
+                for block in self.days[day]["blocks"]:
+                    src.seek(block["offset"])
+                    blocks.append(dict(block, offset=out.tell()))
+                    out.write(src.read(block["length"]))
+                days[day] = dict(self.days[day], blocks=blocks)
+        os.replace(tmp_path, self.data_path)
+        self.days = days
+        self._save_index()
+        return before - os.path.getsize(self.data_path)
+
+    def _read_blocks(self, blocks):
+        chunks = []
+        with open(self.data_path, mode='rb') as f:
+            for block in blocks:
+                f.seek(block["offset"])
+                chunks.append(gzip.decompress(f.read(block["length"])))
+        return b"".join(chunks)
+
+    def _header_line(self, day):
+        buf = io.StringIO()
+        csv.writer(buf).writerow(self.days[day]["header"])
+        return buf.getvalue().encode("utf-8")
+
+    def read_day_bytes(self, day):
+        """The day's log exactly as a CSV file (header included)"""
+        return self._header_line(day) + self._read_blocks(self.days[day]["blocks"])
+
+    def open_day(self, day):
+        return MatchLogReader.from_bytes(self.read_day_bytes(day))
+
+    def read_rows(self, day, start=0, stop=None):
+        """Rows [start, stop) of a day, decompressing only the blocks they live in"""
+        entry = self.days[day]
+        start, stop, _ = slice(start, stop).indices(entry["rows"])
+        blocks = [b for b in entry["blocks"]
+                  if b["first_row"] < stop and b["first_row"] + b["rows"] > start]
+        if not blocks:
+            return []
+        data = self._header_line(day) + self._read_blocks(blocks)
+        first = blocks[0]["first_row"]
+        return MatchLogReader.from_bytes(data)[start - first:stop - first]
+
+
+def list_archives(directory=".", base_filename="tennis_log"):
+    """Sorted [(month 'YYYYMM', LogArchive)] found in a directory"""
+    pattern = re.compile(rf"^{re.escape(os.path.basename(base_filename))}_archive_(\d{{6}})\.json$")
+    archives = []
+    for name in sorted(os.listdir(directory or ".")):
+        match = pattern.match(name)
+        if match:
+            archives.append((match.group(1), LogArchive.for_month(directory, base_filename, match.group(1))))
+    return archives
+
+
+class DaySource:
+    """A day's log, live (CSV path) or archived (LogArchive)"""
+    def __init__(self, day, path=None, archive=None):
+        self.day = day
+        self.path = path
+        self.archive = archive
+
+    @property
+    def archived(self):
+        return self.path is None
+
+    def stat(self):
+        """(size, mtime) of the day's CSV (as it was when archived)"""
+        if self.archived:
+            entry = self.archive.days[self.day]
+            return entry["size"], entry["mtime"]
+        st = os.stat(self.path)
+        return st.st_size, st.st_mtime
+
+    def open(self):
+        if self.archived:
+            return self.archive.open_day(self.day)
+        if has_commit_record(self.path):
+            # Possibly still being written: read a committed snapshot instead of mapping it
+            return MatchLogReader.from_bytes(read_committed(self.path)[1])
+        return MatchLogReader(self.path)
+
+    def read_bytes(self):
+        if self.archived:
+            return self.archive.read_day_bytes(self.day)
+        if has_commit_record(self.path):
+            return read_committed(self.path)[1]
+        with open(self.path, mode='rb') as f:
+            return f.read()
+
+
+def list_log_days(directory=".", base_filename="tennis_log"):
+    """Sorted [DaySource] over live and archived days (a live file wins)"""
+    sources = {}
+    for _, archive in list_archives(directory, base_filename):
+        for day in archive.days:
+            sources[day] = DaySource(day, archive=archive)
+    for day, path in list_daily_logs(directory, base_filename):
+        sources[day] = DaySource(day, path=path)
+    return [sources[day] for day in sorted(sources)]
+
+
+def _source_for_path(path):
+    directory, name = os.path.split(path)
+    day = day_of(name)
+    base_filename = name[:-len(f"_{day}.csv")] if day else None
+    if os.path.isfile(path) or not day:
+        return DaySource(day, path=path)
+    archive = LogArchive.for_month(directory, base_filename, day[:6])
+    if day not in archive.days:
+        raise FileNotFoundError(path)
+    return DaySource(day, archive=archive)
+
+
+def open_log(path):
+    """MatchLogReader over a daily log, whether it is still live or archived"""
+    return _source_for_path(path).open()
+
+
+def read_log_bytes(path):
+    """CSV content of a daily log, whether it is still live or archived"""
+    return _source_for_path(path).read_bytes()
+
+
+def roll_closed_days(directory=".", base_filename="tennis_log", keep=None, today=None):
+    """
+    Move every closed daily log into its month's archive.
+    keep: path of the live log to leave alone (MatchLogger.filename)
+    Returns the archived days.
+    """
+    today = (today or datetime.now()).strftime("%Y%m%d")
+    keep = os.path.abspath(keep) if keep else None
+    rolled = []
+    archives = {}
+    for day, path in list_daily_logs(directory, base_filename):
+        if day >= today or os.path.abspath(path) == keep:
+            continue
+        month = day[:6]
+        if month not in archives:
+            archives[month] = LogArchive.for_month(directory, base_filename, month)
+        archive = archives[month]
+        archive.add_day(day, path)
+        # Only drop the CSV once the archived copy reads back identically
+        with open(path, mode='rb') as f:
+            original = f.read()
+        if MatchLogReader.from_bytes(original)[:] != archive.open_day(day)[:]:
+            raise IOError(f"Archive verification failed for {path}")
+        os.remove(path)
+        if has_commit_record(path):
+            os.remove(lock_path(path))
+        rolled.append(day)
+    return rolled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll closed daily logs into monthly archives")
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--base", default="tennis_log")
+    args = parser.parse_args(argv)
+    rolled = roll_closed_days(args.dir, args.base)
+    print(f"Archived {len(rolled)} day(s): {', '.join(rolled)}")
+
+
+if __name__ == "__main__":
+    main()
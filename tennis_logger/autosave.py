@@ -0,0 +1,101 @@
+"""
+Autosave of the in-progress point and score.
+
+The GUI hands a small snapshot dict (the GameState score plus the half-filled
+form: server, serve code, pattern, notes, ...) to Autosave.save() whenever
+something changes. That call only swaps a reference under a lock; a
+background thread writes the newest snapshot at most once per interval as
+JSON, via a temporary file and os.replace, so a crash or a laptop going to
+sleep mid-point never leaves a torn file. The snapshot is restored on launch.
+"""
+import json
+import os
+import threading
+import time
+
+DEFAULT_INTERVAL_MS = 500
+AUTOSAVE_VERSION = 1
+
+
+def load_snapshot(path):
+    """The last saved snapshot, or None if there is none (or it is unreadable)"""
+    try:
+        with open(path, mode='r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != AUTOSAVE_VERSION:
+        return None
+    return snapshot
+
+
+class Autosave:
+    def __init__(self, path, interval_ms=DEFAULT_INTERVAL_MS):
+        self.path = path
+        self.interval = interval_ms / 1000.0
+        self.writes = 0
+        self.last_error = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._last_write = 0.0
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def save(self, snapshot):
+        """Queue snapshot (a JSON-able dict) for writing; only the newest one is kept"""
+        with self._lock:
+            self._pending = snapshot
+            self._wake.set()
+
+    def _take(self):
+        with self._lock:
+            snapshot, self._pending = self._pending, None
+            self._wake.clear()
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            # Debounce: at most one write per interval
+            delay = self._last_write + self.interval - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            snapshot = self._take()
+            if snapshot is not None:
+                self._write(snapshot)
+
+    def _write(self, snapshot):
+        snapshot = dict(snapshot, version=AUTOSAVE_VERSION, saved_at=time.time())
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, mode='w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self.writes += 1
+        except (OSError, TypeError, ValueError) as e:
+            self.last_error = e
+            print(f"Autosave failed: {e}")
+        self._last_write = time.monotonic()
+
+    def flush(self):
+        """Write any pending snapshot now (on the calling thread)"""
+        snapshot = self._take()
+        if snapshot is not None:
+            self._write(snapshot)
+
+    def close(self):
+        """Stop the writer thread after writing the last pending snapshot"""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def clear(self):
+        """Drop the saved snapshot (e.g. when a new match starts)"""
+        self._take()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
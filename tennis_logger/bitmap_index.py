@@ -0,0 +1,209 @@
+"""
+Bitmap index over the categorical log columns.
+
+Each day's log becomes one segment holding a bitmap (a Python int, bit i =
+row i of the day) per distinct value of the indexed columns, per pattern tag
+and per situation tag. Queries AND the bitmaps across columns and OR them
+across the values of one column, segment by segment, and popcount the
+result - the CSVs are never opened. Each segment is stored as its own
+zlib-compressed JSON file (see daystore), and refresh() only indexes the days
+that are new or whose log changed, so a point logged today rewrites today's
+segment and nothing else.
+
+Usage:
+    python -m tennis_logger.bitmap_index --last-days 90 serve_number=2 situation=BREAK_POINT \\
+        "pattern=Approach (A)|Net Play (N)"
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+
+from .archive import list_log_days
+from .daystore import DayStore, day_key
+from .export import clean_value
+from .game_state import decode_situation
+
+INDEX_VERSION = 3
+INDEXED_COLUMNS = ("server", "serve_number", "serve_code", "rally_len_shots",
+                   "pattern", "final_shot_type", "final_outcome", "set_no")
+TAG_COLUMNS = ("pattern",)  # multi-valued "A|B" columns: one bitmap per tag
+SITUATION = "situation"  # pseudo-column built from the pressure_flags bitfield
+
+
+def _row_values(row):
+    """{column: [values]} for one row"""
+    values = {}
+    for col in INDEXED_COLUMNS:
+        raw = row.get(col, "")
+        if col in TAG_COLUMNS:
+            values[col] = [clean_value(tag) for tag in raw.split("|") if clean_value(tag)]
+        else:
+            values[col] = [clean_value(raw)]
+    values[SITUATION] = decode_situation(row.get("pressure_flags", ""))
+    return values
+
+
+def build_segment(reader):
+    """Bitmaps of one day's rows: {"rows": n, "bitmaps": {col: {value: int}}}"""
+    positions = {}
+    for i, row in enumerate(reader):
+        for col, values in _row_values(row).items():
+            by_value = positions.setdefault(col, {})
+            for value in values:
+                by_value.setdefault(value, []).append(i)
+    rows = len(reader)
+    bitmaps = {}
+    for col, by_value in positions.items():
+        bitmaps[col] = {}
+        for value, rows_with_value in by_value.items():
+            bits = bytearray((rows + 7) // 8)
+            for i in rows_with_value:
+                bits[i >> 3] |= 1 << (i & 7)
+            bitmaps[col][value] = int.from_bytes(bits, "little")
+    return {"rows": rows, "bitmaps": bitmaps}
+
+
+def _encode_segment(seg):
+    bitmaps = {col: {value: format(bits, "x") for value, bits in by_value.items()}
+               for col, by_value in seg["bitmaps"].items()}
+    return dict(seg, bitmaps=bitmaps)
+
+
+def _decode_segment(seg):
+    seg["bitmaps"] = {col: {value: int(bits, 16) for value, bits in by_value.items()}
+                      for col, by_value in seg["bitmaps"].items()}
+    return seg
+
+
+class BitmapIndex:
+    def __init__(self, directory=".", base_filename="tennis_log", path=None):
+        """path: directory of the per-day segment files"""
+        self.directory = directory
+        self.base_filename = base_filename
+        self.path = path or os.path.join(directory, f"{os.path.basename(base_filename)}_bitmaps")
+        self._store = DayStore(self.path, INDEX_VERSION, segmented=True, compress=True,
+                               encode=_encode_segment, decode=_decode_segment)
+        self.segments = self._store.entries  # day -> {"rows", "size", "mtime", "bitmaps"}
+
+    def save(self):
+        self._store.save()
+
+    @staticmethod
+    def _build(source, seg):
+        with source.open() as reader:
+            return build_segment(reader)
+
+    def refresh(self, days=None):
+        """Index new or changed days (live or archived; all, or only the given 'YYYYMMDD' days); returns them"""
+        changed, _ = self._store.refresh(list_log_days(self.directory, self.base_filename), self._build, days)
+        return changed
+
+    def values(self, column):
+        """Distinct indexed values of a column"""
+        found = set()
+        for seg in self.segments.values():
+            found.update(seg["bitmaps"].get(column, {}))
+        return sorted(found)
+
+    def _days(self, since=None, until=None, days=None):
+        since = day_key(since) if since else None
+        until = day_key(until) if until else None
+        wanted = {day_key(d) for d in days} if days else None
+        for day in sorted(self.segments):
+            if (since and day < since) or (until and day > until) or (wanted and day not in wanted):
+                continue
+            yield day, self.segments[day]
+
+    @staticmethod
+    def _match(seg, filters):
+        """Bitmap of a segment's rows matching every filter"""
+        result = (1 << seg["rows"]) - 1
+        for col, wanted in filters.items():
+            bitmaps = seg["bitmaps"].get(col, {})
+            if not isinstance(wanted, (list, tuple, set)):
+                wanted = [wanted]
+            if col == SITUATION:
+                # Situation tags must all be present
+                for tag in wanted:
+                    result &= bitmaps.get(tag, 0)
+            else:
+                any_of = 0
+                for value in wanted:
+                    any_of |= bitmaps.get(str(value), 0)
+                result &= any_of
+            if not result:
+                break
+        return result
+
+    def match(self, since=None, until=None, days=None, **filters):
+        """Yield (day, bitmap of matching rows) for every selected day"""
+        for day, seg in self._days(since, until, days):
+            yield day, self._match(seg, filters)
+
+    def rows(self, since=None, until=None, days=None, **filters):
+        """[(day, row number)] of the matching points"""
+        found = []
+        for day, bits in self.match(since, until, days, **filters):
+            while bits:
+                low = bits & -bits
+                found.append((day, low.bit_length() - 1))
+                bits ^= low
+        return found
+
+    def query(self, since=None, until=None, days=None, **filters):
+        """
+        Counts and win rate of the points matching filters.
+        filters: column=value or column=[values] (OR), combined with AND;
+                 situation=[tags] requires every tag, e.g. situation='BREAK_POINT'
+        """
+        points = won = lost = 0
+        for day, bits in self.match(since, until, days, **filters):
+            if not bits:
+                continue
+            outcome = self.segments[day]["bitmaps"].get("final_outcome", {})
+            points += bits.bit_count()
+            won += (bits & outcome.get("W", 0)).bit_count()
+            lost += (bits & outcome.get("L", 0)).bit_count()
+        decided = won + lost
+        return {
+            "points": points,
+            "won": won,
+            "lost": lost,
+            "win_rate": round(100.0 * won / decided, 1) if decided else None,
+        }
+
+    def last_days(self, days, today=None, **filters):
+        today = today or datetime.now()
+        return self.query(since=today - timedelta(days=days - 1), until=today, **filters)
+
+
+def parse_filters(specs):
+    """Command-line filters ['column=value|value', ...] -> {column: [values]} for query() / rows()"""
+    filters = {}
+    for spec in specs:
+        col, sep, values = spec.partition("=")
+        if not sep:
+            raise ValueError(f"Expected column=value, got {spec!r}")
+        filters[col] = values.split("|")
+    return filters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh and query the bitmap index")
+    parser.add_argument("filters", nargs="*", help="column=value[|value...]")
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--base", default="tennis_log")
+    parser.add_argument("--last-days", type=int)
+    args = parser.parse_args(argv)
+
+    index = BitmapIndex(args.dir, args.base)
+    index.refresh()
+    filters = parse_filters(args.filters)
+    if args.last_days:
+        print(index.last_days(args.last_days, **filters))
+    else:
+        print(index.query(**filters))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Catalog of every daily log file with a small per-file summary.
+
+The catalog lives next to the logs as <base_filename>_catalog.json and covers
+live and archived days alike. Refreshing it only rescans files whose size or
+mtime changed since the last refresh, so questions like "which days had more
+than 200 points" never open unrelated logs.
+
+Usage:
+    python -m tennis_logger.catalog --min-points 200
+    python -m tennis_logger.catalog --last-days 30
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+
+from .archive import DaySource, list_log_days
+from .daystore import DayStore, day_key, same_file
+from .logfiles import day_of, list_daily_logs  # noqa: F401 (re-export)
+
+CATALOG_VERSION = 4
+
+
+def is_new_match(prev, row):
+    """
+    True if row starts a new match after prev (both row dicts).
+    Rows that carry a match_id (see matches.py) start a new match when it
+    changes. Older rows fall back on the score: it only moves forward within
+    a match, so going back to an earlier set or game means it was reset.
+    """
+    if prev is None:
+        return True
+    if prev.get("match_id") and row.get("match_id"):
+        return row["match_id"] != prev["match_id"]
+    try:
+        prev_key = (int(prev.get("set_no") or 0), int(prev.get("game_no") or 0))
+        key = (int(row.get("set_no") or 0), int(row.get("game_no") or 0))
+    except ValueError:
+        return False
+    return key < prev_key
+
+
+def summarize_log(source):
+    """Scan a day's log (path or archive.DaySource) and return its catalog entry"""
+    if not isinstance(source, DaySource):
+        source = DaySource(day_of(source), path=source)
+    size, mtime = source.stat()
+    entry = {
+        "path": source.path or "",
+        "archived": source.archived,
+        "size": size,
+        "mtime": mtime,
+        "rows": 0,
+        "matches": 0,
+        "first_timestamp": "",
+        "last_timestamp": "",
+        "won_on_serve": 0,
+        "lost_on_serve": 0,
+        "won_on_return": 0,
+        "lost_on_return": 0,
+    }
+    prev = None
+    with source.open() as reader:
+        entry["rows"] = len(reader)
+        for row in reader:
+            if is_new_match(prev, row):
+                entry["matches"] += 1
+            prev = row
+            outcome = row.get("final_outcome", "")
+            if outcome not in ("W", "L"):
+                continue
+            side = "serve" if row.get("server") in ("m", "n") else "return"
+            result = "won" if outcome == "W" else "lost"
+            entry[f"{result}_on_{side}"] += 1
+        if len(reader):
+            entry["first_timestamp"] = reader[0].get("timestamp", "")
+            entry["last_timestamp"] = reader[-1].get("timestamp", "")
+    return entry
+
+
+class LogCatalog:
+    def __init__(self, directory=".", base_filename="tennis_log", path=None):
+        self.directory = directory
+        self.base_filename = base_filename
+        self.path = path or os.path.join(directory, f"{os.path.basename(base_filename)}_catalog.json")
+        self._store = DayStore(self.path, CATALOG_VERSION)
+        self.files = self._store.entries  # day -> entry
+
+    def save(self):
+        self._store.save()
+
+    @staticmethod
+    def _fresh(source, entry, size, mtime):
+        return same_file(source, entry, size, mtime) and entry["archived"] == source.archived
+
+    @staticmethod
+    def _build(source, entry):
+        if entry and same_file(source, entry, *source.stat()):
+            # Rolled into an archive unchanged: no rescan needed
+            return dict(entry, archived=source.archived, path=source.path or "")
+        return summarize_log(source)
+
+    def refresh(self):
+        """Rescan new or changed files, drop deleted ones; returns rescanned days"""
+        rescanned, _ = self._store.refresh(list_log_days(self.directory, self.base_filename),
+                                           self._build, fresh=self._fresh)
+        return rescanned
+
+    def entries(self):
+        """All entries sorted by day, each with its 'date' key"""
+        return [dict(self.files[day], date=day) for day in sorted(self.files)]
+
+    def query(self, min_points=None, max_points=None, since=None, until=None):
+        """Entries matching a point-count range and/or a date range (inclusive)"""
+        since = day_key(since) if since else None
+        until = day_key(until) if until else None
+        results = []
+        for entry in self.entries():
+            if since and entry["date"] < since:
+                continue
+            if until and entry["date"] > until:
+                continue
+            if min_points is not None and entry["rows"] < min_points:
+                continue
+            if max_points is not None and entry["rows"] > max_points:
+                continue
+            results.append(entry)
+        return results
+
+    def last_days(self, days, today=None):
+        today = today or datetime.now()
+        return self.query(since=today - timedelta(days=days - 1), until=today)
+
+    def paths(self, **criteria):
+        """Paths of the live files matching query(**criteria)"""
+        return [entry["path"] for entry in self.query(**criteria) if not entry["archived"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh and query the daily log catalog")
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--base", default="tennis_log")
+    parser.add_argument("--min-points", type=int)
+    parser.add_argument("--last-days", type=int)
+    args = parser.parse_args(argv)
+
+    catalog = LogCatalog(args.dir, args.base)
+    catalog.refresh()
+    if args.last_days:
+        entries = [e for e in catalog.last_days(args.last_days)
+                   if args.min_points is None or e["rows"] >= args.min_points]
+    else:
+        entries = catalog.query(min_points=args.min_points)
+    for e in entries:
+        print(f"{e['date']}  points={e['rows']:5d}  matches={e['matches']}  "
+              f"serve W/L={e['won_on_serve']}/{e['lost_on_serve']}  "
+              f"return W/L={e['won_on_return']}/{e['lost_on_return']}  {e['path'] or '(archived)'}")
+
+
+if __name__ == "__main__":
+    main()
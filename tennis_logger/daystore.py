@@ -0,0 +1,141 @@
+"""
+Day-indexed sidecar stores.
+
+The log catalog, the summary store and the bitmap and notes indexes all keep
+one entry per daily log, live or archived (see archive.list_log_days), and
+keep it current the same way: a day is rebuilt only when its log's size or
+mtime changed, and the days whose log is gone are dropped. DayStore is that
+shared part - loading with a version check, refreshing and atomic saves
+(tmp + os.replace).
+
+A store is either one file holding every day, for small entries, or
+segmented: a directory with one file per day, so that a change to today's
+log rewrites today's segment only, not the whole store.
+"""
+import json
+import os
+import zlib
+
+SEGMENT_SUFFIX = ".seg"
+
+
+def day_key(day):
+    """'YYYYMMDD' from 'YYYYMMDD', 'YYYY-MM-DD', a date or a datetime"""
+    if hasattr(day, "strftime"):
+        return day.strftime("%Y%m%d")
+    return str(day).replace("-", "")
+
+
+def same_file(source, entry, size, mtime):
+    """Default freshness test: the log has the size and mtime the entry was built from"""
+    return entry["size"] == size and entry["mtime"] == mtime
+
+
+def _write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode='wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _identity(value):
+    return value
+
+
+class DayStore:
+    def __init__(self, path, version, segmented=False, compress=False, encode=_identity, decode=_identity):
+        """
+        path: the store file, or the segment directory when segmented
+        version: data written under another version is ignored (and rebuilt by refresh)
+        compress: zlib-compress the JSON
+        encode / decode: entry <-> JSON-able value
+        """
+        self.path = path
+        self.version = version
+        self.segmented = segmented
+        self.compress = compress
+        self.encode = encode
+        self.decode = decode
+        self.entries = {}  # day -> entry, with the "size" and "mtime" of the log it was built from
+        self.load()
+
+    def _read(self, path):
+        """Payload of a store file, or None if it is missing, corrupt or of another version"""
+        try:
+            with open(path, mode='rb') as f:
+                data = f.read()
+            data = json.loads(zlib.decompress(data) if self.compress else data)
+        except (OSError, ValueError, zlib.error):
+            return None
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            return None
+        return data
+
+    def _dump(self, payload):
+        data = json.dumps(dict(payload, version=self.version), separators=(",", ":")).encode("utf-8")
+        return zlib.compress(data, 6) if self.compress else data
+
+    def _segment_path(self, day):
+        return os.path.join(self.path, day + SEGMENT_SUFFIX)
+
+    def load(self):
+        self.entries.clear()
+        if not self.segmented:
+            data = self._read(self.path)
+            if data:
+                self.entries.update((day, self.decode(entry)) for day, entry in data["days"].items())
+            return
+        if not os.path.isdir(self.path):
+            return
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(SEGMENT_SUFFIX):
+                data = self._read(os.path.join(self.path, name))
+                if data:
+                    self.entries[name[:-len(SEGMENT_SUFFIX)]] = self.decode(data["entry"])
+
+    def save(self, days=None):
+        """
+        Write the store. Segmented, only the segments of the given days are written (all
+        by default) and those of days no longer in the store are deleted.
+        """
+        if not self.segmented:
+            days = {day: self.encode(entry) for day, entry in self.entries.items()}
+            _write_atomic(self.path, self._dump({"days": days}))
+            return
+        os.makedirs(self.path, exist_ok=True)
+        for day in list(self.entries) if days is None else days:
+            path = self._segment_path(day)
+            if day in self.entries:
+                _write_atomic(path, self._dump({"entry": self.encode(self.entries[day])}))
+            elif os.path.isfile(path):
+                os.remove(path)
+
+    def refresh(self, sources, build, days=None, fresh=same_file):
+        """
+        Rebuild the entries of new or changed days and save them; returns (changed days, removed days).
+        sources: archive.DaySource list
+        build(source, entry): the day's new entry; entry is the current one (None for a new day),
+                              so a log that only grew can be extended instead of rebuilt
+        days: only refresh these days ('YYYYMMDD'); deleted days are then kept
+        fresh(source, entry, size, mtime): True while an entry is current
+        """
+        changed = []
+        seen = set()
+        for source in sources:
+            seen.add(source.day)
+            if days and source.day not in days:
+                continue
+            size, mtime = source.stat()
+            entry = self.entries.get(source.day)
+            if entry is not None and fresh(source, entry, size, mtime):
+                continue
+            entry = build(source, entry)
+            entry.update(size=size, mtime=mtime)
+            self.entries[source.day] = entry
+            changed.append(source.day)
+        removed = [] if days else [day for day in self.entries if day not in seen]
+        for day in removed:
+            del self.entries[day]
+        if changed or removed:
+            self.save(changed + removed)
+        return changed, removed
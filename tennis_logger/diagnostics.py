@@ -0,0 +1,179 @@
+"""
+Memory diagnostics and caps for long unattended sessions.
+
+MemoryMonitor samples tracemalloc (current / peak traced memory and the top
+allocating lines) together with the size of the structures that grow with a
+session - undo/redo histories, caches, open popups - and appends each sample
+as one JSON line to a file. MemoryCaps turns the numbers into action: a
+history holding more entries than its cap is trimmed (spilling to its sidecar
+file, or evicting when it has none), an oversized cache is cleared, and when
+traced memory passes the budget every registered history and cache is cut.
+
+Usage:
+    python run.py --diagnostics memory.jsonl --diagnostics-interval 60 --history-cap 100 --memory-cap-mb 200
+In the GUI, Ctrl+Shift+D opens the diagnostics panel.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import deque
+
+MIN_HISTORY_DEPTH = 10  # Histories are never trimmed below this
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate bytes held by obj and the containers / objects it references"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, array)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class MemoryCaps:
+    def __init__(self, history_entries=None, cache_entries=None, traced_mb=None):
+        """
+        history_entries: most history entries kept in memory (per history)
+        cache_entries: most entries per lru_cache before it is cleared
+        traced_mb: traced-memory budget; above it all histories and caches are cut
+        """
+        self.history_entries = history_entries
+        self.cache_entries = cache_entries
+        self.traced_mb = traced_mb
+
+    def any(self):
+        """True if at least one cap is set"""
+        return any(cap is not None for cap in (self.history_entries, self.cache_entries, self.traced_mb))
+
+    def history_depth(self, default):
+        """Depth to create histories with: the history cap when set (never below MIN_HISTORY_DEPTH)"""
+        if self.history_entries is None:
+            return default
+        return max(MIN_HISTORY_DEPTH, self.history_entries)
+
+    def enforce(self, histories, caches, traced_bytes):
+        """Apply the caps; returns the actions taken as strings"""
+        actions = []
+        over_budget = self.traced_mb is not None and traced_bytes > self.traced_mb * 1024 * 1024
+        for name, history in histories.items():
+            cap = self.history_entries
+            if over_budget:
+                cap = max(MIN_HISTORY_DEPTH, min(cap or history.depth, history.in_memory()) // 2)
+            if cap is not None and history.in_memory() > cap:
+                kept = max(MIN_HISTORY_DEPTH, cap)
+                history.trim(kept)
+                verb = "spilled" if history.path else "evicted"
+                actions.append(f"{name}: {verb} to {kept} in memory")
+        for name, cache in caches.items():
+            currsize = cache.cache_info().currsize
+            if currsize and (over_budget or (self.cache_entries is not None and currsize > self.cache_entries)):
+                cache.cache_clear()
+                actions.append(f"{name}: cleared {currsize} entries")
+        return actions
+
+
+class MemoryMonitor:
+    def __init__(self, path=None, caps=None, top=10):
+        """
+        path: JSON-lines file each sample is appended to (None: keep in memory only)
+        top: number of top allocating source lines reported per sample
+        """
+        self.path = path
+        self.caps = caps or MemoryCaps()
+        self.top = top
+        self.components = {}  # name -> object, or callable returning it
+        self.histories = {}  # name -> BoundedHistory (subject to caps)
+        self.caches = {}  # name -> lru_cache-wrapped function
+        self.gauges = {}  # name -> callable returning a number
+        self.last_sample = None
+
+    def start(self, frames=1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def watch(self, name, obj):
+        """Report the deep size of obj (or of obj() when it is callable)"""
+        self.components[name] = obj
+
+    def watch_history(self, name, history):
+        self.histories[name] = history
+        self.components[name] = history
+
+    def watch_cache(self, name, cached_function):
+        self.caches[name] = cached_function
+
+    def gauge(self, name, fn):
+        """Report fn() as-is (counts of open popups, queue lengths, ...)"""
+        self.gauges[name] = fn
+
+    def sample(self):
+        """Take one sample, apply the caps and append it to the file"""
+        started = time.perf_counter()
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        components = {}
+        for name, obj in self.components.items():
+            components[name] = deep_sizeof(obj() if callable(obj) else obj)
+        sample = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "traced_current": current,
+            "traced_peak": peak,
+            "components": components,
+            "histories": {name: {"in_memory": h.in_memory(), "total": len(h)} for name, h in self.histories.items()},
+            "caches": {name: fn.cache_info().currsize for name, fn in self.caches.items()},
+            "gauges": {name: fn() for name, fn in self.gauges.items()},
+            "top": [],
+        }
+        if tracing and self.top:
+            stats = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )).statistics("lineno")
+            sample["top"] = [{"where": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                             for stat in stats[:self.top]]
+        sample["actions"] = self.caps.enforce(self.histories, self.caches, current)
+        sample["sample_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+        if self.path:
+            with open(self.path, mode='a', encoding='utf-8') as f:
+                f.write(json.dumps(sample, separators=(",", ":")) + "\n")
+        self.last_sample = sample
+        return sample
+
+    @staticmethod
+    def format(sample):
+        """Human-readable text of a sample (for the diagnostics panel)"""
+        kib = lambda n: f"{n / 1024:.1f} KiB"
+        lines = [f"Sampled {sample['time']} in {sample['sample_ms']} ms",
+                 f"Traced: {kib(sample['traced_current'])} (peak {kib(sample['traced_peak'])})", ""]
+        for name, size in sorted(sample["components"].items()):
+            lines.append(f"{name}: {kib(size)}")
+        for name, h in sorted(sample["histories"].items()):
+            lines.append(f"{name}: {h['in_memory']} of {h['total']} entries in memory")
+        for name, size in sorted(sample["caches"].items()):
+            lines.append(f"{name}: {size} cached entries")
+        for name, value in sorted(sample["gauges"].items()):
+            lines.append(f"{name}: {value}")
+        if sample["top"]:
+            lines += ["", "Top allocations:"]
+            lines += [f"  {t['where']}: {kib(t['bytes'])} in {t['count']} blocks" for t in sample["top"]]
+        if sample["actions"]:
+            lines += ["", "Caps applied:"] + [f"  {a}" for a in sample["actions"]]
+        return "\n".join(lines)
@@ -0,0 +1,138 @@
+"""
+In-process event bus between the GUI and its consumers.
+
+The GUI publishes what happened (a point was logged, undone, redone, the score
+was edited, a match was closed) and the consumers - CSV writer, statistics, checkpoints,
+instrumentation - subscribe to the event types they care about:
+
+    bus = EventBus()
+    bus.subscribe(PointLogged, logger_writer)                 # runs inline, in order
+    bus.subscribe(PointLogged, checkpoint, threaded=True)     # runs on a worker thread
+    bus.publish(PointLogged(row, game_winner=None))
+
+Threaded subscribers get a bounded queue each; when a slow consumer falls a
+full queue behind, publish() blocks until it catches up (backpressure)
+instead of letting the backlog grow without limit.
+"""
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import namedtuple
+
+# written: the row is already in the log (a batch written in one go), the CSV writer skips it
+PointLogged = namedtuple("PointLogged", "row game_winner written", defaults=(False,))
+PointUndone = namedtuple("PointUndone", "row")
+PointRedone = namedtuple("PointRedone", "row game_winner")
+ScoreEdited = namedtuple("ScoreEdited", "score counts")  # display score, score_counts() tuple
+MatchClosed = namedtuple("MatchClosed", "entry")  # the match registry entry (see matches.py)
+
+EVENT_TYPES = (PointLogged, PointUndone, PointRedone, ScoreEdited, MatchClosed)
+DEFAULT_QUEUE_SIZE = 256
+_STOP = object()
+
+
+class _Subscriber:
+    def __init__(self, event_type, handler, threaded, queue_size):
+        self.event_type = event_type
+        self.handler = handler
+        self.name = getattr(handler, "__name__", repr(handler))
+        self.delivered = 0
+        self.errors = 0
+        self.blocked_ms = 0.0  # time publish() waited on a full queue
+        self.max_queued = 0
+        self.queue = None
+        self.thread = None
+        if threaded:
+            self.queue = queue.Queue(maxsize=queue_size)
+            self.thread = threading.Thread(target=self._run, name=f"events-{self.name}", daemon=True)
+            self.thread.start()
+
+    def deliver(self, event):
+        if self.queue is None:
+            self.handler(event)  # Inline: errors reach the publisher
+            self.delivered += 1
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            started = time.perf_counter()
+            self.queue.put(event)
+            self.blocked_ms += (time.perf_counter() - started) * 1000.0
+        self.max_queued = max(self.max_queued, self.queue.qsize())
+
+    def _run(self):
+        while True:
+            event = self.queue.get()
+            try:
+                if event is _STOP:
+                    return
+                self.handler(event)
+                self.delivered += 1
+            except Exception:
+                self.errors += 1
+                print(f"Event handler {self.name} failed:", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                self.queue.task_done()
+
+    def stats(self):
+        return {
+            "handler": self.name,
+            "event": self.event_type.__name__,
+            "threaded": self.queue is not None,
+            "delivered": self.delivered,
+            "errors": self.errors,
+            "queued": self.queue.qsize() if self.queue else 0,
+            "max_queued": self.max_queued,
+            "blocked_ms": round(self.blocked_ms, 3),
+        }
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = {}  # event type -> [_Subscriber]
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type, handler, threaded=False, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Call handler(event) for every published event of event_type.
+        threaded: run on a dedicated worker thread with a bounded queue (the handler
+                  must not touch Tk widgets); otherwise inline, in subscription order
+        """
+        sub = _Subscriber(event_type, handler, threaded, queue_size)
+        with self._lock:
+            self._subscribers.setdefault(event_type, []).append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.get(sub.event_type, []).remove(sub)
+        if sub.queue is not None:
+            sub.queue.put(_STOP)
+            sub.thread.join()
+
+    def publish(self, event):
+        for sub in self._subscribers.get(type(event), ()):
+            sub.deliver(event)
+
+    def drain(self):
+        """Wait until every threaded subscriber has handled what was published"""
+        for subs in list(self._subscribers.values()):
+            for sub in subs:
+                if sub.queue is not None:
+                    sub.queue.join()
+
+    def close(self):
+        """Drain and stop the worker threads"""
+        with self._lock:
+            subs = [sub for subs in self._subscribers.values() for sub in subs]
+            self._subscribers = {}
+        for sub in subs:
+            if sub.queue is not None:
+                sub.queue.put(_STOP)
+                sub.thread.join()
+
+    def stats(self):
+        return [sub.stats() for subs in self._subscribers.values() for sub in subs]
@@ -0,0 +1,267 @@
+"""
+Streaming export of daily logs to the analytics schema codes.
+
+The GUI logs display strings ("Ace (A) [6]", "Medium", "m", "W") while the
+analytics notebook validates against short codes ('A', 5, 'n', 'PtWon|W', or
+plain 'PtWon' when How? was not tagged).
+Everything here is generator based: rows are read, normalized and written one
+chunk at a time, so converting years of logs never holds more than a chunk in
+memory.
+
+Usage:
+    python -m tennis_logger.export tennis_log_*.csv -o normalized.csv
+    python -m tennis_logger.export tennis_log_*.csv -o normalized.jsonl --format jsonl
+    python -m tennis_logger.export -o everything.csv     # every live and archived day
+"""
+import argparse
+import csv
+import json
+import re
+from functools import lru_cache
+from itertools import islice
+
+from .archive import DaySource, list_log_days, open_log
+from .game_state import decode_situation
+from .logger import MatchLogger
+
+EXPORT_COLUMNS = MatchLogger.SCHEMA_COLUMNS
+DEFAULT_CHUNK_SIZE = 5000
+FORMATS = ("csv", "jsonl", "columns")
+
+# Trailing counters the GUI appends to a selection, e.g. "In (I) [6]"
+_COUNT_SUFFIX = re.compile(r"\s*\[\d+\]\s*$")
+
+SERVER_CODES = {"m": "n", "n": "n", "Me": "n", "o": "o", "Opponent": "o"}
+
+SERVE_CODES = {
+    "In (I)": "IN",
+    "Fault (SF)": "SF",
+    "Double Fault (DF)": "DF",
+    "Wide (WB)": "WB",
+    "Ace (A)": "A",
+    "Winner (W)": "W",
+    "Unknown (UNK)": "",
+}
+
+# Representative shot counts, chosen to land in the notebook's rally bins
+RALLY_SHOTS = {"Short": 2, "Medium": 5, "Long": 9}
+
+# Point type & tactic tags split into the notebook's pattern / tactic enums
+PATTERN_CODES = {
+    "Rally (R)": "RALLY",
+    "First Strike (F)": "FIRST",
+    "Serve + 1 (S1)": "FIRST",
+    "Return + 1 (R1)": "FIRST",
+    "Approach (A)": "APPROACH",
+    "Chip & Charge (CC)": "APPROACH",
+    "Net Play (N)": "NET",
+    "Serve & Volley (SV)": "NET",
+    "Lob/Deep Ball (L)": "LOB_DEF",
+    "Defense (D)": "LOB_DEF",
+}
+
+TACTIC_CODES = {
+    "Move Opponent (M)": "MOVE_OP",
+    "Body (B)": "BODY",
+    "Pace (PC)": "PACE",
+    "Drop Shot (DS)": "CHANGE_DIR",
+}
+
+# How? options -> (final_shot_type, outcome cause)
+HOW_CODES = {
+    "Forced Error (FE)": ("", "FE"),
+    "Unforced Error (UE)": ("", "UE"),
+    "Double Fault (DF)": ("", "DF"),
+    "Ace (A)": ("", "W"),
+    "Backhand Winner (BW)": ("B", "W"),
+    "Cross Court Winner (CC)": ("", "W"),
+    "Down the Line Winner (DTL)": ("", "W"),
+    "Drop Shot Winner (DW)": ("D", "W"),
+    "Forehand Winner (FW)": ("F", "W"),
+    "Lob Winner (LW)": ("L", "W"),
+    "Overhead Winner (OW)": ("O", "W"),
+    "Passing Shot Winner (PW)": ("", "W"),
+    "Service Winner (SW)": ("", "W"),
+    "Volley Winner (VW)": ("V", "W"),
+}
+
+OUTCOME_MAIN = {"W": "PtWon", "L": "PtLost"}
+
+# Columns that carry no information when the GUI leaves them as placeholders
+_PLACEHOLDERS = {"N/A", "Unknown (UNK)"}
+
+
+def clean_value(value):
+    """Strip whitespace, count suffixes and placeholder values"""
+    if value is None:
+        return ""
+    value = _COUNT_SUFFIX.sub("", str(value).strip())
+    return "" if value in _PLACEHOLDERS else value
+
+
+@lru_cache(maxsize=4096)
+def split_tags(pattern, tactic):
+    """Map the merged Point Type & Tactic tags to (pattern, tactic_code)"""
+    pattern_code = tactic_code = ""
+    for field in (pattern, tactic):
+        for tag in field.split("|"):
+            tag = tag.strip()
+            if not pattern_code and tag in PATTERN_CODES:
+                pattern_code = PATTERN_CODES[tag]
+            if not tactic_code and tag in TACTIC_CODES:
+                tactic_code = TACTIC_CODES[tag]
+    # Already-normalized logs pass straight through
+    if not pattern_code and pattern in PATTERN_CODES.values():
+        pattern_code = pattern
+    if not tactic_code and tactic in TACTIC_CODES.values():
+        tactic_code = tactic
+    return pattern_code, tactic_code
+
+
+def _rally_shots(value):
+    if value in RALLY_SHOTS:
+        return RALLY_SHOTS[value]
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def _int_or_blank(value):
+    try:
+        return int(value)
+    except ValueError:
+        return ""
+
+
+@lru_cache(maxsize=256)
+def pressure_tags(value):
+    """Situation bitfield -> 'BREAK_POINT;DEUCE' (non-numeric values pass through)"""
+    if not value.isdigit():
+        return value
+    return ";".join(decode_situation(value))
+
+
+def normalize_row(row):
+    """Return a new dict with the row's fields mapped to the analytics codes"""
+    get = lambda col: clean_value(row.get(col))
+    serve_code = get("serve_code")
+    how = get("final_shot_type")
+    shot_type, cause = HOW_CODES.get(how, (how, ""))
+    if not cause and serve_code == "Double Fault (DF)":
+        cause = "DF"  # Recorded by the serve code; any other unknown How? stays without a cause
+
+    outcome = get("final_outcome")
+    if outcome in OUTCOME_MAIN:
+        outcome = f"{OUTCOME_MAIN[outcome]}|{cause}" if cause else OUTCOME_MAIN[outcome]
+    elif outcome == "U":
+        outcome = ""
+
+    pattern, tactic = split_tags(get("pattern"), get("tactic_code"))
+    server = get("server")
+
+    out = {col: get(col) for col in EXPORT_COLUMNS}
+    out.update({
+        "set_no": _int_or_blank(out["set_no"]),
+        "game_no": _int_or_blank(out["game_no"]),
+        "server": SERVER_CODES.get(server, server),
+        "serve_code": SERVE_CODES.get(serve_code, serve_code),
+        "return_code": SERVE_CODES.get(out["return_code"], out["return_code"]),
+        "rally_len_shots": _rally_shots(get("rally_len_shots")),
+        "pattern": pattern,
+        "tactic_code": tactic,
+        "final_shot_type": shot_type,
+        "final_outcome": outcome,
+        "pressure_flags": pressure_tags(out["pressure_flags"]),
+    })
+    return out
+
+
+def iter_log_rows(paths):
+    """
+    Yield raw row dicts from one or many daily logs, in order.
+    paths: log paths (live or archived) and/or archive.DaySource objects
+    """
+    if isinstance(paths, (str, DaySource)):
+        paths = [paths]
+    for path in paths:
+        reader = path.open() if isinstance(path, DaySource) else open_log(path)
+        with reader:
+            yield from reader
+
+
+def iter_normalized(paths):
+    """Yield normalized rows from one or many daily log files"""
+    for row in iter_log_rows(paths):
+        yield normalize_row(row)
+
+
+def iter_chunks(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Group an iterable of rows into lists of at most chunk_size rows"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_columns(rows, chunk_size=DEFAULT_CHUNK_SIZE, columns=EXPORT_COLUMNS):
+    """Yield column-oriented chunks: {column: [values...]}"""
+    for chunk in iter_chunks(rows, chunk_size):
+        yield {col: [row.get(col, "") for row in chunk] for col in columns}
+
+
+def write_csv(rows, f, chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    for chunk in iter_chunks(rows, chunk_size):
+        writer.writerows(chunk)
+        count += len(chunk)
+    return count
+
+
+def write_jsonl(rows, f, chunk_size=DEFAULT_CHUNK_SIZE):
+    count = 0
+    for chunk in iter_chunks(rows, chunk_size):
+        f.write("".join(json.dumps(row) + "\n" for row in chunk))
+        count += len(chunk)
+    return count
+
+
+def write_columns(rows, f, chunk_size=DEFAULT_CHUNK_SIZE):
+    """One JSON object of column lists per line (pd.DataFrame(line) per chunk)"""
+    count = 0
+    for chunk in iter_columns(rows, chunk_size):
+        f.write(json.dumps(chunk) + "\n")
+        count += len(chunk["point_id"])
+    return count
+
+
+_WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "columns": write_columns}
+
+
+def export_logs(paths, out_path, fmt="csv", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Normalize the given logs into out_path, returning the number of rows"""
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    with open(out_path, mode='w', newline='', encoding='utf-8') as f:
+        return _WRITERS[fmt](iter_normalized(paths), f, chunk_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export daily tennis logs to the analytics schema")
+    parser.add_argument("logs", nargs="*", help="daily log CSV files (default: every live and archived day)")
+    parser.add_argument("--dir", default=".", help="log directory used when no files are given")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    logs = args.logs or list_log_days(args.dir)
+    count = export_logs(logs, args.output, args.format, args.chunk_size)
+    print(f"Exported {count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Differential fuzzer and throughput benchmark for the scoring engine.
+
+Random matches - point winners drawn with a per-match bias so that deuce
+games, tiebreaks and long sets all show up, with the occasional undo - are
+played through GameState and through ReferenceScorer, a deliberately plain
+rules-as-written scorer sharing no code with GameState. The states are
+compared after every point and every undo, for every match format in
+options.MATCH_FORMATS; the first divergence per format is reported with the
+point sequence that produced it. The same sequences are then replayed on each
+scorer alone to report points/sec, so a faster engine can be dropped in with
+--engine and checked and timed in one run. The exit status is 1 when
+anything diverged.
+
+Usage:
+    python -m tennis_logger.fuzz --matches 100000 --seed 7
+    python -m tennis_logger.fuzz --engine mypackage.fast_score:FastGameState
+"""
+import argparse
+import importlib
+import random
+import sys
+import time
+
+from .game_state import GameState
+from .options import MATCH_FORMATS
+
+UNDO = "undo"
+MAX_CONSECUTIVE_UNDOS = 3
+MAX_POINTS = 5000  # per match; long deuce battles in advantage scoring
+CHUNK = 500  # matches generated and checked at a time (constant memory)
+_EVENT_CODES = {"me": "m", "opponent": "o", UNDO: "u"}
+
+
+class ReferenceScorer:
+    """Textbook scoring written independently of GameState (the oracle)"""
+    def __init__(self, sets_to_win=2, no_ad_mode=True):
+        self.sets_to_win = sets_to_win
+        self.no_ad_mode = no_ad_mode
+        self.sets = [0, 0]  # [me, opponent]
+        self.games = [0, 0]
+        self.points = [0, 0]
+        self.tiebreak = False
+        self.set_no = 1
+        self._history = []
+
+    @property
+    def over(self):
+        return max(self.sets) >= self.sets_to_win
+
+    def state(self):
+        """(sets, games, points (me, opponent), tiebreak, set number) as engine_state() reports them"""
+        return (self.sets[0], self.sets[1], self.games[0], self.games[1],
+                self.points[0], self.points[1], self.tiebreak, self.set_no)
+
+    def add_point(self, winner):
+        self._history.append((list(self.sets), list(self.games), list(self.points), self.tiebreak, self.set_no))
+        p = 0 if winner == 'me' else 1
+        q = 1 - p
+        self.points[p] += 1
+        won, lost = self.points[p], self.points[q]
+        if self.tiebreak:
+            game = won >= 7 and won - lost >= 2
+        elif self.no_ad_mode:
+            game = won == 4  # Deciding point at 40-40
+        else:
+            game = won >= 4 and won - lost >= 2
+        if not game:
+            return
+        self.points = [0, 0]
+        self.games[p] += 1
+        if self.tiebreak or (self.games[p] >= 6 and self.games[p] - self.games[q] >= 2):
+            self.sets[p] += 1
+            self.games = [0, 0]
+            self.tiebreak = False
+            self.set_no += 1
+        elif self.games[p] == self.games[q] == 6:
+            self.tiebreak = True
+
+    def undo(self):
+        if self._history:
+            self.sets, self.games, self.points, self.tiebreak, self.set_no = self._history.pop()
+
+
+def engine_state(gs):
+    return (gs.sets_me, gs.sets_opponent, gs.games_me, gs.games_opponent,
+            gs.points_me, gs.points_opponent, gs.is_tiebreak, gs.current_set)
+
+
+def new_engine(engine, match_format):
+    gs = engine()
+    gs.restore(MATCH_FORMATS[match_format])
+    return gs
+
+
+def random_match(rng, match_format, undo_rate=0.02):
+    """One match as a list of events ('me' / 'opponent' / 'undo'), played until someone wins"""
+    settings = MATCH_FORMATS[match_format]
+    scorer = ReferenceScorer(settings["sets_to_win"], settings["no_ad_mode"])
+    p_me = rng.uniform(0.3, 0.7)
+    events = []
+    undos = 0
+    points = 0
+    while not scorer.over and points < MAX_POINTS:
+        if undos < MAX_CONSECUTIVE_UNDOS and scorer._history and rng.random() < undo_rate:
+            scorer.undo()
+            events.append(UNDO)
+            undos += 1
+            points -= 1
+            continue
+        winner = 'me' if rng.random() < p_me else 'opponent'
+        scorer.add_point(winner)
+        events.append(winner)
+        undos = 0
+        points += 1
+    return events
+
+
+def _replay(scorer, events):
+    for event in events:
+        if event == UNDO:
+            scorer.undo()
+        else:
+            scorer.add_point(event)
+
+
+def compare(events, match_format, engine=GameState):
+    """Play events through both scorers; returns the first divergence or None"""
+    settings = MATCH_FORMATS[match_format]
+    reference = ReferenceScorer(settings["sets_to_win"], settings["no_ad_mode"])
+    gs = new_engine(engine, match_format)
+    for i, event in enumerate(events):
+        _replay(reference, [event])
+        _replay(gs, [event])
+        expected, found = reference.state(), engine_state(gs)
+        if expected != found:
+            return {"event": i, "sequence": "".join(_EVENT_CODES[e] for e in events[:i + 1]),
+                    "expected": expected, "found": found}
+    return None
+
+
+def fuzz_format(match_format, matches, seed=0, undo_rate=0.02, engine=GameState):
+    """
+    Check and time one format over random matches.
+    Returns {"format", "matches", "points", "mismatches", "first_mismatch", "engine_pps", "reference_pps"}.
+    """
+    rng = random.Random(f"{seed}:{match_format}")
+    settings = MATCH_FORMATS[match_format]
+    result = {"format": match_format, "matches": 0, "points": 0, "mismatches": 0, "first_mismatch": None,
+              "engine_pps": None, "reference_pps": None}
+    engine_s = reference_s = 0.0
+    done = 0
+    while done < matches:
+        chunk = [random_match(rng, match_format, undo_rate) for _ in range(min(CHUNK, matches - done))]
+        for n, events in enumerate(chunk):
+            divergence = compare(events, match_format, engine)
+            if divergence:
+                result["mismatches"] += 1
+                if result["first_mismatch"] is None:
+                    result["first_mismatch"] = dict(divergence, match=done + n)
+
+        started = time.perf_counter()
+        for events in chunk:
+            _replay(new_engine(engine, match_format), events)
+        engine_s += time.perf_counter() - started
+        started = time.perf_counter()
+        for events in chunk:
+            _replay(ReferenceScorer(settings["sets_to_win"], settings["no_ad_mode"]), events)
+        reference_s += time.perf_counter() - started
+
+        result["points"] += sum(len(events) for events in chunk)
+        done += len(chunk)
+    result["matches"] = done
+    if engine_s:
+        result["engine_pps"] = round(result["points"] / engine_s)
+    if reference_s:
+        result["reference_pps"] = round(result["points"] / reference_s)
+    return result
+
+
+def fuzz(matches=1000, seed=0, formats=None, undo_rate=0.02, engine=GameState):
+    """fuzz_format() for each format (all of MATCH_FORMATS by default)"""
+    return [fuzz_format(f, matches, seed, undo_rate, engine) for f in (formats or MATCH_FORMATS)]
+
+
+def load_engine(spec):
+    """'package.module:Class' -> the class (a GameState drop-in)"""
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name or "GameState")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz the scoring engine against a reference scorer")
+    parser.add_argument("--matches", type=int, default=1000, help="random matches per format")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--undo-rate", type=float, default=0.02)
+    parser.add_argument("--format", action="append", choices=list(MATCH_FORMATS), help="default: all formats")
+    parser.add_argument("--engine", help="module:Class to test instead of GameState")
+    args = parser.parse_args(argv)
+
+    engine = load_engine(args.engine) if args.engine else GameState
+    mismatches = 0
+    for r in fuzz(args.matches, args.seed, args.format, args.undo_rate, engine):
+        print(f"{r['format']:<18} {r['matches']} matches, {r['points']} events: {r['mismatches']} mismatches | "
+              f"engine {r['engine_pps']:,} pts/s, reference {r['reference_pps']:,} pts/s")
+        m = r["first_mismatch"]
+        if m:
+            print(f"    match {m['match']} event {m['event']}: expected {m['expected']}, found {m['found']}\n"
+                  f"    sequence {m['sequence']}")
+        mismatches += r["mismatches"]
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,85 @@
+from .history import BoundedHistory, DEFAULT_DEPTH
+
+# Order of the fields in a compact undo snapshot
+SNAPSHOT_FIELDS = (
+    'sets_me', 'sets_opponent', 'games_me', 'games_opponent',
+    'points_me', 'points_opponent', 'is_tiebreak', 'current_set',
+    'tiebreak_target', 'no_ad_mode'
+)
+
+
+# Situation tags stored as a bitfield in the pressure_flags column
+BREAK_POINT = 1
+GAME_POINT = 2
+DEUCE = 4
+SET_POINT = 8
+MATCH_POINT = 16
+TIEBREAK = 32
+SERVING_FOR_SET = 64
+
+SITUATION_TAGS = {
+    BREAK_POINT: 'BREAK_POINT',
+    GAME_POINT: 'GAME_POINT',
+    DEUCE: 'DEUCE',
+    SET_POINT: 'SET_POINT',
+    MATCH_POINT: 'MATCH_POINT',
+    TIEBREAK: 'TIEBREAK',
+    SERVING_FOR_SET: 'SERVING_FOR_SET',
+}
+
+
+def situation_mask(*tags):
+    """Bitmask for tag names, e.g. situation_mask('BREAK_POINT', 'DEUCE')"""
+    by_name = {name: bit for bit, name in SITUATION_TAGS.items()}
+    mask = 0
+    for tag in tags:
+        mask |= by_name[tag]
+    return mask
+
+
+def parse_situation(value):
+    """Bitfield from a logged pressure_flags value ('' or non-numeric -> 0)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def decode_situation(value):
+    """Tag names set in a bitfield (int or logged string)"""
+    flags = parse_situation(value)
+    return [name for bit, name in SITUATION_TAGS.items() if flags & bit]
+
+
+def _encode_snapshot(state):
+    return ",".join(str(int(state[field])) for field in SNAPSHOT_FIELDS)
+
+
+def _decode_snapshot(line):
+    values = [int(v) for v in line.split(",")]
+    state = dict(zip(SNAPSHOT_FIELDS, values))
+    state['is_tiebreak'] = bool(state['is_tiebreak'])
+    state['no_ad_mode'] = bool(state['no_ad_mode'])
+    return state
+
+
 class GameState:
-    def __init__(self):
-        self.reset_match()
+    def __init__(self, history_depth=DEFAULT_DEPTH, history_path=None):
+        """
+        history_depth: undo snapshots kept in memory
+        history_path: optional sidecar file so undo survives a restart
+        """
+        # Snapshots for undo functionality (bounded, spills to history_path)
+        self.match_history = BoundedHistory(history_depth, history_path,
+                                            encode=_encode_snapshot, decode=_decode_snapshot)
+        # A persisted history is kept: it belongs to the match being resumed
+        self._reset_score()
 
     def reset_match(self):
+        self._reset_score()
+        self.match_history.clear()
+
+    def _reset_score(self):
         self.sets_me = 0
         self.sets_opponent = 0
         self.games_me = 0
@@ -13,7 +90,7 @@ class GameState:
         self.no_ad_mode = True # Default to No Ad Scoring
         self.current_set = 1
         self.tiebreak_target = 7 # Default to 7 points
-        self.match_history = [] # List of tuples/dicts for undo functionality
+        self.sets_to_win = 2 # Best of 3 sets
 
     def get_score_string(self, points):
         if self.is_tiebreak:
@@ -59,7 +136,21 @@ class GameState:
             'tiebreak_target': self.tiebreak_target,
             'no_ad_mode': self.no_ad_mode
         })
+        self._apply_point(winner)
+
+    def to_dict(self):
+        """The current score as plain JSON-able values (see restore)"""
+        state = {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+        state['sets_to_win'] = self.sets_to_win
+        return state
+
+    def restore(self, state):
+        """Set the score from a to_dict() mapping (the undo history is left alone)"""
+        for field in SNAPSHOT_FIELDS + ('sets_to_win',):
+            if field in state:
+                setattr(self, field, state[field])
 
+    def _apply_point(self, winner):
         if winner == 'me':
             self.points_me += 1
         else:
@@ -67,12 +158,70 @@ class GameState:
 
         self._check_game_end()
 
+    def _scratch_copy(self):
+        """Score-only copy (no history) used to look one point ahead"""
+        scratch = GameState.__new__(GameState)
+        scratch.__dict__.update({k: v for k, v in self.__dict__.items() if k != 'match_history'})
+        return scratch
+
+    def _outcome_if_won_by(self, player):
+        """(wins game, wins set, wins match) if player wins the next point"""
+        scratch = self._scratch_copy()
+        scratch._apply_point(player)
+        return self._changes_after(scratch, player)
+
+    def _changes_after(self, scratch, player):
+        if player == 'me':
+            games, sets, other_games = self.games_me, self.sets_me, self.games_opponent
+            new_games, new_sets = scratch.games_me, scratch.sets_me
+        else:
+            games, sets, other_games = self.games_opponent, self.sets_opponent, self.games_me
+            new_games, new_sets = scratch.games_opponent, scratch.sets_opponent
+        wins_set = new_sets > sets
+        wins_game = wins_set or new_games > games
+        return wins_game, wins_set, wins_set and new_sets >= self.sets_to_win
+
+    def situation_flags(self, server):
+        """
+        Bitfield of situation tags for the point about to be played.
+        server: 'me' or 'opponent'
+        """
+        receiver = 'opponent' if server == 'me' else 'me'
+        flags = 0
+        if self.is_tiebreak:
+            flags |= TIEBREAK
+        elif self.points_me >= 3 and self.points_me == self.points_opponent:
+            flags |= DEUCE
+
+        for player in (server, receiver):
+            wins_game, wins_set, wins_match = self._outcome_if_won_by(player)
+            if wins_game and not self.is_tiebreak:
+                flags |= GAME_POINT if player == server else BREAK_POINT
+            if wins_set:
+                flags |= SET_POINT
+            if wins_match:
+                flags |= MATCH_POINT
+
+        if not self.is_tiebreak:
+            # Would holding this game win the set for the server?
+            scratch = self._scratch_copy()
+            scratch.no_ad_mode = True
+            if server == 'me':
+                scratch.points_me, scratch.points_opponent = 3, 0
+            else:
+                scratch.points_me, scratch.points_opponent = 0, 3
+            scratch._apply_point(server)
+            if self._changes_after(scratch, server)[1]:
+                flags |= SERVING_FOR_SET
+        return flags
+
     def _check_game_end(self):
         # Tiebreak winning logic: target points and ahead by 2
         if self.is_tiebreak:
             if (self.points_me >= self.tiebreak_target or self.points_opponent >= self.tiebreak_target) and \
                abs(self.points_me - self.points_opponent) >= 2:
-                if self.points_me > self.points_opponent:
+                winner = 'me' if self.points_me > self.points_opponent else 'opponent'
+                if winner == 'me':
                     self.games_me += 1
                 else:
                     self.games_opponent += 1
@@ -80,7 +229,8 @@ class GameState:
                 self.points_me = 0
                 self.points_opponent = 0
                 self.is_tiebreak = False # Reset tiebreak flag after game ends
-                self._check_set_end()
+                # A tiebreak (7-6 or a match tiebreak played instead of a set) always decides the set
+                self._check_set_end(tiebreak_winner=winner)
             return
 
         # Simple game winning logic
@@ -105,13 +255,16 @@ class GameState:
             self.points_opponent = 0
             self._check_set_end()
 
-    def _check_set_end(self):
-        # Simple set winning logic (6 games, ahead by 2, or 7-6 tiebreak - simplified for now to 6-X)
-        # TODO: Implement Tiebreak logic properly if needed
-        if (self.games_me >= 6 or self.games_opponent >= 6) and \
-           abs(self.games_me - self.games_opponent) >= 2:
+    def _check_set_end(self, tiebreak_winner=None):
+        # Set: 6 games and ahead by 2, or the tiebreak played at 6-6
+        if self.games_me == self.games_opponent == 6 and not tiebreak_winner:
+            self.is_tiebreak = True
+            self.tiebreak_target = 7
+            return
+        if tiebreak_winner or ((self.games_me >= 6 or self.games_opponent >= 6) and
+                               abs(self.games_me - self.games_opponent) >= 2):
             
-            if self.games_me > self.games_opponent:
+            if (tiebreak_winner or ('me' if self.games_me > self.games_opponent else 'opponent')) == 'me':
                 self.sets_me += 1
             else:
                 self.sets_opponent += 1
@@ -132,4 +285,4 @@ class GameState:
             self.is_tiebreak = state.get('is_tiebreak', False)
             self.current_set = state['current_set']
             self.tiebreak_target = state.get('tiebreak_target', 7)
-            self.no_ad_mode = state.get('no_ad_mode', False)
+            self.no_ad_mode = state.get('no_ad_mode', True)  # Same default as __init__
@@ -1,6 +1,33 @@
+import asyncio
+import concurrent.futures
+import os
+import queue
+import threading
+
 import customtkinter as ctk
+from .autosave import Autosave, load_snapshot
+from .diagnostics import MemoryCaps, MemoryMonitor
+from .events import EVENT_TYPES, EventBus, MatchClosed, PointLogged, PointRedone, PointUndone, ScoreEdited
+from .export import pressure_tags, split_tags
 from .game_state import GameState
+from .keys import FLUSH_MS, KeyDispatcher, TaggingTimer
+from .logfiles import day_of
 from .logger import MatchLogger
+from .matches import MatchRegistry
+from .momentum import MomentumTracker, game_winner, game_winners, score_counts
+from .notes_index import NotesIndex
+from .opponents import OpponentStore, match_rows
+from .render import RenderScheduler
+from .server import IngestServer, score_points
+from .sessions import session_base
+from .options import (SERVE_CODE_OPTIONS, POINT_ENDING_SERVE_CODES, RALLY_OPTIONS, POINT_TYPE_OPTIONS,
+                      HOW_OPTIONS, UNKNOWN_OPTION, SURFACE_OPTIONS, MATCH_FORMATS, option_value)
+
+HISTORY_DEPTH = 200  # Undo/redo entries kept in memory (older ones spill to disk) unless capped
+MOMENTUM_POINTS = 20  # Momentum panel windows
+MOMENTUM_GAMES = 6
+AUTOSAVE_INTERVAL_MS = 500  # At most one autosave write per interval
+INGEST_POLL_MS = 20  # How often Tk picks up points from the ingestion server
 
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
@@ -234,16 +261,287 @@ class ScoreEditPopup(ctk.CTkToplevel):
             pass # Ignore invalid input
 
 
+class MatchSetupPopup(ctk.CTkToplevel):
+    """Opponent, surface and format of the match about to be logged"""
+    def __init__(self, parent, callback, opponents=()):
+        super().__init__(parent)
+        self.title("New Match")
+        self.geometry("400x380")
+        self.callback = callback
+        self.attributes("-topmost", True)
+        self.grab_set()
+
+        ctk.CTkLabel(self, text="Opponent", font=("Arial", 14, "bold")).pack(pady=(15, 5))
+        self.combo_opponent = ctk.CTkComboBox(self, values=list(opponents), width=250)
+        self.combo_opponent.set("")
+        self.combo_opponent.pack(pady=5)
+
+        ctk.CTkLabel(self, text="Surface", font=("Arial", 14, "bold")).pack(pady=(15, 5))
+        self.var_surface = ctk.StringVar(value=SURFACE_OPTIONS[0])
+        ctk.CTkSegmentedButton(self, values=SURFACE_OPTIONS, variable=self.var_surface).pack(pady=5)
+
+        ctk.CTkLabel(self, text="Format", font=("Arial", 14, "bold")).pack(pady=(15, 5))
+        self.combo_format = ctk.CTkComboBox(self, values=list(MATCH_FORMATS), width=250, state="readonly")
+        self.combo_format.set(next(iter(MATCH_FORMATS)))
+        self.combo_format.pack(pady=5)
+
+        ctk.CTkButton(self, text="Start Match", command=self.save, fg_color="green").pack(pady=25)
+
+    def save(self):
+        opponent = self.combo_opponent.get().strip()
+        if not opponent:
+            return
+        self.callback(opponent, self.var_surface.get(), self.combo_format.get())
+        self.destroy()
+
+
+class DiagnosticsPanel(ctk.CTkToplevel):
+    """Hidden memory panel (Ctrl+Shift+D)"""
+    def __init__(self, parent, monitor):
+        super().__init__(parent)
+        self.title("Memory Diagnostics")
+        self.geometry("700x500")
+        self.monitor = monitor
+        self.text = ctk.CTkTextbox(self, font=("Courier", 12))
+        self.text.pack(fill="both", expand=True, padx=10, pady=10)
+        ctk.CTkButton(self, text="Sample now", command=self.refresh).pack(pady=(0, 10))
+        self.refresh()
+
+    def refresh(self):
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", MemoryMonitor.format(self.monitor.sample()))
+
+
 class TennisLoggerApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, diagnostics=None, diagnostics_interval_s=60, ingest=None, court=None, caps=None):
+        """
+        court: optional session id; the court's match is logged to its own partition
+        (tennis_log_<court>_YYYYMMDD.csv, see sessions.py)
+        diagnostics: optional MemoryMonitor sampled every diagnostics_interval_s
+        (otherwise one with the same caps is started when the panel is first opened)
+        ingest: optional (host, port) to accept points from other devices (see server.py)
+        caps: optional MemoryCaps; the history cap also sets the undo/redo depth
+        """
         super().__init__()
-        self.title("Tennis Game Logger")
+        self.title(f"Tennis Game Logger - {court}" if court else "Tennis Game Logger")
         self.geometry("900x650")
         
-        self.game_state = GameState()
-        self.logger = MatchLogger()
+        # Undo/redo history is bounded in memory and persisted next to the logs
+        self.caps = caps or MemoryCaps()
+        history_depth = self.caps.history_depth(HISTORY_DEPTH)
+        base_filename = session_base("tennis_log", court) if court else "tennis_log"
+        self.logger = MatchLogger(base_filename, history_depth=history_depth, persist_history=True)
+        self.game_state = GameState(history_depth=history_depth,
+                                    history_path=f"{self.logger.base_filename}_score_history.jsonl")
+        try:
+            self.logger.archive_closed_days()
+        except OSError as e:
+            print(f"Could not archive old logs: {e}")
+
+        # Rows carry the open match's id; its opponent, surface and format live in the registry
+        self.log_dir = os.path.dirname(self.logger.base_filename) or "."
+        self.matches = MatchRegistry(self.log_dir, self.logger.base_filename)
+        self.match = self.matches.current()
+        self.logger.match_id = self.match["match_id"] if self.match else ""
+        
+        self.momentum = MomentumTracker(MOMENTUM_POINTS, MOMENTUM_GAMES, undo_depth=history_depth)
+        
+        # Handlers publish what happened; the CSV writer and the stats consume it
+        self.events = EventBus()
+        self.events.subscribe(PointLogged, self._write_point)
+        self.events.subscribe(PointUndone, self._remove_point)
+        self.events.subscribe(PointRedone, self._restore_point)
+        self.events.subscribe(PointLogged, self._count_point)
+        self.events.subscribe(PointRedone, self._count_point)
+        self.events.subscribe(PointUndone, self._uncount_point)
+        self.events.subscribe(ScoreEdited, self._on_score_edited)
+        # The notes search index follows today's log on a worker thread (see notes_index.py);
+        # undo / redo are picked up by the next point's refresh
+        self.notes_index = NotesIndex(self.log_dir, self.logger.base_filename)
+        self.events.subscribe(PointLogged, self._index_notes, threaded=True)
+        # A closed match is added to the opponent store off the Tk thread (it re-reads the match's rows)
+        self.events.subscribe(MatchClosed, self._add_to_opponents, threaded=True)
         
         self._init_ui()
+        
+        # Handlers mark parts dirty; one idle pass redraws them (see render_stats)
+        self.render = RenderScheduler(self)
+        self.render.register("score", self._render_score)
+        self.render.register("timestamp", self._render_timestamp)
+        self.render.register("momentum", self._render_momentum)
+        self.render.mark_dirty()
+        
+        # The half-filled point and the score survive a crash or sleep
+        autosave_path = f"{self.logger.base_filename}_autosave.json"
+        self._restore_autosave(load_snapshot(autosave_path))
+        self.autosave = Autosave(autosave_path, AUTOSAVE_INTERVAL_MS)
+        for var in self._form_vars().values():
+            var.trace_add("write", self._schedule_autosave)
+        self.entry_notes.bind("<KeyRelease>", self._schedule_autosave, add="+")
+        for event_type in EVENT_TYPES:
+            self.events.subscribe(event_type, self._schedule_autosave)
+        
+        self.diagnostics = diagnostics
+        self.diagnostics_interval_ms = int(diagnostics_interval_s * 1000)
+        if diagnostics:
+            self._watch_memory(diagnostics)
+            self.after(self.diagnostics_interval_ms, self._sample_memory)
+        self.bind("<Control-D>", self._open_diagnostics)  # Ctrl+Shift+D
+        
+        # Keyboard mode (F2): tag and log points with key sequences, no popups (see keys.py)
+        self.keyboard_mode = False
+        self.keys = KeyDispatcher()
+        self.tagging = TaggingTimer()
+        self._key_flush_job = None
+        self.bind("<F2>", self._toggle_keyboard_mode)
+        self.bind("<Key>", self._on_key, add="+")
+        if ingest:
+            self._start_ingest(*ingest)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        if self.match is None:
+            self.after(200, self._open_match_setup)
+
+    def _watch_memory(self, monitor):
+        monitor.start()
+        monitor.watch_history("score_history", self.game_state.match_history)
+        monitor.watch_history("redo_stack", self.logger.undo_stack)
+        monitor.watch("momentum", self.momentum)
+        monitor.watch("last_point", lambda: self.logger.get_last_point_data())
+        monitor.watch_cache("split_tags_cache", split_tags)
+        monitor.watch_cache("pressure_tags_cache", pressure_tags)
+        monitor.gauge("popups_open", lambda: sum(isinstance(w, ctk.CTkToplevel) for w in self.winfo_children()))
+        monitor.gauge("event_queues", lambda: sum(s["queued"] for s in self.events.stats()))
+
+    def _sample_memory(self):
+        try:
+            self.diagnostics.sample()
+        except OSError as e:
+            print(f"Could not write memory sample: {e}")
+        self.after(self.diagnostics_interval_ms, self._sample_memory)
+
+    def _open_diagnostics(self, event=None):
+        if self.diagnostics is None:
+            self.diagnostics = MemoryMonitor(caps=self.caps)
+            self._watch_memory(self.diagnostics)
+        DiagnosticsPanel(self, self.diagnostics)
+
+    def _start_ingest(self, host, port):
+        """Run the ingestion server on its own thread; batches are applied on the Tk thread"""
+        self._ingest_batches = queue.Queue()
+        self.ingest_server = IngestServer(self._queue_ingested, host, port)
+        threading.Thread(target=lambda: asyncio.run(self.ingest_server.serve_forever()),
+                         name="ingest", daemon=True).start()
+        self.after(INGEST_POLL_MS, self._poll_ingested)
+
+    def _queue_ingested(self, points):
+        # Server thread: Tk is not thread-safe, so hand the batch over and wait for the rows
+        future = concurrent.futures.Future()
+        self._ingest_batches.put((points, future))
+        return future
+
+    def _poll_ingested(self):
+        try:
+            while True:
+                points, future = self._ingest_batches.get_nowait()
+                try:
+                    future.set_result(self._log_ingested(points))
+                except Exception as e:
+                    future.set_exception(e)
+        except queue.Empty:
+            pass
+        self.after(INGEST_POLL_MS, self._poll_ingested)
+
+    def _log_ingested(self, points):
+        results = score_points(self.game_state, points, self.logger.log_points)  # One write for the batch
+        for row, winner in results:
+            self.events.publish(PointLogged(row, winner, written=True))
+        self._update_score_display()
+        return [row for row, _ in results]
+
+    def _form_vars(self):
+        return {
+            "server": self.var_server,
+            "serve_number": self.var_serve_num,
+            "serve_code": self.var_serve_code,
+            "rally": self.var_rally,
+            "pattern": self.var_pattern,
+            "how": self.var_how,
+        }
+
+    def _schedule_autosave(self, *args):
+        """Hand the current form and score to the autosave thread (no I/O here)"""
+        form = {name: var.get() for name, var in self._form_vars().items()}
+        form["notes"] = self.entry_notes.get()
+        self.autosave.save({"log": self.logger.filename, "match_id": self.logger.match_id,
+                            "score": self.game_state.to_dict(), "form": form})
+
+    def _restore_autosave(self, snapshot):
+        # Only a snapshot of today's log and the open match belongs to the match being resumed;
+        # without one the persisted undo / redo history is a previous day's or match's
+        current = (self.logger.filename, self.logger.match_id)
+        if not snapshot or (snapshot.get("log"), snapshot.get("match_id", "")) != current:
+            self.game_state.reset_match()
+            self.logger.undo_stack.clear()
+            return
+        self.game_state.restore(snapshot.get("score", {}))
+        form = snapshot.get("form", {})
+        for name, var in self._form_vars().items():
+            if name in form:
+                var.set(form[name])
+        if form.get("notes"):
+            self.entry_notes.delete(0, 'end')
+            self.entry_notes.insert(0, form["notes"])
+        self._update_score_display()
+
+    def _on_close(self):
+        try:
+            self.logger.refresh_summaries()
+        except OSError as e:
+            print(f"Could not refresh summaries: {e}")
+        self.events.close()
+        try:
+            self.notes_index.refresh()
+        except OSError as e:
+            print(f"Could not refresh the notes index: {e}")
+        self.autosave.close()
+        self.destroy()
+
+    def _write_point(self, event):
+        if not event.written:
+            self.logger.log_point(event.row)
+
+    def _remove_point(self, event):
+        self.logger.undo_last_log()
+
+    def _restore_point(self, event):
+        self.logger.redo_last_log()
+
+    def _index_notes(self, event):
+        # Worker thread: only today's segment, usually just the appended row
+        try:
+            self.notes_index.refresh(days=[day_of(self.logger.filename)])
+        except OSError as e:
+            print(f"Could not update the notes index: {e}")
+
+    def _count_point(self, event):
+        self.momentum.push(event.row, event.game_winner)
+        self.render.mark_dirty("momentum")
+
+    def _uncount_point(self, event):
+        self.momentum.pop()
+        if not self.momentum.exact() and self.match:
+            # Undone further back than the momentum rings keep: recount the match from its log
+            gs = self.game_state
+            try:
+                rows = match_rows(self.log_dir, self.logger.base_filename, self.match)
+            except OSError as e:
+                print(f"Could not recount momentum: {e}")
+            else:
+                next_game = (gs.current_set, gs.games_me + gs.games_opponent + 1)
+                self.momentum.rebuild(game_winners(rows, next_game))
+        self.render.mark_dirty("momentum")
+
+    def _on_score_edited(self, event):
         self._update_score_display()
 
     def _init_ui(self):
@@ -267,8 +565,22 @@ class TennisLoggerApp(ctk.CTk):
         self.lbl_timestamp = ctk.CTkLabel(self.top_frame, text="Last Point: --:--:--", font=("Arial", 12), text_color="gray")
         self.lbl_timestamp.pack(pady=3)
         
-        self.btn_edit_score = ctk.CTkButton(self.top_frame, text="Edit Score", command=self._open_score_edit, width=100)
-        self.btn_edit_score.pack(pady=5)
+        self.lbl_match = ctk.CTkLabel(self.top_frame, text="", font=("Arial", 12))
+        self.lbl_match.pack(pady=3)
+        self._render_match()
+
+        frame_buttons = ctk.CTkFrame(self.top_frame, fg_color="transparent")
+        frame_buttons.pack(pady=5)
+        self.btn_edit_score = ctk.CTkButton(frame_buttons, text="Edit Score", command=self._open_score_edit, width=100)
+        self.btn_edit_score.pack(side="left", padx=5)
+        self.btn_new_match = ctk.CTkButton(frame_buttons, text="New Match", command=self._open_match_setup, width=100)
+        self.btn_new_match.pack(side="left", padx=5)
+
+        # Momentum panel (rolling stats over the last points / games)
+        self.lbl_momentum_points = ctk.CTkLabel(self.top_frame, text="", font=("Arial", 12))
+        self.lbl_momentum_points.pack(pady=(5, 0))
+        self.lbl_momentum_games = ctk.CTkLabel(self.top_frame, text="", font=("Arial", 12))
+        self.lbl_momentum_games.pack(pady=(0, 5))
 
         # Left Frame - Point Details
         self.left_frame = ctk.CTkFrame(self)
@@ -304,7 +616,7 @@ class TennisLoggerApp(ctk.CTk):
         self.lbl_rally = ctk.CTkLabel(self.left_frame, text="Rally Length")
         self.lbl_rally.pack(anchor="w")
         self.var_rally = ctk.StringVar(value="Medium")
-        self.seg_rally = ctk.CTkSegmentedButton(self.left_frame, values=["Short", "Medium", "Long"], variable=self.var_rally)
+        self.seg_rally = ctk.CTkSegmentedButton(self.left_frame, values=RALLY_OPTIONS, variable=self.var_rally)
         self.seg_rally.pack(fill="x", pady=5)
 
         # Point Type & Tactic (merged)
@@ -312,31 +624,9 @@ class TennisLoggerApp(ctk.CTk):
         self.lbl_pattern.pack(anchor="w")
         self.var_pattern = ctk.StringVar(value="Unknown (UNK)")
         
-        # Merged options - removed duplicates and combined similar tactics
-        point_type_options = [
-            ("Unknown (UNK)", "Unknown (UNK)"),
-            ("Rally (R)\nBaseline exchange", "Rally (R)"),
-            ("Serve + 1 (S1)\nServe then attack", "Serve + 1 (S1)"),
-            ("Return + 1 (R1)\nReturn then attack", "Return + 1 (R1)"),
-            ("First Strike (F)\nShort point < 4 shots", "First Strike (F)"),
-            ("Approach (A)\nTransition to net", "Approach (A)"),
-            ("Net Play (N)\nVolleys & Overheads", "Net Play (N)"),
-            ("Passing Shot (P)\nPass net player", "Passing Shot (P)"),
-            ("Lob/Deep Ball (L)\nHigh or deep shot", "Lob/Deep Ball (L)"),
-            ("Defense (D)\nScrambling", "Defense (D)"),
-            ("Move Opponent (M)\nAngles / Change Dir / Run", "Move Opponent (M)"),
-            ("Consistency (C)\nHigh % shot", "Consistency (C)"),
-            ("Body (B)\nJam the opponent", "Body (B)"),
-            ("Pace (PC)\nOverwhelm with speed", "Pace (PC)"),
-            ("Serve & Volley (SV)\nServe -> Net", "Serve & Volley (SV)"),
-            ("Chip & Charge (CC)\nSlice return -> Net", "Chip & Charge (CC)"),
-            ("Drop Shot (DS)\nDraw them in", "Drop Shot (DS)"),
-            ("Backhand Slice (BS)\nSlice defense/neutral", "Backhand Slice (BS)"),
-            ("Inside-Out (IO)\nRun around BH", "Inside-Out (IO)")
-        ]
         
         self.btn_pattern = ctk.CTkButton(self.left_frame, textvariable=self.var_pattern,
-                                         command=lambda: self._open_multi_popup("Point Type & Tactic", point_type_options, self.var_pattern),
+                                         command=lambda: self._open_multi_popup("Point Type & Tactic", POINT_TYPE_OPTIONS, self.var_pattern),
                                          height=40)
         self.btn_pattern.pack(fill="x", pady=5)
 
@@ -351,28 +641,9 @@ class TennisLoggerApp(ctk.CTk):
         self.lbl_how = ctk.CTkLabel(self.right_frame, text="How?")
         self.lbl_how.pack(anchor="w")
         self.var_how = ctk.StringVar(value="Unknown (UNK)")
-        how_options = [
-            # Errors first (yellow background)
-            ("Forced Error (FE)", "Forced Error (FE)", "#DAA520"),
-            ("Unforced Error (UE)", "Unforced Error (UE)", "#DAA520"),
-            ("Double Fault (DF)", "Double Fault (DF)", "#DAA520"),
-            # Winners (alphabetical, default blue)
-            "Ace (A)", 
-            "Backhand Winner (BW)", 
-            "Cross Court Winner (CC)",
-            "Down the Line Winner (DTL)",
-            "Drop Shot Winner (DW)", 
-            "Forehand Winner (FW)", 
-            "Lob Winner (LW)",
-            "Overhead Winner (OW)", 
-            "Passing Shot Winner (PW)", 
-            "Service Winner (SW)", 
-            "Unknown (UNK)",
-            "Volley Winner (VW)"
-        ]
         
         self.btn_how = ctk.CTkButton(self.right_frame, textvariable=self.var_how,
-                                     command=lambda: self._open_popup("How?", how_options, self.var_how),
+                                     command=lambda: self._open_popup("How?", HOW_OPTIONS, self.var_how),
                                      height=40)
         self.btn_how.pack(fill="x", pady=5)
 
@@ -417,6 +688,79 @@ class TennisLoggerApp(ctk.CTk):
                                       fg_color="orange", hover_color="darkorange")
         self.btn_redo.pack(side="left", fill="x", expand=True, padx=(5, 0))
 
+        self.lbl_keys = ctk.CTkLabel(self.right_frame, text="Keyboard mode: off (F2)", font=("Courier", 12),
+                                     text_color="gray")
+        self.lbl_keys.pack(side="bottom", anchor="w")
+
+    def _toggle_keyboard_mode(self, event=None):
+        self.keyboard_mode = not self.keyboard_mode
+        self.keys.reset()
+        self.tagging.cancel()
+        self.focus_set()  # Out of the notes entry, so keys reach the dispatcher
+        self._render_keys()
+
+    def _on_key(self, event):
+        if not self.keyboard_mode or event.widget.winfo_class() == "Entry":
+            return  # Typing notes
+        if event.keysym == "Escape":
+            self.keys.reset()
+            self.tagging.cancel()
+        elif event.char and event.char.isprintable():
+            self.tagging.keystroke()
+            for action in self.keys.feed(event.char.lower()):
+                self._apply_key_action(action)
+            if self._key_flush_job:
+                self.after_cancel(self._key_flush_job)
+                self._key_flush_job = None
+            if self.keys.waiting:
+                self._key_flush_job = self.after(FLUSH_MS, self._flush_keys)
+        self._render_keys()
+        return "break"
+
+    def _flush_keys(self):
+        self._key_flush_job = None
+        for action in self.keys.flush():
+            self._apply_key_action(action)
+        self._render_keys()
+
+    def _apply_key_action(self, action):
+        kind = action[0]
+        if kind == "set":
+            self._form_vars()[action[1]].set(action[2])
+        elif kind == "toggle":
+            tags = set(self.var_pattern.get().split("|")) - {UNKNOWN_OPTION, ""}
+            tags ^= {action[2]}
+            self.var_pattern.set("|".join(sorted(tags)) or UNKNOWN_OPTION)
+        elif kind == "serve_winner":
+            # Ace / service winner: the point goes to the server
+            self.var_serve_code.set(action[1])
+            self._commit_key_point("Me" if self.var_server.get() == "Me" else "Opponent")
+        elif kind == "winner":
+            self._commit_key_point(action[1])
+        elif kind == "undo":
+            self.tagging.cancel()
+            self.undo_point()
+        elif kind == "redo":
+            self.tagging.cancel()
+            self.redo_point()
+
+    def _commit_key_point(self, winner):
+        self.tagging.commit()
+        self._on_winner_click(winner)
+
+    def _render_keys(self):
+        if not self.keyboard_mode:
+            self.lbl_keys.configure(text="Keyboard mode: off (F2)")
+            return
+        stats = self.tagging.stats()
+        timing = f"{stats['median_s']:.1f} s/pt median, {stats['keys_per_point']} keys ({stats['points']} pts)" \
+            if stats["points"] else "no points yet"
+        self.lbl_keys.configure(text=f"Keys: {self.keys.buffer or '-':<5} | {timing}")
+
+    def render_stats(self):
+        """Frame-time statistics of the display refresh"""
+        return self.render.stats()
+
     def _open_popup(self, title, options, variable):
         SelectionPopup(self, title, options, lambda val: variable.set(val))
         
@@ -425,34 +769,93 @@ class TennisLoggerApp(ctk.CTk):
 
     def _open_serve_code_popup(self):
         """Special popup for serve code that auto-logs on Ace or Winner"""
-        # Reordered: regular serves first, then point-ending serves at bottom
-        serve_options = ["In (I)", "Fault (SF)", "Double Fault (DF)", "Wide (WB)", "Ace (A)", "Winner (W)"]
-        
         def callback_with_auto_log(val):
             # Add count to the selected value
             self.var_serve_code.set(f"{val} [6]")
             # Auto-log if Ace or Winner
-            if val in ["Ace (A)", "Winner (W)"]:
+            if val in POINT_ENDING_SERVE_CODES:
                 self.log_point()
         
-        SelectionPopup(self, "Serve Code", serve_options, callback_with_auto_log)
+        SelectionPopup(self, "Serve Code", SERVE_CODE_OPTIONS, callback_with_auto_log)
 
     def _open_score_edit(self):
-        ScoreEditPopup(self, self.game_state, self._update_score_display)
+        def on_saved():
+            gs = self.game_state
+            self.events.publish(ScoreEdited(gs.get_display_score(), score_counts(gs)))
+        ScoreEditPopup(self, self.game_state, on_saved)
+
+    def _open_match_setup(self):
+        MatchSetupPopup(self, self._start_match, self.matches.opponents())
+
+    def _start_match(self, opponent, surface, match_format):
+        """Close the open match (adding it to the opponent store) and start logging a new one"""
+        previous = self.match
+        if previous:
+            self._close_match(previous)
+        # The score's undo history, momentum and redo belong to the match being closed
+        self.game_state.reset_match()
+        self.momentum.reset()
+        self.render.mark_dirty("momentum")
+        self.logger.undo_stack.clear()
+        self.match = self.matches.start(opponent, surface, match_format)
+        self.logger.match_id = self.match["match_id"]
+        self.game_state.restore(MATCH_FORMATS.get(match_format, {}))
+        gs = self.game_state
+        self.events.publish(ScoreEdited(gs.get_display_score(), score_counts(gs)))
+        self._render_match()
+
+    def _close_match(self, entry):
+        self.matches.close(entry["match_id"])
+        self.events.publish(MatchClosed(entry))
+
+    def _add_to_opponents(self, event):
+        # Worker thread: reads the match's rows from the committed logs
+        try:
+            store = OpponentStore(self.log_dir, self.logger.base_filename)
+            store.add_match(event.entry, match_rows(self.log_dir, self.logger.base_filename, event.entry))
+        except OSError as e:
+            print(f"Could not update the opponent store: {e}")
 
-    def _update_score_display(self):
-        self.lbl_score.configure(text=f"Score (Me - Opponent): {self.game_state.get_display_score()}")
-        self.lbl_games.configure(text=f"Games: {self.game_state.games_me} - {self.game_state.games_opponent} | Sets: {self.game_state.sets_me} - {self.game_state.sets_opponent}")
-        self._update_timestamp_display()
+    def _render_match(self):
+        m = self.match
+        text = f"vs {m['opponent']} ({m['surface']}, {m['format']})" if m else "No match set up"
+        self.lbl_match.configure(text=text)
 
-    def _update_timestamp_display(self):
-        """Update the timestamp display with the last logged point's time"""
+    def _update_score_display(self):
+        """Mark the score and last-point labels dirty; they are redrawn once on idle"""
+        self.render.mark_dirty("score", "timestamp")
+
+    def _render_score(self):
+        gs = self.game_state
+        self.render.set_text(self.lbl_score, f"Score (Me - Opponent): {gs.get_display_score()}")
+        self.render.set_text(self.lbl_games, f"Games: {gs.games_me} - {gs.games_opponent} | Sets: {gs.sets_me} - {gs.sets_opponent}")
+
+    def _render_momentum(self):
+        m = self.momentum.snapshot()
+        pct = lambda value: "--" if value is None else f"{value:.0f}%"
+        streak = m["streak"]
+        streak_text = f"W{streak}" if streak > 0 else f"L{-streak}" if streak < 0 else "-"
+        self.render.set_text(self.lbl_momentum_points,
+                             f"Last {m['points']} pts: won {pct(m['win_rate'])} | 1st serve in {pct(m['first_serve_in'])}"
+                             f" | UE {pct(m['unforced_rate'])} | streak {streak_text}")
+        self.render.set_text(self.lbl_momentum_games,
+                             f"Last {m['games']} games: won {pct(m['game_win_rate'])}")
+
+    def _render_timestamp(self):
+        """Show the last logged point's time (kept in memory by the logger)"""
         last_point_data = self.logger.get_last_point_data()
         if last_point_data and 'timestamp' in last_point_data:
             timestamp_str = last_point_data['timestamp']
-            self.lbl_timestamp.configure(text=f"Last Point: {timestamp_str}")
+            self.render.set_text(self.lbl_timestamp, f"Last Point: {timestamp_str}")
         else:
-            self.lbl_timestamp.configure(text="Last Point: --:--:--")
+            self.render.set_text(self.lbl_timestamp, "Last Point: --:--:--")
+
+    def _how_from_row(self, row):
+        """Map a logged row's final_shot_type back to a How? option"""
+        how = row.get('final_shot_type', '')
+        if how in [option_value(o) for o in HOW_OPTIONS]:
+            return how
+        return UNKNOWN_OPTION
 
     def _on_winner_click(self, winner):
         self.var_winner.set(winner)
@@ -467,6 +870,14 @@ class TennisLoggerApp(ctk.CTk):
         if self.var_server.get() == "Me": server_val = "m"
         else: server_val = "o"
 
+        # Situation tags (break point, set point...) describe the score before the point
+        situation = self.game_state.situation_flags('me' if server_val == "m" else 'opponent')
+        counts_before = score_counts(self.game_state)
+        # So is the score: record it before the point changes it
+        gs = self.game_state
+        set_no = gs.current_set
+        game_no = gs.games_me + gs.games_opponent + 1
+        score_before = gs.get_display_score()
         if winner == "Unknown":
             pass
         else:
@@ -482,9 +893,9 @@ class TennisLoggerApp(ctk.CTk):
         elif winner == "Opponent": outcome_code = "L"
         
         data = {
-            "set_no": self.game_state.current_set,
-            "game_no": self.game_state.games_me + self.game_state.games_opponent + 1,
-            "score_before_point": self.game_state.get_display_score(), 
+            "set_no": set_no,
+            "game_no": game_no,
+            "score_before_point": score_before,
             "server": server_val,
             "serve_number": self.var_serve_num.get(),
             "serve_code": self.var_serve_code.get(),
@@ -492,12 +903,13 @@ class TennisLoggerApp(ctk.CTk):
             "rally_len_shots": self.var_rally.get(),
             "pattern": self.var_pattern.get(),
             "tactic_code": self.var_pattern.get(),  # Same as pattern now (merged)
-            "final_shot_type": "N/A",  # Final shot type field removed from UI
+            "final_shot_type": self.var_how.get(),  # How? (winner type / error cause)
+            "pressure_flags": situation,
             "final_outcome": outcome_code,
             "notes": self.entry_notes.get(),
         }
         
-        self.logger.log_point(data)
+        self.events.publish(PointLogged(data, game_winner(counts_before, self.game_state)))
         
         # Reset some fields for next point
         self.var_rally.set("Medium")
@@ -510,13 +922,15 @@ class TennisLoggerApp(ctk.CTk):
     def undo_point(self):
         # Get the last point data before removing it
         last_point_data = self.logger.get_last_point_data()
+        if not last_point_data or last_point_data.get('match_id', '') != self.logger.match_id:
+            return  # Nothing logged in this match yet: never undo into a closed one
         
         # Undo the game state
         self.game_state.undo()
         self._update_score_display()
         
-        # Remove the last log entry
-        self.logger.undo_last_log()
+        # Remove the last log entry (and its stats)
+        self.events.publish(PointUndone(last_point_data))
         
         # Restore the previous point's data to the UI
         if last_point_data:
@@ -544,9 +958,8 @@ class TennisLoggerApp(ctk.CTk):
             if 'pattern' in last_point_data:
                 self.var_pattern.set(last_point_data['pattern'])
             
-            # Note: var_how doesn't seem to map to a specific CSV column in log_point,
-            # so we set it to Unknown when undoing
-            self.var_how.set("Unknown (UNK)")
+            # How? is logged in final_shot_type (older logs hold "N/A" there)
+            self.var_how.set(self._how_from_row(last_point_data))
             
             if 'notes' in last_point_data:
                 self.entry_notes.delete(0, 'end')
@@ -557,8 +970,8 @@ class TennisLoggerApp(ctk.CTk):
         if not self.logger.can_redo():
             return  # Nothing to redo
         
-        # Get the point data from undo stack and restore it
-        point_data = self.logger.redo_last_log()
+        # The point on top of the redo stack; the PointRedone subscriber writes it back
+        point_data = self.logger.undo_stack.peek()
         
         if point_data:
             # Determine who won from final_outcome
@@ -571,8 +984,10 @@ class TennisLoggerApp(ctk.CTk):
                 winner = None  # Unknown - don't update score
             
             # Add point to game state
+            counts_before = score_counts(self.game_state)
             if winner:
                 self.game_state.add_point(winner)
+            self.events.publish(PointRedone(point_data, game_winner(counts_before, self.game_state)))
             
             # Update display
             self._update_score_display()
@@ -600,7 +1015,7 @@ class TennisLoggerApp(ctk.CTk):
             if 'pattern' in point_data:
                 self.var_pattern.set(point_data['pattern'])
             
-            self.var_how.set("Unknown (UNK)")
+            self.var_how.set(self._how_from_row(point_data))
             
             if 'notes' in point_data:
                 self.entry_notes.delete(0, 'end')
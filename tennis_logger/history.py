@@ -0,0 +1,148 @@
+"""
+Bounded undo/redo history with an optional on-disk sidecar.
+
+BoundedHistory is a LIFO stack that keeps only the newest `depth` entries in
+memory. With a sidecar path every entry is also written as one compact JSON
+line: push appends a line, pop truncates it again, so the file always mirrors
+the stack and survives crashes and restarts. Entries older than the in-memory
+window are read back from the end of the file when the window runs dry, which
+keeps memory constant however long the session runs. Without a path the
+stack is purely in memory and entries older than `depth` are dropped.
+"""
+import json
+import os
+from collections import deque
+
+DEFAULT_DEPTH = 200
+_READ_CHUNK = 64 * 1024
+
+
+def _encode_json(entry):
+    return json.dumps(entry, separators=(",", ":"))
+
+
+class BoundedHistory:
+    def __init__(self, depth=DEFAULT_DEPTH, path=None, encode=_encode_json, decode=json.loads):
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        self.depth = depth
+        self.path = path
+        self._encode = encode
+        self._decode = decode
+        self._mem = deque()  # (file offset, entry), newest on the right
+        self._count = 0
+        self._size = 0  # committed length of the sidecar file
+        if path and os.path.isfile(path):
+            self._recover()
+
+    def _recover(self):
+        """Count the persisted entries and load the newest ones"""
+        count = 0
+        last_newline = -1
+        with open(self.path, mode='rb') as f:
+            pos = 0
+            while True:
+                chunk = f.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                count += chunk.count(b"\n")
+                nl = chunk.rfind(b"\n")
+                if nl != -1:
+                    last_newline = pos + nl
+                pos += len(chunk)
+        self._size = last_newline + 1
+        if self._size != pos:
+            # Drop a line torn by a crash mid-write
+            os.truncate(self.path, self._size)
+        self._count = count
+        self._reload()
+
+    def _tail(self, end, n):
+        """The last n complete lines before offset end, as [(offset, bytes)]"""
+        with open(self.path, mode='rb') as f:
+            data = b""
+            start = end
+            while start > 0 and data.count(b"\n") <= n:
+                step = min(_READ_CHUNK, start)
+                start -= step
+                f.seek(start)
+                data = f.read(step) + data
+        lines = []
+        pos = len(data)
+        while len(lines) < n and pos > 0:
+            nl = data.rfind(b"\n", 0, pos - 1)
+            if nl == -1 and start > 0:
+                break
+            lines.append((start + nl + 1, data[nl + 1:pos - 1]))
+            pos = nl + 1
+        lines.reverse()
+        return lines
+
+    def _reload(self):
+        end = self._mem[0][0] if self._mem else self._size
+        wanted = min(self.depth, self._count - len(self._mem))
+        if wanted <= 0:
+            return
+        older = [(offset, self._decode(line.decode("utf-8"))) for offset, line in self._tail(end, wanted)]
+        self._mem.extendleft(reversed(older))
+
+    def append(self, entry):
+        offset = self._size
+        if self.path:
+            line = (self._encode(entry) + "\n").encode("utf-8")
+            with open(self.path, mode='ab') as f:
+                f.write(line)
+            self._size += len(line)
+        self._mem.append((offset, entry))
+        self._count += 1
+        if len(self._mem) > self.depth:
+            self._mem.popleft()
+            if not self.path:
+                self._count -= 1  # Nowhere to spill: the oldest entry is dropped
+
+    def pop(self):
+        if not self._count:
+            raise IndexError("pop from empty history")
+        if not self._mem:
+            self._reload()
+        offset, entry = self._mem.pop()
+        self._count -= 1
+        if self.path:
+            os.truncate(self.path, offset)
+            self._size = offset
+        return entry
+
+    def peek(self):
+        """The newest entry without removing it (None if empty)"""
+        if not self._count:
+            return None
+        if not self._mem:
+            self._reload()
+        return self._mem[-1][1]
+
+    def clear(self):
+        self._mem.clear()
+        self._count = 0
+        if self.path and self._size:
+            os.truncate(self.path, 0)
+        self._size = 0
+
+    def trim(self, depth):
+        """Keep at most depth entries in memory from now on (older ones spill to disk, or are dropped)"""
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        self.depth = depth
+        while len(self._mem) > depth:
+            self._mem.popleft()
+            if not self.path:
+                self._count -= 1
+
+    def in_memory(self):
+        """Number of entries currently held in memory"""
+        return len(self._mem)
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
@@ -0,0 +1,189 @@
+"""
+Keyboard rapid-entry mode: single-keystroke tagging without popups.
+
+Every option's code letters (the part in brackets: "Double Fault (DF)" ->
+df) are bound under a field key, and the sequences are kept in a prefix
+trie. A KeyDispatcher walks the trie one key at a time, so lookups never
+scan the bindings, and fires the action as soon as a sequence is complete.
+When a complete sequence is also the prefix of a longer one (pattern r /
+r1), it fires on the next key that does not continue it, or on flush()
+after a short pause. A sequence that logs the point must never be such a
+prefix, or a slow swb would log a service winner at sw: default_bindings()
+repeats such a sequence's last key (sw -> sww) and KeyTrie rejects any left.
+
+    m / o          server me / opponent       1 / 2   serve number
+    s + code       serve code (si, ssf, sdf, swb, sa, sww; sa and sww end the point)
+    h + code       how? (hue, hfe, hw...)     p + code   toggle a point type (pr, ps1, pnp...)
+    r + s/m/l      rally length
+    w / l / u      log the point: won / lost / unknown
+    z / y          undo / redo
+
+TaggingTimer records how long each point took to tag, from its first key to
+the winner key, so the time spent between points can be measured and cut.
+"""
+import re
+import statistics
+import time
+from collections import deque
+
+from .options import (SERVE_CODE_OPTIONS, POINT_ENDING_SERVE_CODES, RALLY_OPTIONS, POINT_TYPE_OPTIONS,
+                      HOW_OPTIONS, UNKNOWN_OPTION, option_value)
+
+FLUSH_MS = 600  # pause after which a complete-but-extendable sequence fires
+TIMES_KEPT = 500  # tagging times kept for the statistics
+_CODE = re.compile(r"\(([^()]+)\)\s*$")
+_ACTION = None  # trie node key holding the action of a complete sequence
+POINT_ENDING_ACTIONS = ("winner", "serve_winner")
+
+
+def option_code(option):
+    """Lower-case code of an option ('Double Fault (DF)' -> 'df'), or None"""
+    match = _CODE.search(option_value(option))
+    return match.group(1).lower() if match else None
+
+
+def ends_point(action):
+    return bool(action) and action[0] in POINT_ENDING_ACTIONS
+
+
+def default_bindings():
+    """{key sequence: action}; actions are tuples handled by the GUI"""
+    bindings = {
+        "m": ("set", "server", "Me"), "o": ("set", "server", "Opponent"),
+        "1": ("set", "serve_number", "1"), "2": ("set", "serve_number", "2"),
+        "w": ("winner", "Me"), "l": ("winner", "Opponent"), "u": ("winner", "Unknown"),
+        "z": ("undo",), "y": ("redo",),
+    }
+    for rally in RALLY_OPTIONS:
+        bindings["r" + rally[0].lower()] = ("set", "rally", rally)
+    for field, key, options in (("serve_code", "s", SERVE_CODE_OPTIONS), ("how", "h", HOW_OPTIONS),
+                                ("pattern", "p", POINT_TYPE_OPTIONS)):
+        for option in options:
+            code = option_code(option)
+            if code is None:
+                continue
+            value = option_value(option)
+            if field == "serve_code" and value in POINT_ENDING_SERVE_CODES:
+                bindings[key + code] = ("serve_winner", value)
+            elif field == "pattern" and value != UNKNOWN_OPTION:
+                bindings[key + code] = ("toggle", field, value)
+            else:
+                bindings[key + code] = ("set", field, value)
+    for keys in sorted(bindings):
+        if ends_point(bindings[keys]):
+            remapped = keys
+            while any(other != remapped and other.startswith(remapped) for other in bindings):
+                remapped += keys[-1]
+            if remapped != keys:
+                bindings[remapped] = bindings.pop(keys)
+    return bindings
+
+
+class KeyTrie:
+    def __init__(self, bindings=()):
+        self.root = {}
+        for keys, action in dict(bindings).items():
+            self.insert(keys, action)
+
+    def insert(self, keys, action):
+        if not keys:
+            raise ValueError("Empty key sequence")
+        node = self.root
+        for n, key in enumerate(keys):
+            node = node.get(key)
+            if node is None:
+                break
+            if n < len(keys) - 1 and ends_point(node.get(_ACTION)):
+                raise ValueError(f"Point-ending {keys[:n + 1]!r} would fire while typing {keys!r}")
+        else:
+            if _ACTION in node:
+                raise ValueError(f"Key sequence {keys!r} is bound twice")
+            if ends_point(action) and len(node) > 0:
+                raise ValueError(f"Point-ending {keys!r} is the prefix of other sequences")
+        node = self.root
+        for key in keys:
+            node = node.setdefault(key, {})
+        node[_ACTION] = action
+
+
+class KeyDispatcher:
+    def __init__(self, trie=None):
+        self.trie = trie or KeyTrie(default_bindings())
+        self.buffer = ""  # keys typed towards the current sequence
+        self._node = self.trie.root
+        self.unknown = 0  # keys that started no sequence
+
+    def reset(self):
+        self.buffer = ""
+        self._node = self.trie.root
+
+    def feed(self, key):
+        """Walk one key; returns the actions it fired (usually zero or one)"""
+        fired = []
+        child = self._node.get(key)
+        if child is None:
+            if self.buffer:
+                # A dead end: fire the complete prefix (if any) and start over with this key
+                fired += self.flush()
+                self.reset()
+                return fired + self.feed(key)
+            self.unknown += 1
+            return fired
+        self.buffer += key
+        self._node = child
+        if len(child) == 1 and _ACTION in child:
+            fired.append(child[_ACTION])
+            self.reset()
+        return fired
+
+    def flush(self):
+        """Fire the typed sequence if it is complete (after a pause); returns the actions"""
+        action = self._node.get(_ACTION) if self.buffer else None
+        self.reset()
+        return [action] if action else []
+
+    @property
+    def waiting(self):
+        """True while a complete sequence could still be extended (flush after FLUSH_MS)"""
+        return bool(self.buffer) and _ACTION in self._node
+
+
+class TaggingTimer:
+    """Seconds from a point's first key to its commit"""
+    def __init__(self, kept=TIMES_KEPT, clock=time.perf_counter):
+        self.clock = clock
+        self.times = deque(maxlen=kept)
+        self.keys = deque(maxlen=kept)
+        self._started = None
+        self._keys = 0
+
+    def keystroke(self):
+        if self._started is None:
+            self._started = self.clock()
+        self._keys += 1
+
+    def commit(self):
+        """The point was logged; returns its tagging time (None if no key was typed)"""
+        if self._started is None:
+            return None
+        elapsed = self.clock() - self._started
+        self.times.append(elapsed)
+        self.keys.append(self._keys)
+        self._started = None
+        self._keys = 0
+        return elapsed
+
+    def cancel(self):
+        self._started = None
+        self._keys = 0
+
+    def stats(self):
+        if not self.times:
+            return {"points": 0, "median_s": None, "p90_s": None, "keys_per_point": None}
+        ordered = sorted(self.times)
+        return {
+            "points": len(ordered),
+            "median_s": round(statistics.median(ordered), 2),
+            "p90_s": round(ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))], 2),
+            "keys_per_point": round(sum(self.keys) / len(self.keys), 1),
+        }
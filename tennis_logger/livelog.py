@@ -0,0 +1,205 @@
+"""
+Consistent reads of a log that is still being written.
+
+Every change MatchLogger makes to a daily log happens under an exclusive
+advisory lock (fcntl.flock on <log>.lock) and ends by recording the log's
+committed length, its identity (inode and mtime) and a generation counter in
+that lock file. The generation goes up whenever rows are removed (undo), so a
+reader knows whether what it read before is still a prefix of the file. Readers
+take the shared lock only
+for as long as it takes to copy the committed bytes:
+
+    live = LiveLog("tennis_log_20250501.csv")
+    reset, rows = live.poll()      # new rows since the last poll (reset: start over)
+    df = pd.read_csv(io.BytesIO(live.data))
+
+so they never see a half-written row or a file caught between truncate and
+append, and the writer is only ever held up for one small read. Without
+fcntl (Windows) the locks are skipped and the committed length alone keeps
+readers off a torn last row.
+
+A log that no longer matches its record was changed outside MatchLogger (a
+hand-corrected row, a restore from backup, a merge, or deleted and created
+again). Readers then see all of its complete rows with no generation (so a
+LiveLog starts over on every poll), and the next write takes the file as it is
+and bumps the generation. Only a partial last row past the committed length of
+the same file - a writer that died mid-write - is ever dropped.
+"""
+import os
+from contextlib import contextmanager
+
+from .reader import MatchLogReader
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+_RECORD = "{:016d} {:016d} {:020d} {:020d}\n"  # generation, length, inode, mtime (ns)
+_RECORD_SIZE = len(_RECORD.format(0, 0, 0, 0))
+
+
+def lock_path(log_path):
+    return log_path + ".lock"
+
+
+@contextmanager
+def _locked(log_path, exclusive):
+    fd = os.open(lock_path(log_path), os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield fd
+    finally:
+        os.close(fd)  # Also releases the lock
+
+
+def _read_record(fd):
+    """(generation, committed length, (inode, mtime) or None) or None if nothing was committed yet"""
+    os.lseek(fd, 0, os.SEEK_SET)
+    fields = os.read(fd, _RECORD_SIZE).split()
+    try:
+        if len(fields) == 2:  # Written before records carried the file's identity
+            return int(fields[0]), int(fields[1]), None
+        generation, length, inode, mtime = map(int, fields)
+    except ValueError:
+        return None
+    return generation, length, (inode, mtime)
+
+
+def _stat(log_path):
+    try:
+        return os.stat(log_path)
+    except FileNotFoundError:
+        return None
+
+
+def _intact(record, st):
+    """True while the log is the file the record committed, at the committed length"""
+    _, length, identity = record
+    if st is None or st.st_size != length:
+        return False
+    return identity is None or identity == (st.st_ino, st.st_mtime_ns)
+
+
+def _complete_length(log_path):
+    """Length of log_path up to its last complete line"""
+    with open(log_path, mode='rb') as f:
+        return f.read().rfind(b"\n") + 1
+
+
+def _repair_tail(log_path, record, st):
+    """Make a log that was changed outside writing() end on a complete row before appending to it"""
+    _, length, identity = record
+    if st.st_size == 0:
+        return
+    with open(log_path, mode='rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return
+        if st.st_size > length and (identity is None or identity[0] == st.st_ino):
+            # A writer died mid-write: drop its partial last row
+            f.seek(length)
+            f.truncate(length + f.read().rfind(b"\n") + 1)
+        else:
+            f.write(b"\n")  # Edited elsewhere: end the last row rather than glue the next one onto it
+
+
+def has_commit_record(log_path):
+    return os.path.isfile(lock_path(log_path))
+
+
+def commit_record(log_path):
+    """
+    (generation, committed length) of a log, or None if nothing was committed through writing().
+    The generation is None while the log does not match its record (see _committed_length).
+    """
+    if not has_commit_record(log_path):
+        return None
+    with _locked(log_path, exclusive=False) as fd:
+        if _read_record(fd) is None:
+            return None
+        return _committed_length(log_path, fd)
+
+
+@contextmanager
+def writing(log_path, truncating=False):
+    """
+    Hold the exclusive lock while changing log_path and commit its new length.
+    truncating: the change removes rows (readers must start over)
+    """
+    with _locked(log_path, exclusive=True) as fd:
+        record = _read_record(fd)
+        generation = record[0] if record else 0
+        st = _stat(log_path)
+        if record and not _intact(record, st):
+            # Changed since the last commit: take the file as it is now, readers start over
+            if st is not None:
+                _repair_tail(log_path, record, st)
+            truncating = True
+        yield
+        st = _stat(log_path)
+        size, inode, mtime = (st.st_size, st.st_ino, st.st_mtime_ns) if st else (0, 0, 0)
+        os.lseek(fd, 0, os.SEEK_SET)  # No pread/pwrite: they are missing on Windows
+        os.write(fd, _RECORD.format(generation + bool(truncating), size, inode, mtime).encode("ascii"))
+
+
+def _committed_length(log_path, fd):
+    """
+    (generation, length) readers may see: the committed ones while the log matches its record,
+    otherwise the log up to its last complete line - with generation 0 for a log written without
+    a commit record (older logger) and None for one changed outside writing().
+    """
+    record = _read_record(fd)
+    st = _stat(log_path)
+    if record and _intact(record, st):
+        return record[:2]
+    if st is None:
+        return None, 0
+    return (None if record else 0), _complete_length(log_path)
+
+
+def read_committed(log_path, start=0):
+    """(generation, committed bytes of log_path from offset start)"""
+    with _locked(log_path, exclusive=False) as fd:
+        generation, length = _committed_length(log_path, fd)
+        if length <= start:
+            return generation, b""
+        with open(log_path, mode='rb') as f:
+            f.seek(start)
+            return generation, f.read(length - start)
+
+
+class LiveLog:
+    """Follows a live log: refresh() copies what was committed since the last call"""
+    def __init__(self, log_path):
+        self.path = log_path
+        self.generation = None
+        self.data = b""
+
+    def refresh(self):
+        """'unchanged', 'appended' or 'reset' (rows were removed: data was re-read)"""
+        generation, tail = read_committed(self.path, len(self.data)) if self.generation is not None \
+            else (None, None)
+        if generation is not None and generation == self.generation:
+            if not tail:
+                return "unchanged"
+            self.data += tail
+            return "appended"
+        self.generation, self.data = read_committed(self.path)
+        return "reset"
+
+    def snapshot(self):
+        """MatchLogReader over the committed rows"""
+        return MatchLogReader.from_bytes(self.data)
+
+    def poll(self):
+        """(reset, [new row dicts]); after a reset the rows are the whole log"""
+        before = len(self.data)
+        state = self.refresh()
+        if state == "unchanged":
+            return False, []
+        if state == "reset":
+            return True, self.snapshot()[:]
+        header = self.data[:self.data.find(b"\n") + 1]
+        return False, MatchLogReader.from_bytes(header + self.data[before:])[:]
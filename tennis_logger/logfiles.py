@@ -0,0 +1,20 @@
+"""Discovery of daily log files on disk"""
+import os
+import re
+
+
+def list_daily_logs(directory=".", base_filename="tennis_log"):
+    """Sorted [(day 'YYYYMMDD', path)] of the daily logs in a directory"""
+    pattern = re.compile(rf"^{re.escape(os.path.basename(base_filename))}_(\d{{8}})\.csv$")
+    logs = []
+    for name in os.listdir(directory or "."):
+        match = pattern.match(name)
+        if match:
+            logs.append((match.group(1), os.path.join(directory, name)))
+    return sorted(logs)
+
+
+def day_of(path):
+    """'YYYYMMDD' from a daily log filename, or None"""
+    match = re.search(r"_(\d{8})\.csv$", os.path.basename(path))
+    return match.group(1) if match else None
@@ -2,6 +2,13 @@ import csv
 import os
 from datetime import datetime
 
+from .archive import roll_closed_days
+from .history import BoundedHistory, DEFAULT_DEPTH
+from .livelog import writing
+from .reader import MatchLogReader
+
+_NOT_LOADED = object()
+
 class MatchLogger:
     SCHEMA_COLUMNS = [
         "point_id", "timestamp", "set_no", "game_no", "score_before_point",
@@ -11,13 +18,24 @@ class MatchLogger:
         "pattern", "tactic_code",
         "pressure_flags",
         "final_shot_type", "final_outcome",
-        "court_pos_final", "notes"
+        "court_pos_final", "notes",
+        "match_id"
     ]
 
-    def __init__(self, base_filename="tennis_log"):
+    def __init__(self, base_filename="tennis_log", history_depth=DEFAULT_DEPTH, persist_history=False):
+        """
+        history_depth: undone points kept in memory for redo
+        persist_history: keep the redo stack in <base_filename>_redo.jsonl so it survives a restart
+        """
         self.base_filename = base_filename
+        self.match_id = ""  # Stamped on every logged row (see matches.py)
+        self.columns = self.SCHEMA_COLUMNS  # Column order of the current file
         self.last_logged_point_id = None  # Track last point for undo
-        self.undo_stack = []  # Stack of undone points that can be redone
+        self._last_generated_id = None
+        # Stack of undone points that can be redone
+        redo_path = f"{base_filename}_redo.jsonl" if persist_history else None
+        self.undo_stack = BoundedHistory(history_depth, redo_path)
+        self._last_point = _NOT_LOADED  # In-memory copy of the file's last row
         self._get_today_filename()
 
     def _get_today_filename(self):
@@ -30,14 +48,42 @@ class MatchLogger:
         """Initialize CSV file with headers if it doesn't exist"""
         file_exists = os.path.isfile(self.filename)
         if not file_exists:
-            with open(self.filename, mode='w', newline='') as f:
+            with writing(self.filename), open(self.filename, mode='w', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(self.SCHEMA_COLUMNS)
+            self.columns = self.SCHEMA_COLUMNS
+            return
+        with open(self.filename, mode='r', newline='') as f:
+            header = next(csv.reader(f), [])
+        self.columns = header
+        if any(col not in header for col in self.SCHEMA_COLUMNS):
+            self._upgrade_header()
+
+    def _upgrade_header(self):
+        """Rewrite a log started with an older schema so new columns (match_id) can be appended"""
+        with writing(self.filename, truncating=True):
+            with MatchLogReader(self.filename) as reader:
+                rows = reader[:]
+                columns = self.SCHEMA_COLUMNS + [c for c in reader.header if c not in self.SCHEMA_COLUMNS]
+            tmp_path = self.filename + ".tmp"
+            with open(tmp_path, mode='w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=columns, restval="")
+                writer.writeheader()
+                writer.writerows(rows)
+            os.replace(tmp_path, self.filename)
+        self.columns = columns
 
     def log_point(self, data):
         """
         data: dict containing keys matching SCHEMA_COLUMNS (except point_id and timestamp)
         """
+        self.log_points([data])
+
+    def log_points(self, batch):
+        """
+        Log several points with one file write (ingestion, bulk tools).
+        Each dict gets its point_id and timestamp filled in like log_point does.
+        """
         # Clear undo stack when a new point is logged (forward action)
         # This means we can't redo to lost futures
         if self.undo_stack:
@@ -49,55 +95,81 @@ class MatchLogger:
             self.filename = current_filename
             self._init_csv()
 
-        # Generate a unique point_id if not provided
-        if 'point_id' not in data or not data['point_id']:
-            point_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
-            data['point_id'] = point_id
-            self.last_logged_point_id = point_id
+        rows = []
+        for data in batch:
+            # Generate a unique point_id if not provided
+            if 'point_id' not in data or not data['point_id']:
+                point_id = self._new_point_id()
+                data['point_id'] = point_id
+                self.last_logged_point_id = point_id
 
-        # Generate readable timestamp
-        if 'timestamp' not in data or not data['timestamp']:
-            data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            # Generate readable timestamp
+            if 'timestamp' not in data or not data['timestamp']:
+                data['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        row = []
-        for col in self.SCHEMA_COLUMNS:
-            row.append(data.get(col, ""))
+            if not data.get('match_id'):
+                data['match_id'] = self.match_id
+
+            rows.append([data.get(col, "") for col in self.columns])
 
-        with open(self.filename, mode='a', newline='') as f:
+        if not rows:
+            return
+        # Readers (see livelog) only ever see whole, committed rows
+        with writing(self.filename), open(self.filename, mode='a', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(row)
+            writer.writerows(rows)
+        self._last_point = self._row_as_read(rows[-1])
+
+    def _new_point_id(self):
+        """Time-based id, kept strictly increasing when points arrive within one microsecond"""
+        point_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        last = self._last_generated_id
+        if last and point_id <= last:
+            point_id = str(int(last) + 1)
+        self._last_generated_id = point_id
+        return point_id
+
+    def _row_as_read(self, row):
+        """The dict a reader would return for a written row"""
+        return {col: "" if value is None else str(value) for col, value in zip(self.columns, row)}
 
     def _get_expected_filename(self):
         """Get the expected filename for today"""
         today = datetime.now().strftime("%Y%m%d")
         return f"{self.base_filename}_{today}.csv"
 
+    def archive_closed_days(self):
+        """Roll every daily log except the current one into monthly archives"""
+        directory = os.path.dirname(self.filename) or "."
+        return roll_closed_days(directory, self.base_filename, keep=self.filename)
+
+    def refresh_summaries(self):
+        """Bring the per-day / per-match summary store up to date (changed days only)"""
+        from .summary import SummaryStore  # summary -> export -> logger
+        directory = os.path.dirname(self.filename) or "."
+        return SummaryStore(directory, self.base_filename).refresh()
+
     def undo_last_log(self):
         """Remove the last logged row from the current log file and return it"""
         if not os.path.isfile(self.filename):
             return None
 
-        lines = []
-        with open(self.filename, mode='r', newline='') as f:
-            lines = list(csv.reader(f))
+        with writing(self.filename, truncating=True):
+            with MatchLogReader(self.filename) as reader:
+                if not len(reader):  # Keep header
+                    return None
+                # Return the removed row as a dict for potential restoration
+                removed_data = reader[-1]
+                start, _ = reader.row_span(-1)
+                self._last_point = reader[-2] if len(reader) > 1 else None
 
-        if len(lines) > 1:  # Keep header
-            last_row = lines.pop()
-            
-            with open(self.filename, mode='w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerows(lines)
-            
-            # Return the removed row as a dict for potential restoration
-            header = lines[0] if lines else self.SCHEMA_COLUMNS
-            removed_data = dict(zip(header, last_row))
-            
-            # Push to undo stack so we can restore it later
-            self.undo_stack.append(removed_data)
-            
-            return removed_data
-        
-        return None
+            # Cut the file at the start of the last row instead of rewriting it
+            os.truncate(self.filename, start)
+
+        # Push to undo stack so we can restore it later
+        self.undo_stack.append(removed_data)
+
+        return removed_data
     
     def redo_last_log(self):
         """Restore the last undone point from the undo stack"""
@@ -110,12 +182,13 @@ class MatchLogger:
         # Re-log it without clearing the undo stack
         # We need to append directly to CSV without clearing undo_stack
         row = []
-        for col in self.SCHEMA_COLUMNS:
+        for col in self.columns:
             row.append(point_data.get(col, ""))
         
-        with open(self.filename, mode='a', newline='') as f:
+        with writing(self.filename), open(self.filename, mode='a', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(row)
+        self._last_point = self._row_as_read(row)
         
         return point_data
     
@@ -125,16 +198,15 @@ class MatchLogger:
     
     def get_last_point_data(self):
         """Retrieve the data from the last point in the current log file"""
+        if self._last_point is not _NOT_LOADED:
+            return self._last_point
+
         if not os.path.isfile(self.filename):
             return None
 
-        lines = []
-        with open(self.filename, mode='r', newline='') as f:
-            lines = list(csv.reader(f))
+        self._last_point = None
+        with MatchLogReader(self.filename) as reader:
+            if len(reader):  # More than just header
+                self._last_point = reader[-1]
 
-        if len(lines) > 1:  # More than just header
-            last_row = lines[-1]
-            header = lines[0] if lines else self.SCHEMA_COLUMNS
-            return dict(zip(header, last_row))
-        
-        return None
+        return self._last_point
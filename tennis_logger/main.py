@@ -1,5 +1,41 @@
+"""
+Command-line entry point of the GUI (run.py and `python -m tennis_logger.main` both call main()).
+
+Usage:
+    python run.py --court court1 --serve 0.0.0.0:8765
+    python run.py --diagnostics memory.jsonl --history-cap 100
+    python run.py --history-cap 100 --cache-cap 500   # caps enforced without writing samples
+"""
+import argparse
+
+from tennis_logger.diagnostics import MemoryCaps, MemoryMonitor
 from tennis_logger.gui import TennisLoggerApp
 
-if __name__ == "__main__":
-    app = TennisLoggerApp()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tennis Game Logger")
+    parser.add_argument("--diagnostics", metavar="FILE", help="append memory samples (JSON lines) to FILE")
+    parser.add_argument("--diagnostics-interval", type=float, default=60, help="seconds between samples")
+    parser.add_argument("--history-cap", type=int, help="undo/redo entries kept in memory")
+    parser.add_argument("--cache-cap", type=int, help="entries per cache before it is cleared")
+    parser.add_argument("--memory-cap-mb", type=float, help="traced memory budget")
+    parser.add_argument("--court", help="log this court's match to its own files (several courts at once)")
+    parser.add_argument("--serve", metavar="HOST:PORT",
+                        help="accept points from other devices, e.g. 0.0.0.0:8765 (see tennis_logger.server)")
+    args = parser.parse_args(argv)
+
+    caps = MemoryCaps(args.history_cap, args.cache_cap, args.memory_cap_mb)
+    monitor = None
+    if args.diagnostics or caps.any():
+        monitor = MemoryMonitor(args.diagnostics, caps)  # Without a file the samples stay in memory
+    ingest = None
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        ingest = (host or "127.0.0.1", int(port))
+    app = TennisLoggerApp(caps=caps, diagnostics=monitor, diagnostics_interval_s=args.diagnostics_interval,
+                          ingest=ingest, court=args.court)
     app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
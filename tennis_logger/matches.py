@@ -0,0 +1,97 @@
+"""
+Match registry: who a match was against, where and under which format.
+
+Every row MatchLogger writes carries the match_id of the match being logged.
+The registry (<base_filename>_matches.json) maps each match_id to the
+metadata entered when the match was set up - opponent, surface, format - and
+to when it started and closed, so head-to-head questions join on match_id
+instead of filtering files by hand.
+"""
+import json
+import os
+from datetime import datetime
+
+REGISTRY_VERSION = 1
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def new_match_id(now=None):
+    return (now or datetime.now()).strftime("%Y%m%d%H%M%S")
+
+
+def match_days(entry):
+    """'YYYYMMDD' days a match may have rows in (it can run past midnight)"""
+    first = entry["started"][:10].replace("-", "")
+    last = (entry.get("closed") or entry["started"])[:10].replace("-", "")
+    days = [first]
+    if last != first:
+        days.append(last)
+    return days
+
+
+class MatchRegistry:
+    def __init__(self, directory=".", base_filename="tennis_log", path=None):
+        self.directory = directory
+        self.base_filename = base_filename
+        self.path = path or os.path.join(directory, f"{os.path.basename(base_filename)}_matches.json")
+        self.matches = {}  # match_id -> {"match_id", "opponent", "surface", "format", "started", "closed"}
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, mode='r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == REGISTRY_VERSION:
+                    self.matches = data["matches"]
+            except (OSError, ValueError):
+                pass
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump({"version": REGISTRY_VERSION, "matches": self.matches}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def start(self, opponent, surface="", match_format="", now=None):
+        """Register a new match; returns its entry"""
+        now = now or datetime.now()
+        match_id = new_match_id(now)
+        n = 1
+        while match_id in self.matches:  # Two matches set up within a second
+            n += 1
+            match_id = f"{new_match_id(now)}-{n}"
+        entry = {"match_id": match_id, "opponent": opponent.strip(), "surface": surface,
+                 "format": match_format, "started": now.strftime(_TIME_FORMAT), "closed": ""}
+        self.matches[match_id] = entry
+        self.save()
+        return entry
+
+    def close(self, match_id, now=None):
+        entry = self.matches.get(match_id)
+        if entry and not entry["closed"]:
+            entry["closed"] = (now or datetime.now()).strftime(_TIME_FORMAT)
+            self.save()
+        return entry
+
+    def get(self, match_id):
+        return self.matches.get(match_id)
+
+    def current(self):
+        """The most recently started match that is still open, or None"""
+        open_matches = [m for m in self.matches.values() if not m["closed"]]
+        return max(open_matches, key=lambda m: m["match_id"]) if open_matches else None
+
+    def query(self, opponent=None, surface=None, closed=None):
+        """Entries in start order, optionally filtered"""
+        entries = []
+        for match_id in sorted(self.matches):
+            entry = self.matches[match_id]
+            if opponent is not None and entry["opponent"].lower() != opponent.strip().lower():
+                continue
+            if surface is not None and entry["surface"] != surface:
+                continue
+            if closed is not None and bool(entry["closed"]) != closed:
+                continue
+            entries.append(entry)
+        return entries
+
+    def opponents(self):
+        return sorted({entry["opponent"] for entry in self.matches.values() if entry["opponent"]})
@@ -0,0 +1,247 @@
+"""
+Merge daily logs captured on several devices into one canonical log per day.
+
+The same match is often logged on two laptops, or a day is split across
+machines. merge_logs() takes any number of log directories (live and
+archived days) or single daily log files, and merges each day's logs
+with heapq.merge on (timestamp, point_id) - the order every log is already
+written in - so only one day is open at a time and only the points of the
+last few seconds are held in memory, however many months are merged.
+
+Two rows are the same point when they share a point_id, or when they come
+from different devices and record the same set, game and score before the
+point within WINDOW seconds of each other. Same point with the same tags is
+a duplicate and is written once; same point with different tags is a
+conflict, resolved by the policy:
+
+    first     keep the row of the input listed first
+    complete  keep the row with the most filled-in tags (ties: input order)
+    both      keep every version
+    drop      keep none
+
+Every duplicate and conflict goes to the report (CSV) with the differing
+fields, so conflicts can be fixed by hand afterwards.
+
+Usage:
+    python -m tennis_logger.merge laptop1/ laptop2/ --out merged/ --policy complete
+"""
+import argparse
+import csv
+import heapq
+import os
+from collections import deque
+
+from .archive import DaySource, list_log_days
+from .logfiles import day_of
+from .logger import MatchLogger
+from .video import point_time
+
+POLICIES = ("first", "complete", "both", "drop")
+WINDOW = 30.0  # seconds within which two devices' rows for the same score are one point
+SITUATION_FIELDS = ("set_no", "game_no", "score_before_point")
+IGNORED_FIELDS = ("point_id", "timestamp")  # Differ between devices for the same point
+REPORT_COLUMNS = ["day", "timestamp", "kind", "sources", "point_ids", "fields", "resolution"]
+
+
+def _sort_key(row):
+    return row.get("timestamp", ""), row.get("point_id", "")
+
+
+def _row_time(row):
+    try:
+        return point_time(row)
+    except (KeyError, ValueError):
+        return None
+
+
+def _tagged(row, columns):
+    return {c: row.get(c, "") for c in columns if c not in IGNORED_FIELDS}
+
+
+class _Point:
+    """One point as seen by one or more inputs"""
+    __slots__ = ("time", "versions")
+
+    def __init__(self, time, source, row):
+        self.time = time
+        self.versions = [(source, row)]
+
+    def sources(self):
+        return {source for source, _ in self.versions}
+
+
+def _resolve(point, columns, policy):
+    """(rows to write, report kind or None, differing fields)"""
+    versions = sorted(point.versions, key=lambda v: v[0])
+    if len(versions) == 1:
+        return [versions[0][1]], None, []
+    tags = [_tagged(row, columns) for _, row in versions]
+    fields = [c for c in tags[0] if any(t[c] != tags[0][c] for t in tags[1:])]
+    if not fields:
+        return [versions[0][1]], "duplicate", []
+    if policy == "both":
+        rows = [row for _, row in versions]
+    elif policy == "drop":
+        rows = []
+    elif policy == "complete":
+        best = max(range(len(versions)), key=lambda i: (sum(1 for v in tags[i].values() if v), -i))
+        rows = [versions[best][1]]
+    else:
+        rows = [versions[0][1]]
+    return rows, "conflict", fields
+
+
+def _numbered(n, rows):
+    for row in rows:
+        yield n, row
+
+
+def _day_rows(sources):
+    """[(source number, row)] of one day, merged on (timestamp, point_id)"""
+    readers = [source.open() for source in sources]
+    try:
+        streams = [_numbered(n, reader) for n, reader in enumerate(readers)]
+        yield from heapq.merge(*streams, key=lambda item: _sort_key(item[1]))
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+def merge_day(day, sources, out_path, policy="first", window=WINDOW, report=None):
+    """
+    Merge one day's DaySources (in priority order) into out_path.
+    report: csv.writer for duplicates and conflicts
+    Returns {"day", "rows_in", "rows_out", "duplicates", "conflicts", "out_of_order"}.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r} (one of {', '.join(POLICIES)})")
+    columns = list(MatchLogger.SCHEMA_COLUMNS)
+    for source in sources:
+        with source.open() as reader:
+            columns += [c for c in reader.header if c not in columns]
+    stats = {"day": day, "rows_in": 0, "rows_out": 0, "duplicates": 0, "conflicts": 0, "out_of_order": 0}
+    pending = deque()  # Points still inside the window, in time order
+    by_id = {}
+    by_situation = {}  # (set, game, score) -> [pending points], oldest first
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, mode='w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval="", extrasaction='ignore')
+        writer.writeheader()
+
+        def flush(until):
+            while pending and (until is None or pending[0].time is None or pending[0].time < until):
+                point = pending.popleft()
+                for source, row in point.versions:
+                    if by_id.get(row.get("point_id")) is point:
+                        del by_id[row["point_id"]]
+                situation = tuple(point.versions[0][1].get(c, "") for c in SITUATION_FIELDS)
+                same = by_situation.get(situation)
+                if same and point in same:
+                    same.remove(point)
+                    if not same:
+                        del by_situation[situation]
+                rows, kind, fields = _resolve(point, columns, policy)
+                writer.writerows(rows)
+                stats["rows_out"] += len(rows)
+                if kind:
+                    stats[kind + "s"] += 1
+                    if report is not None:
+                        report.writerow([day, point.versions[0][1].get("timestamp", ""), kind,
+                                         " ".join(str(s) for s, _ in point.versions),
+                                         " ".join(row.get("point_id", "") for _, row in point.versions),
+                                         " ".join(fields), f"kept {len(rows)}"])
+
+        last_key = [None] * len(sources)
+        for source, row in _day_rows(sources):
+            stats["rows_in"] += 1
+            key = _sort_key(row)
+            if last_key[source] is not None and key < last_key[source]:
+                stats["out_of_order"] += 1
+            last_key[source] = key
+            time = _row_time(row)
+            if time is not None:
+                flush(time - window)
+
+            point = by_id.get(row.get("point_id")) if row.get("point_id") else None
+            situation = tuple(row.get(c, "") for c in SITUATION_FIELDS)
+            if point is None and time is not None and all(situation):
+                # The earliest pending point with this score that this input has not logged yet
+                point = next((p for p in by_situation.get(situation, ())
+                              if source not in p.sources() and p.time is not None), None)
+            if point is not None:
+                point.versions.append((source, row))
+            else:
+                point = _Point(time, source, row)
+                pending.append(point)
+                if time is not None and all(situation):
+                    by_situation.setdefault(situation, []).append(point)
+            if row.get("point_id"):
+                by_id[row["point_id"]] = point
+        flush(None)
+    os.replace(tmp_path, out_path)
+    return stats
+
+
+def _group_by_day(inputs, base_filename):
+    """{day: [DaySource in input order]} for directories and daily log files"""
+    days = {}
+    for path in inputs:
+        if os.path.isdir(path):
+            sources = list_log_days(path, base_filename)
+        else:
+            sources = [DaySource(day_of(path), path=path)]
+        for source in sources:
+            if source.day is None:
+                raise ValueError(f"{source.path}: not a daily log (<base>_YYYYMMDD.csv)")
+            days.setdefault(source.day, []).append(source)
+    return days
+
+
+def merge_logs(inputs, out_dir, base_filename="tennis_log", policy="first", window=WINDOW,
+               report_path=None, days=None):
+    """
+    Merge every day found in inputs (directories and/or daily log files, highest priority first)
+    into <out_dir>/<base_filename>_YYYYMMDD.csv, one day at a time. Returns the per-day stats.
+    report_path: CSV of duplicates and conflicts (default <out_dir>/<base_filename>_merge_report.csv)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    out_dir_abs = os.path.abspath(out_dir)
+    grouped = _group_by_day(inputs, base_filename)
+    for sources in grouped.values():
+        for source in sources:
+            if not source.archived and os.path.dirname(os.path.abspath(source.path)) == out_dir_abs:
+                raise ValueError(f"{source.path}: the output directory must not be one of the inputs")
+    report_path = report_path or os.path.join(out_dir, f"{base_filename}_merge_report.csv")
+    results = []
+    with open(report_path, mode='w', newline='') as f:
+        report = csv.writer(f)
+        report.writerow(REPORT_COLUMNS)
+        for day in sorted(grouped):
+            if days and day not in days:
+                continue
+            out_path = os.path.join(out_dir, f"{base_filename}_{day}.csv")
+            results.append(merge_day(day, grouped[day], out_path, policy, window, report))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge daily logs from several devices, dropping duplicate points")
+    parser.add_argument("inputs", nargs="+", help="log directories or daily log files, highest priority first")
+    parser.add_argument("--out", required=True, help="directory for the merged logs")
+    parser.add_argument("--base", default="tennis_log")
+    parser.add_argument("--policy", choices=POLICIES, default="first", help="how to resolve conflicting points")
+    parser.add_argument("--window", type=float, default=WINDOW,
+                        help="seconds within which two devices' rows for the same score are one point")
+    parser.add_argument("--report", help="conflict report CSV (default <out>/<base>_merge_report.csv)")
+    parser.add_argument("--day", action="append", help="YYYYMMDD (repeatable; default all days)")
+    args = parser.parse_args(argv)
+
+    results = merge_logs(args.inputs, args.out, args.base, args.policy, args.window, args.report, args.day)
+    for r in results:
+        print(f"{r['day']}: {r['rows_in']} rows in, {r['rows_out']} out, {r['duplicates']} duplicates, "
+              f"{r['conflicts']} conflicts" + (f", {r['out_of_order']} out of order" if r['out_of_order'] else ""))
+
+
+if __name__ == "__main__":
+    main()
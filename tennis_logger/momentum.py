@@ -0,0 +1,190 @@
+"""
+Rolling "last N points / last N games" statistics for the momentum panel.
+
+Every statistic is a running sum over a fixed-size array ring buffer, so
+recording a point, undoing it and reading the panel are all O(1) and memory
+does not grow with the session. The buffers hold `undo_depth` values beyond
+the window so that undo restores the values that had slid out of the window
+and the statistics come back exactly.
+
+That only holds within `undo_depth` net undos. The score's undo history can
+go further back (it spills to disk), so once a window has lost values it can
+no longer restore, exact() turns False and the owner rebuilds the tracker
+from the logged rows (see game_winners).
+"""
+from array import array
+
+
+class RingWindow:
+    """
+    Running sum of the last `window` values. Undo (pop) restores the values that slid
+    out of the window for up to `undo_depth` net pops; past that the window holds fewer
+    values than it should until enough are pushed again (see exact()).
+    """
+    def __init__(self, window, undo_depth, typecode='b'):
+        self.window = window
+        self.capacity = window + max(1, undo_depth)
+        self._buf = array(typecode, [0]) * self.capacity
+        self._count = 0  # values pushed (minus popped)
+        self._start = 0  # first index inside the window
+        self._low = 0  # oldest index whose value is still stored
+        self.sum = 0
+
+    def push(self, value):
+        self._buf[self._count % self.capacity] = value
+        self.sum += value
+        self._count += 1
+        self._low = max(self._low, self._count - self.capacity)
+        if self._count - self._start > self.window:
+            self.sum -= self._buf[self._start % self.capacity]
+            self._start += 1
+
+    def pop(self):
+        """Remove and return the newest value (None if empty)"""
+        if self._count <= self._start:
+            return None
+        self._count -= 1
+        value = self._buf[self._count % self.capacity]
+        self.sum -= value
+        if self._start > self._low:
+            # Slide the value that had left the window back in
+            self._start -= 1
+            self.sum += self._buf[self._start % self.capacity]
+        return value
+
+    def clear(self):
+        self._count = self._start = self._low = 0
+        self.sum = 0
+
+    def exact(self):
+        """False while undo has gone past the stored values (the window is short)"""
+        return len(self) == min(self.window, self._count)
+
+    def last(self, default=0):
+        if self._count <= self._start:
+            return default
+        return self._buf[(self._count - 1) % self.capacity]
+
+    def __len__(self):
+        return self._count - self._start
+
+
+def _rate(numerator, denominator):
+    return round(100.0 * numerator / denominator, 1) if denominator else None
+
+
+class MomentumTracker:
+    # Per-point game events stored with the point so undo can reverse them
+    NO_GAME, GAME_ME, GAME_OPPONENT = 0, 1, 2
+
+    def __init__(self, points_window=20, games_window=6, undo_depth=200):
+        pts = lambda typecode='b': RingWindow(points_window, undo_depth, typecode)
+        self.decided = pts()  # 1 if the point has a known winner
+        self.won = pts()
+        self.served = pts()  # 1 if I served
+        self.first_in = pts()  # 1 if I served and the point was played on a first serve
+        self.unforced = pts()  # 1 if I lost the point with an unforced error
+        self.streak = pts('h')  # signed run of won (+) / lost (-) points after each point
+        self.game_event = pts()
+        self.games = RingWindow(games_window, undo_depth)  # 1 if I won the game
+
+    def push(self, row, game_winner=None):
+        """
+        row: point data as logged (final_outcome W/L/U, server, serve_number, ...)
+        game_winner: 'me' / 'opponent' if this point completed a game
+        """
+        outcome = row.get("final_outcome", "U")
+        won = outcome == "W"
+        decided = outcome in ("W", "L")
+        served = row.get("server") in ("m", "n")
+        first_in = served and str(row.get("serve_number")) == "1" and \
+            not str(row.get("serve_code", "")).startswith(("Fault", "Double Fault"))
+        unforced = outcome == "L" and str(row.get("final_shot_type", "")).startswith("Unforced Error")
+
+        streak = self.streak.last()
+        if decided:
+            if won:
+                streak = streak + 1 if streak > 0 else 1
+            else:
+                streak = streak - 1 if streak < 0 else -1
+
+        self.decided.push(int(decided))
+        self.won.push(int(won))
+        self.served.push(int(served))
+        self.first_in.push(int(first_in))
+        self.unforced.push(int(unforced))
+        self.streak.push(max(-32768, min(32767, streak)))
+        if game_winner:
+            self.games.push(int(game_winner == 'me'))
+            self.game_event.push(self.GAME_ME if game_winner == 'me' else self.GAME_OPPONENT)
+        else:
+            self.game_event.push(self.NO_GAME)
+
+    def reset(self):
+        """Forget every point (a new match starts)"""
+        for ring in (self.decided, self.won, self.served, self.first_in, self.unforced, self.streak,
+                     self.game_event, self.games):
+            ring.clear()
+
+    def exact(self):
+        """False once undo went further back than undo_depth; rebuild() restores the statistics"""
+        return self.decided.exact() and self.games.exact()
+
+    def rebuild(self, points):
+        """Start over from [(row, game winner or None)], e.g. game_winners() of the match's rows"""
+        self.reset()
+        for row, winner in points:
+            self.push(row, winner)
+
+    def pop(self):
+        """Undo the most recent push (no-op when nothing was recorded)"""
+        if not len(self.decided):
+            return
+        for ring in (self.decided, self.won, self.served, self.first_in, self.unforced, self.streak):
+            ring.pop()
+        if self.game_event.pop() != self.NO_GAME:
+            self.games.pop()
+
+    def snapshot(self):
+        return {
+            "points": len(self.decided),
+            "win_rate": _rate(self.won.sum, self.decided.sum),
+            "first_serve_in": _rate(self.first_in.sum, self.served.sum),
+            "unforced_rate": _rate(self.unforced.sum, len(self.decided)),
+            "streak": self.streak.last(),
+            "games": len(self.games),
+            "game_win_rate": _rate(self.games.sum, len(self.games)),
+        }
+
+
+def game_winner(before, game_state):
+    """
+    Who won a game during the last point.
+    before: (games_me, games_opponent, sets_me, sets_opponent) taken before the point
+    """
+    games_me, games_opponent, sets_me, sets_opponent = before
+    if game_state.games_me > games_me or game_state.sets_me > sets_me:
+        return 'me'
+    if game_state.games_opponent > games_opponent or game_state.sets_opponent > sets_opponent:
+        return 'opponent'
+    return None
+
+
+def game_winners(rows, next_game=None):
+    """
+    Yield (row, game winner or None) for a match's logged rows: a point won the game
+    when the next point is played in another game.
+    next_game: (set_no, game_no) of the point after the last row (the current score)
+    """
+    games = [(str(row.get("set_no")), str(row.get("game_no"))) for row in rows]
+    games.append(next_game and (str(next_game[0]), str(next_game[1])))
+    for row, game, following in zip(rows, games, games[1:]):
+        winner = None
+        if following is not None and following != game:
+            winner = {"W": 'me', "L": 'opponent'}.get(row.get("final_outcome"))
+        yield row, winner
+
+
+def score_counts(game_state):
+    """The (games, sets) counters game_winner compares against"""
+    return (game_state.games_me, game_state.games_opponent, game_state.sets_me, game_state.sets_opponent)
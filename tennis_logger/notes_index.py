@@ -0,0 +1,246 @@
+"""
+Inverted full-text index over the notes column.
+
+Each day's log is one segment holding the day's notes (point_id and text
+per row) and a positional posting list per token: [row, position, row,
+position, ...]. Queries are answered from the postings alone:
+
+    slice              rows whose note has the token
+    appr*              prefix: any token starting with appr (bisect over the sorted vocabulary)
+    "short ball"       phrase: the tokens next to each other, in order
+    backhand -slice    a leading - excludes rows
+
+Terms are ANDed. Rows are numbered like the bitmap index - (day, row) - so
+a notes query can be ANDed with categorical filters (final_outcome=L,
+situation=BREAK_POINT...) in one call. Each segment is stored as its own
+zlib-compressed JSON file (see daystore). refresh() re-reads only the days
+whose log changed, and for a live log that has only grown since it was last
+indexed (same commit generation, see livelog) it only indexes the new rows.
+The GUI refreshes today's segment on a worker thread after every point, which
+rewrites that one segment file.
+
+Usage:
+    python -m tennis_logger.notes_index '"short ball" approach*' final_outcome=L --last-days 90
+"""
+import argparse
+import os
+import re
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from .archive import list_log_days
+from .daystore import DayStore, day_key
+from .livelog import commit_record
+
+NOTES_VERSION = 2
+_TOKEN = re.compile(r"[\w']+")
+_QUERY = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+def tokenize(text):
+    """Lower-case word tokens of a note, in order"""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        token = token.strip("'")
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+def parse_query(query):
+    """[(exclude, [terms])]: one entry per word or quoted phrase"""
+    clauses = []
+    for m in _QUERY.finditer(query):
+        if m.group(2) is not None:
+            exclude, text = m.group(1), m.group(2)
+        else:
+            exclude, text = m.group(3), m.group(4)
+        prefix = text.rstrip().endswith("*")
+        terms = tokenize(text)
+        if not terms:
+            continue
+        if prefix:
+            terms[-1] += "*"
+        clauses.append((bool(exclude), terms))
+    return clauses
+
+
+def _index_rows(seg, rows, first_row):
+    """Add rows (dicts, numbered from first_row) to a segment"""
+    for row_no, row in enumerate(rows, start=first_row):
+        text = (row.get("notes") or "").strip()
+        if not text:
+            continue
+        seg["notes"][str(row_no)] = [row.get("point_id", ""), text]
+        for position, token in enumerate(tokenize(text)):
+            seg["postings"].setdefault(token, []).extend((row_no, position))
+
+
+def new_segment():
+    return {"rows": 0, "size": 0, "mtime": 0, "generation": None, "notes": {}, "postings": {}}
+
+
+class NotesIndex:
+    def __init__(self, directory=".", base_filename="tennis_log", path=None):
+        """path: directory of the per-day segment files"""
+        self.directory = directory
+        self.base_filename = base_filename
+        self.path = path or os.path.join(directory, f"{os.path.basename(base_filename)}_notes")
+        self._store = DayStore(self.path, NOTES_VERSION, segmented=True, compress=True)
+        self.segments = self._store.entries  # day -> segment (see new_segment)
+        self._vocabulary = None  # sorted tokens of every segment, built on first prefix query
+
+    def save(self):
+        self._store.save()
+
+    @staticmethod
+    def _build(source, seg):
+        record = None if source.archived else commit_record(source.path)
+        generation = record[0] if record else None
+        appended = (seg is not None and generation is not None and seg["generation"] == generation
+                    and source.stat()[0] > seg["size"])
+        if not appended:
+            seg = new_segment()
+        with source.open() as reader:
+            _index_rows(seg, reader.iter_rows(seg["rows"]), seg["rows"])
+            seg["rows"] = len(reader)
+        seg["generation"] = generation
+        return seg
+
+    def refresh(self, days=None):
+        """
+        Index new or changed days (all, or only the given 'YYYYMMDD' days); returns them.
+        A live log that only grew since it was indexed has just its new rows indexed.
+        """
+        changed, removed = self._store.refresh(list_log_days(self.directory, self.base_filename),
+                                               self._build, days)
+        if changed or removed:
+            self._vocabulary = None
+        return changed
+
+    def vocabulary(self):
+        if self._vocabulary is None:
+            tokens = set()
+            for seg in self.segments.values():
+                tokens.update(seg["postings"])
+            self._vocabulary = sorted(tokens)
+        return self._vocabulary
+
+    def expand(self, term):
+        """Tokens a query term stands for ('appr*' -> every token with that prefix)"""
+        if not term.endswith("*"):
+            return [term]
+        prefix = term[:-1]
+        vocabulary = self.vocabulary()
+        tokens = []
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            tokens.append(vocabulary[i])
+            i += 1
+        return tokens
+
+    @staticmethod
+    def _positions(seg, tokens):
+        """{row: {positions}} of any of the tokens in a segment"""
+        found = {}
+        for token in tokens:
+            postings = seg["postings"].get(token, ())
+            for i in range(0, len(postings), 2):
+                found.setdefault(postings[i], set()).add(postings[i + 1])
+        return found
+
+    def _clause_rows(self, seg, terms, expanded):
+        """Rows of a segment matching one word or phrase"""
+        current = self._positions(seg, expanded[terms[0]])
+        for offset, term in enumerate(terms[1:], start=1):
+            if not current:
+                break
+            following = self._positions(seg, expanded[term])
+            current = {row: {p for p in starts if p + offset in following.get(row, ())}
+                       for row, starts in current.items() if row in following}
+            current = {row: starts for row, starts in current.items() if starts}
+        return set(current)
+
+    def bitmap(self, day, query):
+        """Bitmap (bit i = row i) of a day's rows whose note matches the query"""
+        clauses = parse_query(query)
+        seg = self.segments.get(day)
+        if seg is None or not clauses:
+            return 0
+        expanded = {term: self.expand(term) for _, terms in clauses for term in terms}
+        rows = None
+        excluded = set()
+        for exclude, terms in clauses:
+            found = self._clause_rows(seg, terms, expanded)
+            if exclude:
+                excluded |= found
+            else:
+                rows = found if rows is None else rows & found
+        if rows is None:  # Only exclusions: every row with a note
+            rows = {int(row) for row in seg["notes"]}
+        bits = 0
+        for row in rows - excluded:
+            bits |= 1 << row
+        return bits
+
+    def search(self, query, since=None, until=None, days=None, bitmaps=None, **filters):
+        """
+        [(day, row number, point_id, note)] of the points whose note matches query.
+        bitmaps: a refreshed BitmapIndex to AND the categorical filters (column=value) with
+        """
+        if filters and bitmaps is None:
+            raise ValueError("Categorical filters need a BitmapIndex (bitmaps=)")
+        since = day_key(since) if since else None
+        until = day_key(until) if until else None
+        days = {day_key(day) for day in days} if days else None
+        allowed = dict(bitmaps.match(since, until, days, **filters)) if filters else None
+        results = []
+        for day in sorted(self.segments):
+            if (since and day < since) or (until and day > until) or (days and day not in days):
+                continue
+            bits = self.bitmap(day, query)
+            if bits and allowed is not None:
+                bits &= allowed.get(day, 0)
+            notes = self.segments[day]["notes"]
+            while bits:
+                low = bits & -bits
+                row = low.bit_length() - 1
+                point_id, text = notes[str(row)]
+                results.append((day, row, point_id, text))
+                bits ^= low
+        return results
+
+    def last_days(self, query, days, today=None, bitmaps=None, **filters):
+        today = today or datetime.now()
+        return self.search(query, since=today - timedelta(days=days - 1), until=today, bitmaps=bitmaps, **filters)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh and search the notes index")
+    parser.add_argument("query", help='words, prefix* and "phrases" (ANDed); -word excludes')
+    parser.add_argument("filters", nargs="*", help="column=value[|value...] (see bitmap_index)")
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--base", default="tennis_log")
+    parser.add_argument("--last-days", type=int)
+    args = parser.parse_args(argv)
+
+    index = NotesIndex(args.dir, args.base)
+    index.refresh()
+    bitmaps = None
+    filters = {}
+    if args.filters:
+        from .bitmap_index import BitmapIndex, parse_filters
+        bitmaps = BitmapIndex(args.dir, args.base)
+        bitmaps.refresh()
+        filters = parse_filters(args.filters)
+    if args.last_days:
+        results = index.last_days(args.query, args.last_days, bitmaps=bitmaps, **filters)
+    else:
+        results = index.search(args.query, bitmaps=bitmaps, **filters)
+    for day, row, point_id, text in results:
+        print(f"{day} row {row} ({point_id}): {text}")
+    print(f"{len(results)} point(s)")
+
+
+if __name__ == "__main__":
+    main()
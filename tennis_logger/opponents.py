@@ -0,0 +1,173 @@
+"""
+Per-opponent aggregates for scouting.
+
+The opponent store (<base_filename>_opponents.json) keeps, for every
+opponent, mergeable summary counters (see summary.py) per situation: all
+points, my first / second serve, their first / second serve, each pressure
+situation (break point, deuce, ...) and the surface. A match is added once,
+when it closes, so the store grows incrementally and a scouting question
+like "how often do they win the point returning my second serve" is a
+dictionary lookup rather than a pass over every log:
+
+    store = OpponentStore()
+    store.refresh()                        # add matches closed since last time
+    store.their_win_rate("J. Smith", "my_serve_2")
+
+Usage:
+    python -m tennis_logger.opponents "J. Smith"
+"""
+import argparse
+import json
+import os
+
+from .archive import list_log_days
+from .game_state import decode_situation
+from .matches import MatchRegistry, match_days
+from .summary import _flat, add_point, merge_summaries, new_summary
+
+OPPONENTS_VERSION = 1
+
+
+def situations(row, surface=""):
+    """Situation keys a logged row counts towards"""
+    keys = ["all"]
+    serve_number = "2" if str(row.get("serve_number")) == "2" else "1"
+    if row.get("server") in ("m", "n"):
+        keys.append(f"my_serve_{serve_number}")
+    elif row.get("server") == "o":
+        keys.append(f"their_serve_{serve_number}")
+    keys += [tag.lower() for tag in decode_situation(row.get("pressure_flags"))]
+    if surface:
+        keys.append(f"surface_{surface.lower()}")
+    return keys
+
+
+def summarize_match(rows, surface=""):
+    """{situation: summary} for one match's rows"""
+    counters = {}
+    for row in rows:
+        for key in situations(row, surface):
+            add_point(counters.setdefault(key, new_summary()), row)
+    return counters
+
+
+def match_rows(directory, base_filename, entry):
+    """The logged rows of a registered match"""
+    days = match_days(entry)
+    rows = []
+    for source in list_log_days(directory, base_filename):
+        if source.day not in days:
+            continue
+        with source.open() as reader:
+            if "match_id" not in reader.header:
+                continue  # Logged before matches had ids
+            rows += [row for row in reader if row.get("match_id") == entry["match_id"]]
+    return rows
+
+
+class OpponentStore:
+    def __init__(self, directory=".", base_filename="tennis_log", path=None):
+        self.directory = directory
+        self.base_filename = base_filename
+        self.path = path or os.path.join(directory, f"{os.path.basename(base_filename)}_opponents.json")
+        self.opponents = {}  # opponent -> {"name", "matches": [match_id], "situations": {key: summary}}
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, mode='r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == OPPONENTS_VERSION:
+                    self.opponents = data["opponents"]
+            except (OSError, ValueError):
+                pass  # Rebuilt by the next refresh
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump({"version": OPPONENTS_VERSION, "opponents": self.opponents}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _key(opponent):
+        return opponent.strip().lower()
+
+    def has_match(self, entry):
+        record = self.opponents.get(self._key(entry["opponent"]))
+        return bool(record) and entry["match_id"] in record["matches"]
+
+    def add_match(self, entry, rows, save=True):
+        """Merge a closed match's counters into its opponent (once per match); returns True if added"""
+        if not entry["opponent"] or self.has_match(entry):
+            return False
+        record = self.opponents.setdefault(self._key(entry["opponent"]),
+                                           {"name": entry["opponent"], "matches": [], "situations": {}})
+        for key, summary in summarize_match(rows, entry.get("surface", "")).items():
+            merge_summaries(record["situations"].setdefault(key, new_summary()), summary)
+        record["matches"].append(entry["match_id"])
+        if save:
+            self.save()
+        return True
+
+    def refresh(self, registry=None):
+        """Add every closed match not in the store yet; returns their match_ids"""
+        registry = registry or MatchRegistry(self.directory, self.base_filename)
+        added = []
+        for entry in registry.query(closed=True):
+            if entry["opponent"] and not self.has_match(entry):
+                rows = match_rows(self.directory, self.base_filename, entry)
+                if self.add_match(entry, rows, save=False):
+                    added.append(entry["match_id"])
+        if added:
+            self.save()
+        return added
+
+    def lookup(self, opponent, situation="all"):
+        """Summary counters against an opponent in a situation (empty if never seen)"""
+        record = self.opponents.get(self._key(opponent))
+        if not record or situation not in record["situations"]:
+            return new_summary()
+        return record["situations"][situation]
+
+    def their_win_rate(self, opponent, situation="all"):
+        """Percentage of decided points the opponent won in a situation, or None"""
+        summary = self.lookup(opponent, situation)
+        decided = summary["won"] + summary["lost"]
+        return round(100.0 * summary["lost"] / decided, 1) if decided else None
+
+    def report(self, opponent):
+        """Flat rows, one per situation, for a scouting report"""
+        record = self.opponents.get(self._key(opponent))
+        if not record:
+            return []
+        rows = []
+        for key in sorted(record["situations"], key=lambda k: (k != "all", k)):
+            row = _flat(record["situations"][key], opponent=record["name"], situation=key)
+            row["their_win_rate"] = self.their_win_rate(opponent, key)
+            rows.append(row)
+        return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scouting report against an opponent")
+    parser.add_argument("opponent", nargs="?", help="omit to list known opponents")
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--base", default="tennis_log")
+    args = parser.parse_args(argv)
+
+    store = OpponentStore(args.dir, args.base)
+    store.refresh()
+    if not args.opponent:
+        for record in sorted(store.opponents.values(), key=lambda r: r["name"]):
+            print(f"{record['name']}: {len(record['matches'])} match(es)")
+        return
+    rows = store.report(args.opponent)
+    if not rows:
+        print(f"No closed matches against {args.opponent}")
+        return
+    print(f"{rows[0]['opponent']} ({len(store.opponents[store._key(args.opponent)]['matches'])} match(es))")
+    for row in rows:
+        rate = "--" if row["their_win_rate"] is None else f"{row['their_win_rate']:.0f}%"
+        print(f"  {row['situation']:<20} {row['points']:>5} pts   they won {rate}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Option vocabularies shown by the GUI.
+
+Kept in a module of their own so that tooling (export, synthetic data, ...)
+can use the exact strings the GUI writes without importing customtkinter.
+"""
+
+# Serve code popup: regular serves first, then point-ending serves at bottom
+SERVE_CODE_OPTIONS = ["In (I)", "Fault (SF)", "Double Fault (DF)", "Wide (WB)", "Ace (A)", "Winner (W)"]
+
+# Serve codes that end the point (selecting one auto-logs it)
+POINT_ENDING_SERVE_CODES = ["Ace (A)", "Winner (W)"]
+
+RALLY_OPTIONS = ["Short", "Medium", "Long"]
+
+# Merged options - removed duplicates and combined similar tactics
+POINT_TYPE_OPTIONS = [
+    ("Unknown (UNK)", "Unknown (UNK)"),
+    ("Rally (R)\nBaseline exchange", "Rally (R)"),
+    ("Serve + 1 (S1)\nServe then attack", "Serve + 1 (S1)"),
+    ("Return + 1 (R1)\nReturn then attack", "Return + 1 (R1)"),
+    ("First Strike (F)\nShort point < 4 shots", "First Strike (F)"),
+    ("Approach (A)\nTransition to net", "Approach (A)"),
+    ("Net Play (N)\nVolleys & Overheads", "Net Play (N)"),
+    ("Passing Shot (P)\nPass net player", "Passing Shot (P)"),
+    ("Lob/Deep Ball (L)\nHigh or deep shot", "Lob/Deep Ball (L)"),
+    ("Defense (D)\nScrambling", "Defense (D)"),
+    ("Move Opponent (M)\nAngles / Change Dir / Run", "Move Opponent (M)"),
+    ("Consistency (C)\nHigh % shot", "Consistency (C)"),
+    ("Body (B)\nJam the opponent", "Body (B)"),
+    ("Pace (PC)\nOverwhelm with speed", "Pace (PC)"),
+    ("Serve & Volley (SV)\nServe -> Net", "Serve & Volley (SV)"),
+    ("Chip & Charge (CC)\nSlice return -> Net", "Chip & Charge (CC)"),
+    ("Drop Shot (DS)\nDraw them in", "Drop Shot (DS)"),
+    ("Backhand Slice (BS)\nSlice defense/neutral", "Backhand Slice (BS)"),
+    ("Inside-Out (IO)\nRun around BH", "Inside-Out (IO)")
+]
+
+HOW_OPTIONS = [
+    # Errors first (yellow background)
+    ("Forced Error (FE)", "Forced Error (FE)", "#DAA520"),
+    ("Unforced Error (UE)", "Unforced Error (UE)", "#DAA520"),
+    ("Double Fault (DF)", "Double Fault (DF)", "#DAA520"),
+    # Winners (alphabetical, default blue)
+    "Ace (A)",
+    "Backhand Winner (BW)",
+    "Cross Court Winner (CC)",
+    "Down the Line Winner (DTL)",
+    "Drop Shot Winner (DW)",
+    "Forehand Winner (FW)",
+    "Lob Winner (LW)",
+    "Overhead Winner (OW)",
+    "Passing Shot Winner (PW)",
+    "Service Winner (SW)",
+    "Unknown (UNK)",
+    "Volley Winner (VW)"
+]
+
+UNKNOWN_OPTION = "Unknown (UNK)"
+
+# Match setup popup
+SURFACE_OPTIONS = ["Hard", "Clay", "Grass", "Carpet", "Indoor"]
+
+# Match format -> GameState settings it implies
+MATCH_FORMATS = {
+    "Best of 3 (no-ad)": {"sets_to_win": 2, "no_ad_mode": True},
+    "Best of 3": {"sets_to_win": 2, "no_ad_mode": False},
+    "Best of 5": {"sets_to_win": 3, "no_ad_mode": False},
+    "One set (no-ad)": {"sets_to_win": 1, "no_ad_mode": True},
+    "One set": {"sets_to_win": 1, "no_ad_mode": False},
+}
+
+
+def option_value(option):
+    """Return the value logged for a popup option (plain string or tuple)"""
+    if isinstance(option, tuple):
+        return option[1] if len(option) > 1 else option[0]
+    return option
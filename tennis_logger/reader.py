@@ -0,0 +1,164 @@
+"""
+Lazy, memory-mapped access to a daily log file.
+
+MatchLogReader maps the CSV once, builds an index of row start offsets with
+bytes.find and then decodes rows only when asked for them, so "the last
+point" or "the points of game 7" never require parsing the whole file.
+"""
+import csv
+import mmap
+import os
+
+
+class MatchLogReader:
+    def __init__(self, filename=None, data=None):
+        """
+        filename: path of a daily log CSV (memory-mapped)
+        data: bytes-like buffer holding CSV content (e.g. a decompressed archive)
+        """
+        self.filename = filename
+        self._file = None
+        self._buf = b""
+        self._offsets = []  # start offset of each data row
+        self._ends = []  # end offset (exclusive, before the line break) of each data row
+        self._scanned = 0  # buffer offset up to which rows have been indexed
+        self.header = []
+        if data is not None:
+            self._buf = data
+        elif filename is not None:
+            self._open_map()
+        self._index()
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(data=data)
+
+    def _open_map(self):
+        self._file = open(self.filename, mode='rb')
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _next_line_end(self, start):
+        """Find the newline ending the CSV record starting at start (quote aware)"""
+        buf = self._buf
+        pos = start
+        while True:
+            nl = buf.find(b"\n", pos)
+            if nl == -1:
+                return -1
+            # A quoted field may contain newlines: quotes must balance first
+            if buf[start:nl].count(b'"') % 2 == 0:
+                return nl
+            pos = nl + 1
+
+    def _index(self):
+        """Index complete rows from the last scanned offset onwards"""
+        buf = self._buf
+        pos = self._scanned
+        size = len(buf)
+        while pos < size:
+            nl = self._next_line_end(pos)
+            if nl == -1:
+                break  # partial last line: wait until it is completed
+            end = nl - 1 if nl > pos and buf[nl - 1:nl] == b"\r" else nl
+            if not self.header and pos == 0:
+                self.header = self._decode(0, end)
+            elif end > pos:
+                self._offsets.append(pos)
+                self._ends.append(end)
+            pos = nl + 1
+        self._scanned = pos
+
+    def refresh(self):
+        """Pick up rows appended since the reader was opened"""
+        if self._file is None:
+            return len(self)
+        size = os.fstat(self._file.fileno()).st_size
+        if size != len(self._buf):
+            if size < self._scanned:
+                # File shrank (undo): start over
+                self._offsets, self._ends, self._scanned, self.header = [], [], 0, []
+            if isinstance(self._buf, mmap.mmap):
+                self._buf.close()
+            self._buf = b""
+            if size > 0:
+                self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index()
+        return len(self)
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._buf = b""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _decode(self, start, end):
+        text = bytes(self._buf[start:end]).decode("utf-8")
+        return next(csv.reader([text]), [])
+
+    def row_values(self, index):
+        """Decoded list of field values for a data row (negative indices allowed)"""
+        return self._decode(self._offsets[index], self._ends[index])
+
+    def row_span(self, index):
+        """(start, end) byte offsets of a data row, end including the line break"""
+        index = range(len(self))[index]
+        if index + 1 < len(self):
+            return self._offsets[index], self._offsets[index + 1]
+        return self._offsets[index], self._scanned
+
+    def raw_rows(self, start, stop):
+        """Undecoded bytes of data rows [start, stop), line breaks included"""
+        if start >= stop:
+            return b""
+        first, _ = self.row_span(start)
+        _, end = self.row_span(stop - 1)
+        return bytes(self._buf[first:end])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return dict(zip(self.header, self.row_values(index)))
+
+    def __iter__(self):
+        return self.iter_rows()
+
+    def iter_rows(self, start=0, stop=None):
+        for i in range(*slice(start, stop).indices(len(self))):
+            yield self[i]
+
+    def tail(self, n):
+        """The last n rows, oldest first"""
+        return self[-n:] if n > 0 else []
+
+    def column(self, name, start=0, stop=None):
+        """Lazily yield the values of a single column"""
+        col = self.header.index(name)
+        for i in range(*slice(start, stop).indices(len(self))):
+            values = self.row_values(i)
+            yield values[col] if col < len(values) else ""
+
+    def points_of_game(self, game_no, set_no=None):
+        """Rows logged for a given game (optionally restricted to a set)"""
+        game_col = self.header.index("game_no")
+        set_col = self.header.index("set_no")
+        rows = []
+        for i in range(len(self)):
+            values = self.row_values(i)
+            if values[game_col] != str(game_no):
+                continue
+            if set_no is not None and values[set_col] != str(set_no):
+                continue
+            rows.append(dict(zip(self.header, values)))
+        return rows
@@ -0,0 +1,74 @@
+"""
+Coalesced UI refresh.
+
+Handlers only mark parts of the display dirty; a single after_idle pass then
+re-renders each dirty part once, however many handlers ran in between (an
+auto-logged Ace, a burst of undo/redo clicks...). Labels are only
+reconfigured when their text actually changes. Frame times are recorded so
+slow renders can be spotted.
+"""
+import time
+
+
+class RenderScheduler:
+    def __init__(self, widget):
+        """widget: any Tk widget (provides after_idle)"""
+        self.widget = widget
+        self._renderers = {}  # name -> callable, in registration order
+        self._dirty = set()
+        self._pending = False
+        self._texts = {}  # id(label) -> last text set
+        self.frames = 0
+        self.requests = 0
+        self.coalesced = 0  # requests absorbed by an already scheduled frame
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def register(self, name, render):
+        self._renderers[name] = render
+
+    def mark_dirty(self, *names):
+        """Flag parts of the display for the next frame (all parts if none given)"""
+        self._dirty.update(names or self._renderers)
+        self.requests += 1
+        if self._pending:
+            self.coalesced += 1
+            return
+        self._pending = True
+        self.widget.after_idle(self.flush)
+
+    def flush(self):
+        """Render every dirty part once"""
+        self._pending = False
+        if not self._dirty:
+            return
+        start = time.perf_counter()
+        dirty, self._dirty = self._dirty, set()
+        for name, render in self._renderers.items():
+            if name in dirty:
+                render()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.frames += 1
+        self.last_ms = elapsed
+        self.max_ms = max(self.max_ms, elapsed)
+        self.total_ms += elapsed
+
+    def set_text(self, label, text):
+        """Configure a label only if its text changed"""
+        key = id(label)
+        if self._texts.get(key) == text:
+            return False
+        self._texts[key] = text
+        label.configure(text=text)
+        return True
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "last_ms": round(self.last_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "avg_ms": round(self.total_ms / self.frames, 3) if self.frames else 0.0,
+        }
@@ -0,0 +1,226 @@
+"""
+Chart and report pipeline for the analytics notebook.
+
+Each chart is a task keyed by a sha256 of its input aggregate (labels, values
+and styling). A manifest next to the figures (.report_cache.json) remembers
+the key each PNG was drawn from, so unchanged charts are skipped and only the
+changed ones are rendered - in a process pool, on matplotlib's Agg backend.
+The Markdown (and optional HTML) report is assembled from the chart parts and
+the text sections with plain string joins.
+
+Usage (from the notebook, after the aggregates are computed):
+    report = Report(REPORT_DIR, FIG_DIR)
+    report.chart("win_rate_by_server", "Win Rate by Server", by_server["server"], by_server["win_rate_%"])
+    report.section("By Server", by_server["server"], by_server["win_rate_%"], "- Server `{}`: {}% win rate")
+    report.build("match_kpis", html=True)
+"""
+import hashlib
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+MANIFEST = ".report_cache.json"
+
+
+def _as_list(values):
+    """Plain list from a list, tuple or pandas Series/Index"""
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+    return [v if isinstance(v, (int, float, str)) or v is None else str(v) for v in values]
+
+
+def chart_key(spec):
+    payload = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_chart(spec, path):
+    """Draw one bar chart spec to path (runs in a worker process)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=tuple(spec["figsize"]))
+    labels = [str(label) for label in spec["labels"]]
+    ax.bar(labels, spec["values"], color=spec["color"], label=spec.get("label"))
+    if spec.get("stacked"):
+        stacked = spec["stacked"]
+        ax.bar(labels, stacked["values"], bottom=spec["values"], color=stacked["color"], label=stacked["label"])
+        ax.legend()
+    ax.set_title(spec["title"])
+    if spec.get("xlabel"):
+        ax.set_xlabel(spec["xlabel"])
+    ax.set_ylabel(spec["ylabel"])
+    if spec.get("ylim"):
+        ax.set_ylim(*spec["ylim"])
+    if spec.get("rotate"):
+        plt.setp(ax.get_xticklabels(), rotation=30, ha="right")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+class Report:
+    def __init__(self, report_dir, fig_dir=None, renderer=render_chart):
+        self.report_dir = report_dir
+        self.fig_dir = fig_dir or os.path.join(report_dir, "figures")
+        self.renderer = renderer
+        self.charts = []  # (name, spec)
+        self.parts = []  # ("text", str) / ("chart", name)
+        self.stats = {}
+
+    def chart(self, name, title, labels, values, color="steelblue", ylabel="Win rate (%)",
+              ylim=(0, 100), xlabel=None, rotate=False, figsize=(7, 4), stacked=None, label=None):
+        """
+        Add a bar chart. stacked: optional (values, color, label) drawn on top of values
+        (ylim is then usually None).
+        """
+        spec = {
+            "title": title, "labels": _as_list(labels), "values": _as_list(values),
+            "color": color if isinstance(color, str) else list(color),
+            "ylabel": ylabel, "ylim": list(ylim) if ylim else None, "xlabel": xlabel,
+            "rotate": rotate, "figsize": list(figsize), "label": label,
+        }
+        if stacked:
+            values, color, label = stacked
+            spec["stacked"] = {"values": _as_list(values), "color": color, "label": label}
+        self.charts.append((name, spec))
+        self.parts.append(("chart", name))
+
+    def text(self, *lines):
+        self.parts.append(("text", "\n".join(lines)))
+
+    def section(self, title, labels, values, line_format="- {}: {}%", *more_columns):
+        """A '## title' section with one formatted bullet per (label, value, ...) row"""
+        columns = [_as_list(labels), _as_list(values)] + [_as_list(c) for c in more_columns]
+        bullets = [line_format.format(*row) for row in zip(*columns)]
+        self.text(f"\n## {title}\n", *bullets)
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.fig_dir, MANIFEST), mode='r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        path = os.path.join(self.fig_dir, MANIFEST)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def pending(self):
+        """(manifest, [(name, key, spec, path)] of charts whose input changed, [skipped names])"""
+        os.makedirs(self.fig_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        todo = []
+        skipped = []
+        for name, spec in self.charts:
+            key = chart_key(spec)
+            path = os.path.join(self.fig_dir, f"{name}.png")
+            if manifest.get(name) == key and os.path.isfile(path):
+                skipped.append(name)
+            else:
+                todo.append((name, key, spec, path))
+        return manifest, todo, skipped
+
+    def render(self, executor=None, workers=None):
+        """Render the charts whose input changed; returns {"rendered": [...], "skipped": [...]}"""
+        manifest, todo, skipped = self.pending()
+        if len(todo) > 1 and (executor or workers != 1):
+            pool = executor or ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = [(name, key, pool.submit(self.renderer, spec, path)) for name, key, spec, path in todo]
+                for name, key, future in futures:
+                    future.result()
+                    manifest[name] = key
+            finally:
+                if executor is None:
+                    pool.shutdown()
+        else:
+            for name, key, spec, path in todo:
+                self.renderer(spec, path)
+                manifest[name] = key
+        if todo:
+            self._save_manifest(manifest)
+        return {"rendered": [name for name, _, _, _ in todo], "skipped": skipped}
+
+    def markdown(self):
+        rel_dir = os.path.relpath(self.fig_dir, self.report_dir).replace(os.sep, "/")
+        titles = dict((name, spec["title"]) for name, spec in self.charts)
+        out = []
+        for kind, value in self.parts:
+            if kind == "chart":
+                out.append(f"![{titles[value]}]({rel_dir}/{value}.png)")
+            else:
+                out.append(value)
+        return "\n".join(out) + "\n"
+
+    @staticmethod
+    def markdown_to_html(md):
+        """HTML for the Markdown subset reports use (headings, bullets, images, text)"""
+        body = []
+        in_list = False
+        for line in md.splitlines():
+            if line.startswith("- ") and not in_list:
+                body.append("<ul>")
+                in_list = True
+            elif not line.startswith("- ") and in_list:
+                body.append("</ul>")
+                in_list = False
+            if line.startswith("#"):
+                level = min(len(line) - len(line.lstrip("#")), 6)
+                body.append(f"<h{level}>{html.escape(line[level:].strip())}</h{level}>")
+            elif line.startswith("- "):
+                body.append(f"<li>{html.escape(line[2:])}</li>")
+            elif line.startswith("![") and line.endswith(")"):
+                alt, _, src = line[2:-1].partition("](")
+                body.append(f'<img src="{html.escape(src)}" alt="{html.escape(alt)}">')
+            elif line.strip():
+                body.append(f"<p>{html.escape(line)}</p>")
+        if in_list:
+            body.append("</ul>")
+        return "<!DOCTYPE html>\n<html><body>\n" + "\n".join(body) + "\n</body></html>\n"
+
+    def write(self, name="match_kpis", html=False):
+        """Write <name>.md (and .html) from the parts; returns the Markdown path"""
+        os.makedirs(self.report_dir, exist_ok=True)
+        md = self.markdown()
+        md_path = os.path.join(self.report_dir, f"{name}.md")
+        with open(md_path, mode='w', encoding='utf-8') as f:
+            f.write(md)
+        if html:
+            with open(os.path.join(self.report_dir, f"{name}.html"), mode='w', encoding='utf-8') as f:
+                f.write(self.markdown_to_html(md))
+        return md_path
+
+    def build(self, name="match_kpis", html=False, executor=None, workers=None):
+        """Render changed charts, then write the report; returns the Markdown path"""
+        started = time.perf_counter()
+        self.stats = self.render(executor=executor, workers=workers)
+        md_path = self.write(name, html)
+        self.stats["seconds"] = round(time.perf_counter() - started, 3)
+        return md_path
+
+
+def build_reports(reports, name="match_kpis", html=False, workers=None):
+    """Build many reports (players / days): every changed chart goes to one shared process pool"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Submit all charts first so the pool stays busy across reports
+        submitted = []
+        for report in reports:
+            manifest, todo, skipped = report.pending()
+            futures = [(name, key, pool.submit(report.renderer, spec, path)) for name, key, spec, path in todo]
+            submitted.append((report, manifest, futures, skipped))
+        for report, manifest, futures, skipped in submitted:
+            for chart_name, key, future in futures:
+                future.result()
+                manifest[chart_name] = key
+            if futures:
+                report._save_manifest(manifest)
+            report.stats = {"rendered": [n for n, _, _ in futures], "skipped": skipped}
+    return [report.write(name, html) for report in reports]
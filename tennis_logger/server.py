@@ -0,0 +1,313 @@
+"""
+asyncio ingestion server: log points from phones and tablets while the GUI runs.
+
+Clients send JSON lines over TCP, one batch per line:
+
+    {"client_id": "coach-phone", "seq": 17, "points": [{"winner": "me", "server": "m", "serve_number": "1",
+                                                        "serve_code": "In (I)", "pattern": "Rally (R)"}, ...]}
+
+and get one JSON line back per batch, in order:
+
+    {"seq": 17, "point_ids": ["20250501101502123456", ...]}
+
+Batches go through one bounded queue to a single writer task, which applies
+them in arrival order to the shared GameState (score before the point,
+situation flags, winner) and writes each batch with one MatchLogger write;
+a batch whose write fails leaves the score as it was.
+When the queue is full the connections stop being read, so TCP flow control
+pushes back on the clients. Retries are idempotent: a batch whose seq was
+already applied for that client_id is answered from the recent-acks cache
+instead of being logged twice. Only applied seqs count: a batch that failed
+(error reply) or arrived ahead of an earlier one is applied when it comes.
+A seq must be a positive integer (or left out, for no retry protection);
+any other seq gets an error reply and its points are not logged.
+
+Usage:
+    python -m tennis_logger.server --host 0.0.0.0 --port 8765
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+from collections import OrderedDict
+
+from .game_state import GameState
+from .logger import MatchLogger
+from .momentum import game_winner, score_counts
+
+DEFAULT_PORT = 8765
+QUEUE_SIZE = 1024  # batches waiting for the writer
+ACKS_KEPT = 256  # recent replies kept per client for retries
+MAX_LINE = 1024 * 1024
+_OUTCOMES = {"me": "W", "opponent": "L"}
+_WINNERS = {"W": "me", "L": "opponent"}
+
+
+def point_row(game_state, point):
+    """
+    Apply one ingested point to game_state; returns (row, game winner or None).
+    point: log columns plus "winner" ('me' / 'opponent' / 'unknown'), or a final_outcome W/L/U
+    """
+    point = dict(point)
+    winner = point.pop("winner", None)
+    if winner is None:
+        winner = _WINNERS.get(point.get("final_outcome"))
+    elif winner not in _OUTCOMES:
+        winner = None
+    server = point.get("server", "m")
+    gs = game_state
+    row = dict(point,
+               set_no=gs.current_set,
+               game_no=gs.games_me + gs.games_opponent + 1,
+               score_before_point=gs.get_display_score(),
+               pressure_flags=gs.situation_flags('me' if server == "m" else 'opponent'),
+               final_outcome=_OUTCOMES.get(winner, "U"))
+    row.setdefault("tactic_code", row.get("pattern", ""))
+    counts_before = score_counts(gs)
+    if winner:
+        gs.add_point(winner)
+    return row, game_winner(counts_before, gs)
+
+
+def score_points(game_state, points, write):
+    """
+    point_row() each point, then write(rows); returns [(row, game winner or None)].
+    If scoring or the write fails the score is rolled back, so it never runs ahead of the log.
+    """
+    snapshot = game_state.to_dict()
+    results = []
+    try:
+        for point in points:
+            results.append(point_row(game_state, point))
+        write([row for row, _ in results])
+    except BaseException:
+        for row, _ in reversed(results):
+            if row["final_outcome"] != "U":
+                game_state.undo()  # Drops the undo snapshot the point pushed
+        game_state.restore(snapshot)
+        raise
+    return results
+
+
+def apply_points(logger, game_state, points):
+    """Default batch applier: score the points and log them with one write; returns the rows"""
+    return [row for row, _ in score_points(game_state, points, logger.log_points)]
+
+
+class AppliedSeqs:
+    """
+    The seqs applied for one client: every seq up to a high-water mark plus the
+    ones above it that arrived out of order. Seqs are positive integers; a seq
+    whose batch failed is never added, so its retry is applied.
+    """
+    def __init__(self):
+        self.through = 0  # 1..through were all applied
+        self.above = set()
+
+    def __contains__(self, seq):
+        return seq <= self.through or seq in self.above
+
+    def add(self, seq):
+        self.above.add(seq)
+        while self.through + 1 in self.above:
+            self.through += 1
+            self.above.remove(self.through)
+
+
+class IngestServer:
+    def __init__(self, apply_batch, host="127.0.0.1", port=DEFAULT_PORT, queue_size=QUEUE_SIZE):
+        """
+        apply_batch: called by the writer task with a list of point dicts, returns the logged
+                     rows (see apply_points) or an awaitable / concurrent future of them
+        """
+        self.apply_batch = apply_batch
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.stats = {"batches": 0, "points": 0, "duplicates": 0, "errors": 0, "connections": 0}
+        self._acks = {}  # client_id -> OrderedDict(seq -> reply)
+        self._applied = {}  # client_id -> AppliedSeqs
+        self._queue = None
+        self._server = None
+        self._writer_task = None
+        self._handlers = set()  # one task per open connection
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_LINE)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """Stop accepting, drop the open connections, then let the writer finish the queued batches"""
+        if self._server:
+            self._server.close()
+        handlers = list(self._handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server:
+            await self._server.wait_closed()
+        if self._writer_task:
+            await self._queue.join()
+            self._writer_task.cancel()
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _writer(self):
+        """The only task that touches the game state and the log"""
+        while True:
+            message, reply = await self._queue.get()
+            try:
+                reply.set_result(await self._apply(message))
+            except Exception as e:
+                self.stats["errors"] += 1
+                reply.set_result({"seq": message.get("seq"), "error": str(e)})
+            finally:
+                self._queue.task_done()
+
+    async def _apply(self, message):
+        client_id = str(message.get("client_id", ""))
+        seq = message.get("seq")
+        if seq is not None and (type(seq) is not int or seq < 1):
+            self.stats["errors"] += 1
+            return {"seq": seq, "error": f"bad seq {seq!r}: expected a positive integer"}
+        acks = self._acks.setdefault(client_id, OrderedDict())
+        applied = self._applied.setdefault(client_id, AppliedSeqs())
+        if seq is not None and seq in applied:
+            self.stats["duplicates"] += 1
+            if seq in acks:
+                return dict(acks[seq], duplicate=True)
+            return {"seq": seq, "duplicate": True, "point_ids": None}  # Applied long ago, the ids are gone
+        points = message.get("points")
+        if points is None:
+            points = [message["point"]] if "point" in message else []
+        rows = self.apply_batch(points)
+        if isinstance(rows, concurrent.futures.Future):
+            rows = await asyncio.wrap_future(rows)
+        elif asyncio.isfuture(rows) or asyncio.iscoroutine(rows):
+            rows = await rows
+        reply = {"seq": seq, "point_ids": [row["point_id"] for row in rows]}
+        self.stats["batches"] += 1
+        self.stats["points"] += len(rows)
+        if seq is not None:
+            applied.add(seq)
+            acks[seq] = reply
+            while len(acks) > ACKS_KEPT:
+                acks.popitem(last=False)
+        return reply
+
+    async def _handle(self, reader, writer):
+        self.stats["connections"] += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        replies = asyncio.Queue()
+        sender = asyncio.create_task(self._send_replies(replies, writer))
+        cancelled = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_result({"error": f"bad message: {e}"})
+                    await replies.put(future)
+                    continue
+                future = asyncio.get_running_loop().create_future()
+                await replies.put(future)
+                await self._queue.put((message, future))  # Waits while the writer is behind
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            cancelled = True  # stop(): the pending replies may never come
+            raise
+        finally:
+            if cancelled:
+                sender.cancel()
+            else:
+                await replies.put(None)
+            await asyncio.gather(sender, return_exceptions=True)
+            writer.close()
+            self._handlers.discard(task)
+
+    @staticmethod
+    async def _send_replies(replies, writer):
+        """Write the replies of one connection in request order"""
+        while True:
+            future = await replies.get()
+            if future is None:
+                break
+            reply = await future
+            try:
+                writer.write((json.dumps(reply, separators=(",", ":")) + "\n").encode("utf-8"))
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+
+class IngestClient:
+    """Minimal client (and test stand-in for the phone / tablet apps)"""
+    def __init__(self, client_id, host="127.0.0.1", port=DEFAULT_PORT):
+        self.client_id = client_id
+        self.host = host
+        self.port = port
+        self.seq = 0
+        self._reader = None
+        self._writer = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE)
+        return self
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def send(self, points, seq=None):
+        """Send one batch without waiting for the reply; returns its seq"""
+        if seq is None:
+            self.seq += 1
+            seq = self.seq
+        message = {"client_id": self.client_id, "seq": seq, "points": points}
+        self._writer.write((json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8"))
+        await self._writer.drain()
+        return seq
+
+    async def receive(self):
+        return json.loads(await self._reader.readline())
+
+    async def log(self, points, seq=None):
+        """Send a batch and wait for its point_ids"""
+        await self.send(points, seq)
+        return await self.receive()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accept points from other devices over TCP (JSON lines)")
+    parser.add_argument("--host", default="127.0.0.1", help="0.0.0.0 to accept from the LAN")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--base", default="tennis_log")
+    args = parser.parse_args(argv)
+
+    logger = MatchLogger(args.base)
+    game_state = GameState()
+    server = IngestServer(lambda points: apply_points(logger, game_state, points), args.host, args.port)
+    print(f"Logging points from {args.host}:{args.port} to {logger.filename}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Several matches (courts) tracked at once in one process.
+
+A MatchSession owns everything one match needs - its GameState, undo
+history and MatchLogger - and writes to its own partition,
+<base_filename>_<session id>_YYYYMMDD.csv, so every court's log, catalog,
+index and summary stays separate. The SessionRegistry hands out sessions by
+id and shares one writer thread pool between them: points submitted for a
+session queue up on that session and are applied in order, in batches, by
+whichever pool thread picks the session up. A round that fails to log is
+rolled back and retried batch by batch, so one bad batch only fails its own
+producer. Sessions never wait on each other's locks, so the cost of a point
+does not grow with the number of courts. The lookup caches (export's tag caches) are module-level and shared.
+
+    registry = SessionRegistry(writers=4)
+    registry.log_point("court1", {"winner": "me", "server": "m", ...}).result()
+"""
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .game_state import GameState
+from .history import DEFAULT_DEPTH
+from .logger import MatchLogger
+from .server import score_points
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def session_base(base_filename, session_id):
+    """Base filename of a session's partition"""
+    if not _SESSION_ID.match(session_id):
+        raise ValueError(f"Invalid session id {session_id!r} (letters, digits, - and _ only)")
+    return f"{base_filename}_{session_id}"
+
+
+class MatchSession:
+    def __init__(self, session_id, directory=".", base_filename="tennis_log",
+                 history_depth=DEFAULT_DEPTH, persist_history=False):
+        self.session_id = session_id
+        base = os.path.join(directory, session_base(base_filename, session_id))
+        self.logger = MatchLogger(base, history_depth, persist_history)
+        self.game_state = GameState(history_depth,
+                                    f"{base}_score_history.jsonl" if persist_history else None)
+        self.game_state.reset_match()  # The score is not resumed, so neither is its undo history
+        self.lock = threading.RLock()  # Held while the session's state or log changes
+        self.points = 0
+        self._pending = deque()  # (points, future) waiting for a writer
+        self._queue_lock = threading.Lock()  # Guards _pending / _scheduled (never held while writing)
+        self._scheduled = False
+
+    def apply(self, points):
+        """Score and log a batch now, on the calling thread; returns the rows (the score is unchanged if it fails)"""
+        with self.lock:
+            rows = [row for row, _ in score_points(self.game_state, points, self.logger.log_points)]
+            self.points += len(rows)
+            return rows
+
+    def undo(self):
+        """Undo the last point (score and log); returns the removed row"""
+        with self.lock:
+            self.game_state.undo()
+            return self.logger.undo_last_log()
+
+
+class SessionRegistry:
+    def __init__(self, directory=".", base_filename="tennis_log", writers=4,
+                 history_depth=DEFAULT_DEPTH, persist_history=False):
+        self.directory = directory
+        self.base_filename = base_filename
+        self.history_depth = history_depth
+        self.persist_history = persist_history
+        self._sessions = {}
+        self._lock = threading.Lock()  # Guards the registry only, never held while writing
+        self._pool = ThreadPoolExecutor(max_workers=writers, thread_name_prefix="session-writer")
+
+    def open(self, session_id):
+        """The session with this id, created on first use"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = MatchSession(session_id, self.directory, self.base_filename,
+                                       self.history_depth, self.persist_history)
+                self._sessions[session_id] = session
+            return session
+
+    def get(self, session_id):
+        return self._sessions.get(session_id)
+
+    def sessions(self):
+        with self._lock:
+            return dict(self._sessions)
+
+    def close_session(self, session_id):
+        """Forget a session once its queued points are written"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return
+        done = Future()
+        self._submit(session, [], done)
+        done.result()
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def log_points(self, session_id, points):
+        """Queue a batch for a session; returns a Future of the logged rows"""
+        future = Future()
+        self._submit(self.open(session_id), list(points), future)
+        return future
+
+    def log_point(self, session_id, point):
+        """Queue one point; returns a Future of its row"""
+        batch = self.log_points(session_id, [point])
+        future = Future()
+        batch.add_done_callback(lambda f: future.set_exception(f.exception()) if f.exception()
+                                else future.set_result(f.result()[0]))
+        return future
+
+    def _submit(self, session, points, future):
+        with session._queue_lock:
+            session._pending.append((points, future))
+            if session._scheduled:
+                return  # The writer already working on this session picks it up
+            session._scheduled = True
+        self._pool.submit(self._drain, session)
+
+    def _drain(self, session):
+        """Apply everything queued on a session, in order, one log write per round"""
+        while True:
+            with session._queue_lock:
+                if not session._pending:
+                    session._scheduled = False
+                    return
+                batches = list(session._pending)
+                session._pending.clear()
+            points = [p for batch, _ in batches for p in batch]
+            try:
+                rows = session.apply(points) if points else []
+            except Exception:
+                # Nothing was kept: apply the batches one by one so only the bad one fails
+                for points, future in batches:
+                    self._resolve(session, points, future)
+                continue
+            start = 0
+            for points, future in batches:
+                future.set_result(rows[start:start + len(points)])
+                start += len(points)
+
+    @staticmethod
+    def _resolve(session, points, future):
+        try:
+            future.set_result(session.apply(points) if points else [])
+        except Exception as e:
+            future.set_exception(e)
+
+    def shutdown(self):
+        """Finish the queued points and stop the writer pool"""
+        for session_id in list(self._sessions):
+            self.close_session(session_id)
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,159 @@
+"""
+Materialized per-day and per-match summaries.
+
+The summary store (<base_filename>_summaries.json) holds one small record per
+day and per match: points, wins, serve and return splits and pattern counts.
+It is refreshed when the GUI closes, or with `python -m tennis_logger.summary`,
+and only re-reads days whose log changed. Season views then load a few
+thousand summary rows instead of every raw point:
+
+    pd.DataFrame(SummaryStore().rows("day"))
+"""
+import argparse
+import os
+import re
+
+from .archive import list_log_days
+from .catalog import is_new_match
+from .daystore import DayStore
+from .export import clean_value
+
+SUMMARY_VERSION = 2
+COUNTERS = (
+    "points", "won", "lost",
+    "serve_points", "serve_won", "return_points", "return_won",
+    "first_serve_points", "first_serve_won", "second_serve_points", "second_serve_won",
+)
+_TAG_CODE = re.compile(r"\(([^()]+)\)\s*$")
+
+
+def new_summary():
+    summary = {name: 0 for name in COUNTERS}
+    summary["patterns"] = {}  # tag -> [points, won]
+    return summary
+
+
+def add_point(summary, row):
+    """Accumulate one logged row into a summary"""
+    outcome = row.get("final_outcome", "")
+    won = outcome == "W"
+    decided = outcome in ("W", "L")
+    summary["points"] += 1
+    summary["won"] += won
+    summary["lost"] += outcome == "L"
+    if decided:
+        side = "serve" if row.get("server") in ("m", "n") else "return"
+        summary[f"{side}_points"] += 1
+        summary[f"{side}_won"] += won
+        if side == "serve":
+            nth = "first" if str(row.get("serve_number")) == "1" else "second"
+            summary[f"{nth}_serve_points"] += 1
+            summary[f"{nth}_serve_won"] += won
+    for tag in row.get("pattern", "").split("|"):
+        tag = clean_value(tag)
+        if tag:
+            counts = summary["patterns"].setdefault(tag, [0, 0])
+            counts[0] += 1
+            counts[1] += won
+
+
+def merge_summaries(total, other):
+    """Add other's counters into total (summaries are mergeable)"""
+    for name in COUNTERS:
+        total[name] += other[name]
+    for tag, (points, won) in other["patterns"].items():
+        counts = total["patterns"].setdefault(tag, [0, 0])
+        counts[0] += points
+        counts[1] += won
+    return total
+
+
+def summarize_day(reader):
+    """(day summary, [match summaries]) for one day's rows"""
+    matches = []
+    prev = None
+    for row in reader:
+        if is_new_match(prev, row):
+            matches.append(dict(new_summary(), first_timestamp=row.get("timestamp", "")))
+        match = matches[-1]
+        add_point(match, row)
+        match["last_timestamp"] = row.get("timestamp", "")
+        prev = row
+    day = new_summary()
+    for match in matches:
+        merge_summaries(day, match)
+    return day, matches
+
+
+def _flat(summary, **keys):
+    """A summary as a flat row (pattern counts become pattern_<code> columns)"""
+    row = dict(keys)
+    for name, value in summary.items():
+        if name != "patterns":
+            row[name] = value
+    row["win_rate"] = round(100.0 * summary["won"] / (summary["won"] + summary["lost"]), 1) \
+        if summary["won"] + summary["lost"] else None
+    for tag, (points, won) in sorted(summary["patterns"].items()):
+        match = _TAG_CODE.search(tag)
+        code = match.group(1) if match else tag
+        row[f"pattern_{code}"] = points
+        row[f"pattern_{code}_won"] = won
+    return row
+
+
+class SummaryStore:
+    def __init__(self, directory=".", base_filename="tennis_log", path=None):
+        self.directory = directory
+        self.base_filename = base_filename
+        self.path = path or os.path.join(directory, f"{os.path.basename(base_filename)}_summaries.json")
+        self._store = DayStore(self.path, SUMMARY_VERSION)
+        self.days = self._store.entries  # day -> {"size", "mtime", "day", "matches"}
+
+    def save(self):
+        self._store.save()
+
+    @staticmethod
+    def _build(source, entry):
+        with source.open() as reader:
+            day, matches = summarize_day(reader)
+        return {"day": day, "matches": matches}
+
+    def refresh(self):
+        """Re-summarize new or changed days; returns them"""
+        changed, _ = self._store.refresh(list_log_days(self.directory, self.base_filename), self._build)
+        return changed
+
+    def rows(self, level="day"):
+        """Flat summary rows, one per day or one per match ('day' / 'match')"""
+        rows = []
+        for day in sorted(self.days):
+            entry = self.days[day]
+            if level == "day":
+                rows.append(_flat(entry["day"], date=day, matches=len(entry["matches"])))
+            else:
+                for i, match in enumerate(entry["matches"], start=1):
+                    rows.append(_flat(match, date=day, match_no=i))
+        return rows
+
+    def total(self, since=None, until=None):
+        """One merged summary over a range of days ('YYYYMMDD', inclusive)"""
+        total = new_summary()
+        for day, entry in self.days.items():
+            if (since and day < since) or (until and day > until):
+                continue
+            merge_summaries(total, entry["day"])
+        return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the per-day / per-match summary store")
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--base", default="tennis_log")
+    args = parser.parse_args(argv)
+    store = SummaryStore(args.dir, args.base)
+    changed = store.refresh()
+    print(f"Summarized {len(changed)} changed day(s); {len(store.days)} day(s) in {store.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Deterministic synthetic match logs for load and stress testing.
+
+Matches are played out point by point with the real scoring rules
+(GameState) and tagged with the GUI's own option vocabularies, so the rows
+look like hand-tagged ones: serve codes, How? values, pattern tags, rally
+lengths, situation flags and the score before every point. The same seed
+always produces the same logs. Existing logs are never overwritten unless
+asked to (--force), so pointing --dir at the app's own directory cannot
+clobber real matches.
+
+Usage:
+    python -m tennis_logger.synth --dir bench --days 3650 --matches-per-day 1 --seed 7
+    python -m tennis_logger.synth --dir bench --through-logger --matches-per-day 3   # today's log via MatchLogger
+"""
+import argparse
+import csv
+import errno
+import os
+import random
+from datetime import datetime, timedelta
+
+from .game_state import GameState
+from .logger import MatchLogger
+from .options import HOW_OPTIONS, POINT_TYPE_OPTIONS, RALLY_OPTIONS, UNKNOWN_OPTION, option_value
+
+PATTERNS = [option_value(o) for o in POINT_TYPE_OPTIONS if option_value(o) != UNKNOWN_OPTION]
+HOW_VALUES = [option_value(o) for o in HOW_OPTIONS]
+WINNER_SHOTS = [h for h in HOW_VALUES if "Winner" in h and h != "Service Winner (SW)"]
+ERRORS = ["Forced Error (FE)", "Unforced Error (UE)"]
+
+SERVE_IN = 0.62  # first serves in
+DOUBLE_FAULT = 0.09  # second serves missed
+ACE = 0.07  # share of serves in that are aces / service winners
+UNKNOWN_WINNER = 0.02  # points tagged without a winner
+POINT_SECONDS = (25, 60)  # time between points
+
+
+class MatchSimulator:
+    def __init__(self, seed=0, skill=0.5):
+        """
+        seed: the same seed always produces the same rows
+        skill: 0..1, shifts the share of points 'me' wins (0.5 = even match)
+        """
+        self.rng = random.Random(seed)
+        self.skill = skill
+
+    def _serve(self, me_serving):
+        rng = self.rng
+        if rng.random() < SERVE_IN:
+            serve_number = "1"
+        elif rng.random() < DOUBLE_FAULT:
+            return "2", "Double Fault (DF)"
+        else:
+            serve_number = "2"
+        if rng.random() < ACE * (1.5 if serve_number == "1" else 0.5):
+            return serve_number, rng.choice(["Ace (A)", "Winner (W)"])
+        return serve_number, rng.choice(["In (I)", "In (I)", "In (I)", "Wide (WB)"])
+
+    def _rally(self, me_serving, serve_number):
+        """(winner, rally, pattern, how) for a point played out from the baseline"""
+        rng = self.rng
+        p_server = 0.64 if serve_number == "1" else 0.52
+        p_me = p_server if me_serving else 1 - p_server
+        p_me += (self.skill - 0.5) * 0.4
+        winner = 'me' if rng.random() < p_me else 'opponent'
+        rally = rng.choices(RALLY_OPTIONS, weights=(5, 4, 2))[0]
+        tags = rng.sample(PATTERNS, rng.choice((1, 1, 1, 2)))
+        how = rng.choice(WINNER_SHOTS) if rng.random() < 0.35 else rng.choice(ERRORS)
+        return winner, rally, "|".join(tags), how
+
+    def play_point(self, gs, me_serving):
+        """One row (as the GUI would log it) and the point's winner (None if unknown)"""
+        serve_number, serve_code = self._serve(me_serving)
+        server = 'me' if me_serving else 'opponent'
+        receiver = 'opponent' if me_serving else 'me'
+        if serve_code == "Double Fault (DF)":
+            winner, rally, pattern, how = receiver, "Short", UNKNOWN_OPTION, "Double Fault (DF)"
+        elif serve_code in ("Ace (A)", "Winner (W)"):
+            how = "Ace (A)" if serve_code == "Ace (A)" else "Service Winner (SW)"
+            winner, rally, pattern = server, "Short", "First Strike (F)"
+        else:
+            winner, rally, pattern, how = self._rally(me_serving, serve_number)
+        if self.rng.random() < UNKNOWN_WINNER:
+            winner = None
+        outcome = {"me": "W", "opponent": "L", None: "U"}[winner]
+        row = {
+            "set_no": gs.current_set,
+            "game_no": gs.games_me + gs.games_opponent + 1,
+            "score_before_point": gs.get_display_score(),
+            "server": "m" if me_serving else "o",
+            "serve_number": serve_number,
+            "serve_code": serve_code,
+            "return_code": "N/A",
+            "rally_len_shots": rally,
+            "pattern": pattern,
+            "tactic_code": pattern,
+            "final_shot_type": how,
+            "pressure_flags": gs.situation_flags(server),
+            "final_outcome": outcome,
+            "notes": "",
+        }
+        return row, winner
+
+    def match(self, start=None, me_serving_first=None):
+        """Yield the rows of one best-of-three match, timestamped from start"""
+        rng = self.rng
+        clock = start or datetime(2024, 1, 1, 9, 0)
+        gs = GameState(history_depth=1)
+        gs.no_ad_mode = rng.random() < 0.5
+        me_serving = rng.random() < 0.5 if me_serving_first is None else me_serving_first
+        while max(gs.sets_me, gs.sets_opponent) < gs.sets_to_win:
+            games = gs.games_me + gs.games_opponent + gs.sets_me + gs.sets_opponent
+            row, winner = self.play_point(gs, me_serving)
+            clock += timedelta(seconds=rng.randint(*POINT_SECONDS))
+            row["point_id"] = clock.strftime("%Y%m%d%H%M%S%f")
+            row["timestamp"] = clock.strftime("%Y-%m-%d %H:%M:%S")
+            if winner:
+                gs.add_point(winner)
+            yield row
+            if gs.games_me + gs.games_opponent + gs.sets_me + gs.sets_opponent != games:
+                me_serving = not me_serving
+
+    def day(self, day, matches=1):
+        """Rows of one day of play (matches back to back from 09:00)"""
+        start = datetime(day.year, day.month, day.day, 9, 0)
+        for _ in range(matches):
+            last = None
+            for row in self.match(start):
+                last = row
+                yield row
+            start = datetime.strptime(last["timestamp"], "%Y-%m-%d %H:%M:%S") + timedelta(minutes=20)
+
+
+def write_daily_logs(directory, days, matches_per_day=1, seed=0, start=None, base_filename="tennis_log",
+                     overwrite=False):
+    """
+    Bulk-write <base_filename>_YYYYMMDD.csv for `days` consecutive days; returns the paths.
+    Raises FileExistsError before writing anything if one of them exists, unless overwrite.
+    """
+    first = start or datetime(2024, 1, 1)
+    days = [first + timedelta(days=n) for n in range(days)]
+    paths = [os.path.join(directory, f"{base_filename}_{day.strftime('%Y%m%d')}.csv") for day in days]
+    if not overwrite:
+        for path in paths:
+            if os.path.exists(path):
+                raise FileExistsError(errno.EEXIST, "Log already exists", path)
+    os.makedirs(directory, exist_ok=True)
+    sim = MatchSimulator(seed)
+    for day, path in zip(days, paths):
+        with open(path, mode='w' if overwrite else 'x', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(MatchLogger.SCHEMA_COLUMNS)
+            writer.writerows([row.get(col, "") for col in MatchLogger.SCHEMA_COLUMNS]
+                             for row in sim.day(day, matches_per_day))
+    return paths
+
+
+def log_matches(logger, matches=1, seed=0):
+    """Write synthetic matches through MatchLogger.log_point (today's log); returns the row count"""
+    sim = MatchSimulator(seed)
+    count = 0
+    for row in sim.day(datetime.now(), matches):
+        logger.log_point(row)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic match logs")
+    parser.add_argument("--dir", required=True, help="where to write (kept apart from real logs)")
+    parser.add_argument("--base", default="tennis_log")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--matches-per-day", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", help="first day, YYYYMMDD (default 20240101)")
+    parser.add_argument("--through-logger", action="store_true",
+                        help="write today's matches via MatchLogger instead of bulk files")
+    parser.add_argument("--force", action="store_true", help="overwrite existing daily logs")
+    args = parser.parse_args(argv)
+
+    if args.through_logger:
+        logger = MatchLogger(os.path.join(args.dir, args.base))
+        count = log_matches(logger, args.matches_per_day, args.seed)
+        print(f"Logged {count} points to {logger.filename}")
+        return
+    start = datetime.strptime(args.start, "%Y%m%d") if args.start else None
+    try:
+        paths = write_daily_logs(args.dir, args.days, args.matches_per_day, args.seed, start, args.base,
+                                 overwrite=args.force)
+    except FileExistsError as e:
+        parser.error(f"{e.filename} already exists (--force to overwrite)")
+    print(f"Wrote {len(paths)} daily logs to {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Consistency checker: replay the logs and flag score drift.
+
+Every daily log (live or archived) is streamed match by match. The
+final_outcome of each row is replayed through GameState and the engine's
+set, game and score before the point are compared with the row's set_no,
+game_no and score_before_point. The first disagreement of each match is
+reported with its row number - that is where an unlogged score edit, an
+"Unknown" winner or a mis-tagged outcome made the log drift from the engine.
+Days are checked in a process pool, so it can run as a gate before analytics:
+the exit status is 1 when anything drifted.
+
+The scoring format is not logged, so each match is replayed with and without
+no-ad scoring and the closer replay is reported. Logs written before
+score_before_point was recorded ahead of add_point hold the score after the
+point; check those with --legacy-after.
+
+Usage:
+    python -m tennis_logger.verify --dir . --workers 4
+"""
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .archive import list_log_days
+from .catalog import is_new_match
+from .game_state import GameState
+
+CHECKED_FIELDS = ("set_no", "game_no", "score_before_point")
+_WINNERS = {"W": "me", "L": "opponent"}
+
+
+def engine_fields(game_state):
+    """(set_no, game_no, score) as log_point records them"""
+    gs = game_state
+    return (str(gs.current_set), str(gs.games_me + gs.games_opponent + 1), gs.get_display_score())
+
+
+def replay_match(rows, no_ad_mode=True, score_after=False):
+    """
+    Replay [(row number, row)] of one match; returns the first divergence
+    {"row", "field", "expected", "found", "final_outcome"} or None.
+    score_after: the rows hold the score after the point (legacy logs)
+    """
+    gs = GameState(history_depth=1)
+    gs.no_ad_mode = no_ad_mode
+    for row_no, row in rows:
+        winner = _WINNERS.get(row.get("final_outcome", ""))
+        if score_after and winner:
+            gs.add_point(winner)
+        found = tuple((row.get(field) or "").strip() for field in CHECKED_FIELDS)
+        for field, expected, value in zip(CHECKED_FIELDS, engine_fields(gs), found):
+            if value != expected:
+                return {"row": row_no, "field": field, "expected": expected, "found": value,
+                        "final_outcome": row.get("final_outcome", "")}
+        if not score_after and winner:
+            gs.add_point(winner)
+    return None
+
+
+def _best_replay(rows, no_ad_mode, score_after):
+    if no_ad_mode is not None:
+        return no_ad_mode, replay_match(rows, no_ad_mode, score_after)
+    best = None
+    for mode in (True, False):
+        divergence = replay_match(rows, mode, score_after)
+        if divergence is None:
+            return mode, None
+        if best is None or divergence["row"] > best[1]["row"]:
+            best = (mode, divergence)
+    return best
+
+
+def iter_matches(reader):
+    """Yield each match as [(row number, row)]"""
+    match = []
+    prev = None
+    for row_no, row in enumerate(reader):
+        if is_new_match(prev, row) and match:
+            yield match
+            match = []
+        match.append((row_no, row))
+        prev = row
+    if match:
+        yield match
+
+
+def verify_day(source, no_ad_mode=None, score_after=False):
+    """{"day", "rows", "matches": [{"first_row", "rows", "no_ad_mode", "divergence"}]} for one DaySource"""
+    matches = []
+    rows = 0
+    with source.open() as reader:
+        for match in iter_matches(reader):
+            mode, divergence = _best_replay(match, no_ad_mode, score_after)
+            matches.append({"first_row": match[0][0], "rows": len(match),
+                            "no_ad_mode": mode, "divergence": divergence})
+            rows += len(match)
+    return {"day": source.day, "rows": rows, "matches": matches}
+
+
+def verify_logs(directory=".", base_filename="tennis_log", workers=None, no_ad_mode=None, score_after=False):
+    """verify_day() for every day, in a process pool (workers=1 runs in-process)"""
+    sources = list_log_days(directory, base_filename)
+    check = partial(verify_day, no_ad_mode=no_ad_mode, score_after=score_after)
+    if workers == 1 or len(sources) < 2:
+        return [check(source) for source in sources]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check, sources, chunksize=max(1, len(sources) // 64)))
+
+
+def format_divergences(results):
+    lines = []
+    for result in results:
+        for i, match in enumerate(result["matches"], start=1):
+            d = match["divergence"]
+            if d:
+                lines.append(f"{result['day']} match {i} (rows {match['first_row']}-"
+                             f"{match['first_row'] + match['rows'] - 1}): row {d['row']} {d['field']} is "
+                             f"{d['found']!r}, replay expects {d['expected']!r} (outcome {d['final_outcome']!r})")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay match logs and report score drift")
+    parser.add_argument("--dir", default=".")
+    parser.add_argument("--base", default="tennis_log")
+    parser.add_argument("--workers", type=int)
+    scoring = parser.add_mutually_exclusive_group()
+    scoring.add_argument("--no-ad", dest="no_ad_mode", action="store_true", default=None)
+    scoring.add_argument("--advantage", dest="no_ad_mode", action="store_false")
+    parser.add_argument("--legacy-after", action="store_true",
+                        help="rows hold the score after the point (logs from before the fix)")
+    args = parser.parse_args(argv)
+
+    results = verify_logs(args.dir, args.base, args.workers, args.no_ad_mode, args.legacy_after)
+    lines = format_divergences(results)
+    for line in lines:
+        print(line)
+    matches = sum(len(r["matches"]) for r in results)
+    rows = sum(r["rows"] for r in results)
+    print(f"Checked {rows} points in {matches} matches over {len(results)} days: {len(lines)} drifted")
+    return 1 if lines else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Per-day index from logged points to offsets in the match video.
+
+The index keeps the day's points as sorted arrays - video offset (seconds),
+point_id and row number - next to a short label per point, and is stored as
+<base_filename>_YYYYMMDD_video.json. Wall-clock times map to video offsets
+through the recording's start time, refined by optional sync marks
+(wall time = video offset pairs, e.g. read off the scoreboard) which are
+interpolated linearly to absorb camera pauses and clock drift. Seeking to a
+point and listing the points of a clip range are bisect lookups; exporting
+chapters or an ffmpeg cut list for a filtered set of points takes its rows
+from the bitmap index, so the logs are not scanned again.
+
+Usage:
+    python -m tennis_logger.video build 20250501 --video court1.mp4 --start "2025-05-01 09:58:12" \\
+        --sync "2025-05-01 10:30:00=1905.5"
+    python -m tennis_logger.video export 20250501 --format ffmpeg "final_shot_type=Unforced Error (UE)"
+"""
+import argparse
+import json
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from .archive import list_log_days
+
+VIDEO_VERSION = 1
+PRE_ROLL = 20.0  # seconds of video before the logged time (points are logged when they end)
+POST_ROLL = 3.0
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _wall_seconds(value):
+    """Epoch seconds of a 'YYYY-MM-DD HH:MM:SS' string or datetime"""
+    if isinstance(value, str):
+        value = datetime.strptime(value, _TIME_FORMAT)
+    return value.timestamp()
+
+
+def point_time(row):
+    """Wall-clock time of a row: the point_id's microseconds when it has them, else the timestamp"""
+    point_id = row.get("point_id", "")
+    if len(point_id) == 20 and point_id.isdigit():
+        return datetime.strptime(point_id, "%Y%m%d%H%M%S%f").timestamp()
+    return _wall_seconds(row["timestamp"])
+
+
+def point_label(row):
+    parts = [row.get("score_before_point", ""), row.get("final_outcome", "")]
+    how = row.get("final_shot_type", "")
+    if how and how not in ("N/A", "Unknown (UNK)"):
+        parts.append(how)
+    return " ".join(p for p in parts if p)
+
+
+class VideoClock:
+    """Maps wall-clock seconds to video offsets"""
+    def __init__(self, start, sync=()):
+        """
+        start: wall-clock time the video starts ('YYYY-MM-DD HH:MM:SS', datetime or epoch seconds)
+        sync: [(wall time, video offset seconds)] marks
+        """
+        self.start = start if isinstance(start, (int, float)) else _wall_seconds(start)
+        marks = sorted((w if isinstance(w, (int, float)) else _wall_seconds(w), float(o)) for w, o in sync)
+        self._walls = [w for w, _ in marks]
+        self._shifts = [o - w for w, o in marks]  # video offset = wall + shift
+
+    def offset(self, wall):
+        if not self._walls:
+            return wall - self.start
+        i = bisect_right(self._walls, wall)
+        if i == 0:
+            return wall + self._shifts[0]
+        if i == len(self._walls):
+            return wall + self._shifts[-1]
+        w0, w1 = self._walls[i - 1], self._walls[i]
+        s0, s1 = self._shifts[i - 1], self._shifts[i]
+        return wall + s0 + (s1 - s0) * (wall - w0) / (w1 - w0)
+
+    def to_dict(self):
+        return {"start": self.start, "sync": [[w, w + s] for w, s in zip(self._walls, self._shifts)]}
+
+
+class VideoIndex:
+    def __init__(self, day, video_path, clock, offsets, point_ids, rows, labels):
+        self.day = day
+        self.video_path = video_path
+        self.clock = clock
+        self.offsets = offsets  # array('d'), sorted
+        self.rows = rows  # array('l'), row number of each offset
+        self.labels = labels
+        # point_id lookup: sorted ids and their positions in the offset arrays
+        order = sorted(range(len(point_ids)), key=point_ids.__getitem__)
+        self._ids = [point_ids[i] for i in order]
+        self._id_pos = array('l', order)
+        self.point_ids = point_ids
+        self._positions = None  # row number -> position, built on first use
+
+    @classmethod
+    def build(cls, source, start, sync=(), video_path=None):
+        """Index a day's points (DaySource) against a video that started at start"""
+        clock = VideoClock(start, sync)
+        points = []
+        with source.open() as reader:
+            for row_no, row in enumerate(reader):
+                try:
+                    wall = point_time(row)
+                except (KeyError, ValueError):
+                    continue  # No usable time: cannot be placed in the video
+                points.append((clock.offset(wall), row.get("point_id", ""), row_no, point_label(row)))
+        points.sort()
+        return cls(source.day, video_path, clock,
+                   array('d', [p[0] for p in points]), [p[1] for p in points],
+                   array('l', [p[2] for p in points]), [p[3] for p in points])
+
+    @staticmethod
+    def path_for(directory, base_filename, day):
+        return os.path.join(directory, f"{os.path.basename(base_filename)}_{day}_video.json")
+
+    def save(self, path):
+        data = {
+            "version": VIDEO_VERSION, "day": self.day, "video": self.video_path, "clock": self.clock.to_dict(),
+            "offsets": list(self.offsets), "point_ids": self.point_ids, "rows": list(self.rows),
+            "labels": self.labels,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, mode='r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != VIDEO_VERSION:
+            raise ValueError(f"{path}: unsupported video index version")
+        clock = VideoClock(data["clock"]["start"], data["clock"]["sync"])
+        return cls(data["day"], data["video"], clock, array('d', data["offsets"]), data["point_ids"],
+                   array('l', data["rows"]), data["labels"])
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def seek(self, point_id):
+        """Video offset (seconds) at which point_id was logged, or None"""
+        i = bisect_left(self._ids, point_id)
+        if i == len(self._ids) or self._ids[i] != point_id:
+            return None
+        return self.offsets[self._id_pos[i]]
+
+    def offset_of_row(self, row_no):
+        """Video offset of a log row number (None if the row has no usable time)"""
+        pos = self._row_positions().get(row_no)
+        return None if pos is None else self.offsets[pos]
+
+    def _row_positions(self):
+        if self._positions is None:
+            self._positions = {row: pos for pos, row in enumerate(self.rows)}
+        return self._positions
+
+    def points_between(self, start, end):
+        """[(offset, row number)] of the points logged between two video offsets"""
+        lo = bisect_left(self.offsets, start)
+        hi = bisect_right(self.offsets, end)
+        return [(self.offsets[i], self.rows[i]) for i in range(lo, hi)]
+
+    def clips(self, rows=None, pre=PRE_ROLL, post=POST_ROLL):
+        """[(start, end, label)] clips for the given row numbers (all points by default), merged when they overlap"""
+        if rows is None:
+            positions = range(len(self.offsets))
+        else:
+            lookup = self._row_positions()
+            positions = sorted(lookup[r] for r in rows if r in lookup)
+        clips = []
+        for pos in positions:
+            start, end = max(0.0, self.offsets[pos] - pre), self.offsets[pos] + post
+            label = self.labels[pos]
+            if clips and start <= clips[-1][1]:
+                prev_start, _, prev_label = clips[-1]
+                clips[-1] = (prev_start, end, f"{prev_label} / {label}")
+            else:
+                clips.append((start, end, label))
+        return clips
+
+    def chapters(self, rows=None, pre=PRE_ROLL, post=POST_ROLL):
+        """ffmpeg FFMETADATA chapters (also readable by most players)"""
+        lines = [";FFMETADATA1"]
+        for start, end, label in self.clips(rows, pre, post):
+            lines += ["[CHAPTER]", "TIMEBASE=1/1000", f"START={int(start * 1000)}", f"END={int(end * 1000)}",
+                      "title=" + label.replace("=", "\\=").replace(";", "\\;").replace("#", "\\#")]
+        return "\n".join(lines) + "\n"
+
+    def cut_list(self, rows=None, pre=PRE_ROLL, post=POST_ROLL, video_path=None):
+        """ffmpeg concat-demuxer list: ffmpeg -f concat -safe 0 -i cuts.txt -c copy highlights.mp4"""
+        video = (video_path or self.video_path or "video.mp4").replace("'", "'\\''")
+        lines = []
+        for start, end, label in self.clips(rows, pre, post):
+            lines += [f"# {label}", f"file '{video}'", f"inpoint {start:.3f}", f"outpoint {end:.3f}"]
+        return "\n".join(lines) + "\n"
+
+
+def _day_source(directory, base_filename, day):
+    for source in list_log_days(directory, base_filename):
+        if source.day == day:
+            return source
+    raise FileNotFoundError(f"No log for {day} in {directory}")
+
+
+def _parse_sync(specs):
+    marks = []
+    for spec in specs:
+        wall, _, offset = spec.rpartition("=")
+        marks.append((wall, float(offset)))
+    return marks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Map logged points to video offsets")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index a day's points against a video")
+    build.add_argument("day", help="YYYYMMDD")
+    build.add_argument("--start", required=True, help="wall-clock time the video starts, 'YYYY-MM-DD HH:MM:SS'")
+    build.add_argument("--sync", action="append", default=[], help="'YYYY-MM-DD HH:MM:SS=offset_seconds'")
+    build.add_argument("--video")
+    export = sub.add_parser("export", help="chapters / ffmpeg cut list for a filtered set of points")
+    export.add_argument("day", help="YYYYMMDD")
+    export.add_argument("filters", nargs="*", help="column=value[|value...] (see bitmap_index)")
+    export.add_argument("--format", choices=("chapters", "ffmpeg"), default="chapters")
+    export.add_argument("--pre", type=float, default=PRE_ROLL)
+    export.add_argument("--post", type=float, default=POST_ROLL)
+    export.add_argument("--out")
+    for p in (build, export):
+        p.add_argument("--dir", default=".")
+        p.add_argument("--base", default="tennis_log")
+    args = parser.parse_args(argv)
+
+    path = VideoIndex.path_for(args.dir, args.base, args.day)
+    if args.command == "build":
+        index = VideoIndex.build(_day_source(args.dir, args.base, args.day), args.start,
+                                 _parse_sync(args.sync), args.video)
+        index.save(path)
+        print(f"Indexed {len(index)} points of {args.day} to {path}")
+        return
+
+    from .bitmap_index import BitmapIndex, parse_filters
+    index = VideoIndex.load(path)
+    rows = None
+    if args.filters:
+        bitmaps = BitmapIndex(args.dir, args.base)
+        bitmaps.refresh()
+        rows = [row for _, row in bitmaps.rows(days=[args.day], **parse_filters(args.filters))]
+    if args.format == "chapters":
+        text = index.chapters(rows, args.pre, args.post)
+    else:
+        text = index.cut_list(rows, args.pre, args.post)
+    if args.out:
+        with open(args.out, mode='w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text, end="")
+
+
+if __name__ == "__main__":
+    main()
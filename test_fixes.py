@@ -56,6 +56,8 @@ def test_daily_log_files():
         # Clean up
         if os.path.isfile(logger.filename):
             os.remove(logger.filename)
+        if os.path.isfile(logger.filename + ".lock"):
+            os.remove(logger.filename + ".lock")
         return True
     else:
         print(f"✗ File not created: {logger.filename}")
@@ -125,6 +127,8 @@ def test_timestamp_column():
     # Clean up
     if os.path.isfile(logger.filename):
         os.remove(logger.filename)
+    if os.path.isfile(logger.filename + ".lock"):
+        os.remove(logger.filename + ".lock")
     
     return success
 
@@ -193,6 +197,8 @@ def test_undo_preserves_data():
     # Clean up
     if os.path.isfile(logger.filename):
         os.remove(logger.filename)
+    if os.path.isfile(logger.filename + ".lock"):
+        os.remove(logger.filename + ".lock")
     
     return all_match
 
@@ -130,6 +130,8 @@ def test_undo_redo_stack():
     # Clean up
     if os.path.isfile(logger.filename):
         os.remove(logger.filename)
+    if os.path.isfile(logger.filename + ".lock"):
+        os.remove(logger.filename + ".lock")
     
     return True
 
@@ -184,6 +186,8 @@ def test_scenario_described():
     # Clean up
     if os.path.isfile(logger.filename):
         os.remove(logger.filename)
+    if os.path.isfile(logger.filename + ".lock"):
+        os.remove(logger.filename + ".lock")
     
     return True
 
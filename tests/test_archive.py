@@ -0,0 +1,77 @@
+import unittest
+import csv
+import os
+import tempfile
+from datetime import datetime
+from tennis_logger import archive
+from tennis_logger.archive import LogArchive, roll_closed_days, open_log, list_log_days
+from tennis_logger.catalog import LogCatalog
+from tennis_logger.export import iter_log_rows
+from tennis_logger.logger import MatchLogger
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.old_block_rows = archive.BLOCK_ROWS
+        archive.BLOCK_ROWS = 4
+        for day, count in (("20250101", 10), ("20250102", 3), ("20250201", 2)):
+            with open(self._path(day), "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS)
+                writer.writeheader()
+                for i in range(count):
+                    writer.writerow({"point_id": f"{day}{i:04d}", "game_no": 1, "notes": f"{day} #{i}"})
+
+    def tearDown(self):
+        archive.BLOCK_ROWS = self.old_block_rows
+        self.tmpdir.cleanup()
+
+    def _path(self, day):
+        return os.path.join(self.dir, f"tennis_log_{day}.csv")
+
+    def test_roll_and_read_back(self):
+        LogCatalog(self.dir).refresh()
+        with open(self._path("20250102"), "rb") as f:
+            original = f.read()
+
+        rolled = roll_closed_days(self.dir, keep=self._path("20250201"), today=datetime(2025, 2, 1))
+        self.assertEqual(rolled, ["20250101", "20250102"])
+        self.assertFalse(os.path.exists(self._path("20250101")))
+        self.assertTrue(os.path.exists(self._path("20250201")))
+
+        month = LogArchive.for_month(self.dir, "tennis_log", "202501")
+        self.assertEqual(len(month.days["20250101"]["blocks"]), 3)
+        self.assertEqual(month.read_day_bytes("20250102"), original)
+        self.assertEqual([r["notes"] for r in month.read_rows("20250101", 5, 7)],
+                         ["20250101 #5", "20250101 #6"])
+
+        # Archived and live days read the same way
+        with open_log(self._path("20250101")) as reader:
+            self.assertEqual(len(reader), 10)
+            self.assertEqual(reader[-1]["notes"], "20250101 #9")
+        self.assertEqual([s.day for s in list_log_days(self.dir)], ["20250101", "20250102", "20250201"])
+        self.assertEqual(len(list(iter_log_rows(list_log_days(self.dir)))), 15)
+
+        # Catalog keeps archived days without rescanning them
+        catalog = LogCatalog(self.dir)
+        catalog.refresh()
+        self.assertTrue(catalog.files["20250101"]["archived"])
+        self.assertEqual(catalog.files["20250101"]["rows"], 10)
+
+    def test_readding_a_day_compacts_the_archive(self):
+        month = LogArchive.for_month(self.dir, "tennis_log", "202501")
+        month.add_day("20250101", self._path("20250101"))
+        month.add_day("20250102", self._path("20250102"))
+        with open(self._path("20250101"), "a", newline="") as f:
+            csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS).writerow({"point_id": "x", "notes": "late"})
+        month.add_day("20250101", self._path("20250101"))
+
+        month = LogArchive.for_month(self.dir, "tennis_log", "202501")
+        # Only indexed blocks are left: the old copy's were compacted away
+        self.assertEqual(sum(b["length"] for entry in month.days.values() for b in entry["blocks"]),
+                         os.path.getsize(month.data_path))
+        self.assertEqual(month.open_day("20250101")[-1]["notes"], "late")
+        self.assertEqual(len(month.open_day("20250102")), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import os
+import tempfile
+import time
+from tennis_logger.autosave import Autosave, load_snapshot
+from tennis_logger.game_state import GameState
+
+class TestAutosave(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tennis_log_autosave.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_debounced_latest_snapshot_wins(self):
+        autosave = Autosave(self.path, interval_ms=200)
+        started = time.perf_counter()
+        for i in range(1000):
+            autosave.save({"form": {"notes": f"note {i}"}})
+        per_call_us = (time.perf_counter() - started) * 1e6 / 1000
+        self.assertLess(per_call_us, 100)
+        deadline = time.monotonic() + 2
+        while autosave.writes < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        autosave.close()
+        self.assertLessEqual(autosave.writes, 2)
+        self.assertEqual(load_snapshot(self.path)["form"]["notes"], "note 999")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_score_round_trip_and_clear(self):
+        gs = GameState()
+        gs.games_me, gs.points_opponent, gs.is_tiebreak = 6, 5, True
+        autosave = Autosave(self.path)
+        autosave.save({"score": gs.to_dict()})
+        autosave.close()
+        restored = GameState()
+        restored.restore(load_snapshot(self.path)["score"])
+        self.assertEqual(restored.to_dict(), gs.to_dict())
+        self.assertEqual(restored.get_display_score(), "0 - 5")
+        autosave.clear()
+        self.assertIsNone(load_snapshot(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import csv
+import os
+import random
+import tempfile
+from datetime import datetime
+from tennis_logger.bitmap_index import BitmapIndex, parse_filters
+from tennis_logger.game_state import BREAK_POINT, DEUCE
+from tennis_logger.logger import MatchLogger
+
+class TestBitmapIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        rng = random.Random(3)
+        self.rows = {}
+        for day in ("20250101", "20250301"):
+            rows = [{
+                "server": rng.choice("mo"),
+                "serve_number": rng.choice("12"),
+                "serve_code": rng.choice(["In (I) [6]", "Ace (A) [6]"]),
+                "pattern": rng.choice(["Rally (R)", "Approach (A)|Net Play (N)", "Net Play (N)"]),
+                "pressure_flags": rng.choice([0, BREAK_POINT, BREAK_POINT | DEUCE]),
+                "final_outcome": rng.choice("WLU"),
+                "set_no": 1,
+            } for _ in range(120)]
+            self.write(day, rows)
+            self.rows[day] = rows
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, day, rows):
+        with open(os.path.join(self.dir, f"tennis_log_{day}.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def brute_force(self, days, pred):
+        matched = [r for d in days for r in self.rows[d] if pred(r)]
+        won = sum(r["final_outcome"] == "W" for r in matched)
+        lost = sum(r["final_outcome"] == "L" for r in matched)
+        return len(matched), won, lost
+
+    def test_query_matches_brute_force(self):
+        index = BitmapIndex(self.dir)
+        self.assertEqual(index.refresh(), ["20250101", "20250301"])
+        result = index.query(serve_number=2, situation="BREAK_POINT", pattern="Net Play (N)")
+        expected = self.brute_force(self.rows, lambda r: r["serve_number"] == "2"
+                                    and r["pressure_flags"] & BREAK_POINT and "Net Play (N)" in r["pattern"])
+        self.assertEqual((result["points"], result["won"], result["lost"]), expected)
+
+        result = index.last_days(30, today=datetime(2025, 3, 15), serve_code=["Ace (A)", "Wide (WB)"])
+        expected = self.brute_force(["20250301"], lambda r: r["serve_code"].startswith("Ace"))
+        self.assertEqual((result["points"], result["won"], result["lost"]), expected)
+
+        rows = index.rows(days=["20250101"], pattern="Rally (R)")
+        self.assertEqual([i for _, i in rows],
+                         [i for i, r in enumerate(self.rows["20250101"]) if r["pattern"] == "Rally (R)"])
+
+    def test_persisted_and_incremental(self):
+        BitmapIndex(self.dir).refresh()
+        index = BitmapIndex(self.dir)
+        self.assertEqual(index.refresh(), [])
+        self.write("20250302", self.rows["20250101"])
+        self.assertEqual(index.refresh(), ["20250302"])
+        self.assertEqual(index.query()["points"], 360)
+        self.assertIn("Approach (A)", index.values("pattern"))
+
+    def test_parse_filters(self):
+        self.assertEqual(parse_filters(["serve_number=2", "pattern=Approach (A)|Net Play (N)"]),
+                         {"serve_number": ["2"], "pattern": ["Approach (A)", "Net Play (N)"]})
+        with self.assertRaises(ValueError):
+            parse_filters(["serve_number"])
+
+if __name__ == '__main__':
+    unittest.main()
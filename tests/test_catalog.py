@@ -0,0 +1,71 @@
+import unittest
+import csv
+import os
+import tempfile
+from datetime import datetime
+from tennis_logger.catalog import LogCatalog, is_new_match, list_daily_logs, summarize_log
+from tennis_logger.logger import MatchLogger
+
+def write_log(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+class TestLogCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        # Two matches on the first day (score resets to set 1 game 1)
+        write_log(os.path.join(self.dir, "tennis_log_20250101.csv"), [
+            {"set_no": 1, "game_no": 1, "server": "m", "final_outcome": "W", "timestamp": "2025-01-01 10:00:00"},
+            {"set_no": 1, "game_no": 2, "server": "o", "final_outcome": "L", "timestamp": "2025-01-01 10:01:00"},
+            {"set_no": 1, "game_no": 1, "server": "m", "final_outcome": "L", "timestamp": "2025-01-01 11:00:00"},
+        ])
+        write_log(os.path.join(self.dir, "tennis_log_20250301.csv"),
+                  [{"set_no": 1, "game_no": 1, "server": "o", "final_outcome": "W"}] * 5)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_refresh_and_query(self):
+        catalog = LogCatalog(self.dir)
+        self.assertEqual(catalog.refresh(), ["20250101", "20250301"])
+        first = catalog.query(until="2025-01-31")[0]
+        self.assertEqual(first["rows"], 3)
+        self.assertEqual(first["matches"], 2)
+        self.assertEqual((first["won_on_serve"], first["lost_on_serve"], first["lost_on_return"]), (1, 1, 1))
+        self.assertEqual(first["last_timestamp"], "2025-01-01 11:00:00")
+        self.assertEqual([e["date"] for e in catalog.query(min_points=4)], ["20250301"])
+        self.assertEqual(len(catalog.last_days(30, today=datetime(2025, 3, 10))), 1)
+
+    def test_incremental_refresh(self):
+        LogCatalog(self.dir).refresh()
+        catalog = LogCatalog(self.dir)  # reloaded from disk
+        self.assertEqual(catalog.refresh(), [])
+        path = os.path.join(self.dir, "tennis_log_20250301.csv")
+        with open(path, "a", newline="") as f:
+            f.write(",,1,2,,o,,,,,,,,,,,W,,\r\n")
+        self.assertEqual(catalog.refresh(), ["20250301"])
+        self.assertEqual(catalog.files["20250301"]["rows"], 6)
+        os.remove(path)
+        catalog.refresh()
+        self.assertEqual(list(catalog.files), ["20250101"])
+        self.assertEqual(len(list_daily_logs(self.dir)), 1)
+
+    def test_matches_split_on_match_id(self):
+        path = os.path.join(self.dir, "tennis_log_20250401.csv")
+        write_log(path, [  # An abandoned match, then two that the score alone could not tell apart
+            {"set_no": 1, "game_no": 1, "final_outcome": "W", "match_id": "a"},
+            {"set_no": 1, "game_no": 1, "final_outcome": "W", "match_id": "b"},
+            {"set_no": 1, "game_no": 2, "final_outcome": "W", "match_id": "b"},
+            {"set_no": 1, "game_no": 3, "final_outcome": "W", "match_id": "c"},
+        ])
+        self.assertEqual(summarize_log(path)["matches"], 3)
+        self.assertFalse(is_new_match({"set_no": 2, "game_no": 1, "match_id": "a"},
+                                      {"set_no": 1, "game_no": 1, "match_id": "a"}))
+        self.assertTrue(is_new_match({"set_no": 2, "game_no": 1}, {"set_no": 1, "game_no": 1}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime
+from tennis_logger.archive import DaySource
+from tennis_logger.daystore import DayStore, day_key
+
+class TestDayStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.built = []
+        for day in ("20250101", "20250102"):
+            self.write(day, "a\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, day, text):
+        with open(os.path.join(self.dir, f"tennis_log_{day}.csv"), "a") as f:
+            f.write(text)
+
+    def sources(self, days=("20250101", "20250102")):
+        return [DaySource(day, path=os.path.join(self.dir, f"tennis_log_{day}.csv")) for day in days]
+
+    def build(self, source, entry):
+        self.built.append(source.day)
+        return {"previous": entry["size"] if entry else None}
+
+    def test_segmented_store_writes_only_changed_days(self):
+        path = os.path.join(self.dir, "store")
+        store = DayStore(path, 1, segmented=True, compress=True)
+        self.assertEqual(store.refresh(self.sources(), self.build), (["20250101", "20250102"], []))
+        segment = os.path.join(path, "20250101.seg")
+        os.utime(segment, (0, 0))
+
+        self.write("20250102", "b\n")
+        self.assertEqual(store.refresh(self.sources(), self.build), (["20250102"], []))
+        self.assertEqual(os.path.getmtime(segment), 0)  # Untouched
+        self.assertEqual(store.entries["20250102"]["previous"], 2)
+
+        self.assertEqual(store.refresh(self.sources(["20250102"]), self.build), ([], ["20250101"]))
+        self.assertFalse(os.path.exists(segment))
+        reloaded = DayStore(path, 1, segmented=True, compress=True)
+        self.assertEqual(reloaded.entries, store.entries)
+        self.assertEqual(DayStore(path, 2, segmented=True, compress=True).entries, {})
+
+    def test_single_file_store_and_day_filter(self):
+        path = os.path.join(self.dir, "store.json")
+        store = DayStore(path, 1)
+        store.refresh(self.sources(), self.build, days=["20250102"])
+        self.assertEqual(self.built, ["20250102"])
+        store.refresh(self.sources(["20250101"]), self.build, days=["20250101"])
+        self.assertEqual(sorted(DayStore(path, 1).entries), ["20250101", "20250102"])  # Filtered refresh keeps days
+        self.assertEqual(day_key(datetime(2025, 3, 4)), day_key("2025-03-04"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import json
+import os
+import tempfile
+from functools import lru_cache
+from tennis_logger.diagnostics import MIN_HISTORY_DEPTH, MemoryCaps, MemoryMonitor, deep_sizeof
+from tennis_logger.history import BoundedHistory
+
+@lru_cache(maxsize=None)
+def square(n):
+    return n * n
+
+class TestDiagnostics(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_deep_sizeof_counts_contents(self):
+        small = deep_sizeof({"a": [1, 2]})
+        self.assertGreater(deep_sizeof({"a": [1, 2], "b": ["x" * 1000]}), small + 1000)
+        shared = ["y" * 1000]
+        self.assertLess(deep_sizeof([shared, shared]), 2 * deep_sizeof(shared))
+
+    def test_samples_written_and_caps_enforced(self):
+        spilled = BoundedHistory(depth=100, path=os.path.join(self.dir, "redo.jsonl"))
+        evicted = BoundedHistory(depth=100)
+        for i in range(60):
+            spilled.append({"n": i})
+            evicted.append({"n": i})
+        [square(i) for i in range(50)]
+
+        path = os.path.join(self.dir, "memory.jsonl")
+        monitor = MemoryMonitor(path, MemoryCaps(history_entries=20, cache_entries=10), top=3).start()
+        try:
+            monitor.watch_history("redo", spilled)
+            monitor.watch_history("score", evicted)
+            monitor.watch_cache("square", square)
+            monitor.gauge("popups_open", lambda: 0)
+            sample = monitor.sample()
+            monitor.sample()
+        finally:
+            monitor.stop()
+
+        self.assertEqual(sample["histories"]["redo"], {"in_memory": 60, "total": 60})  # before the caps
+        self.assertEqual((spilled.in_memory(), len(spilled)), (20, 60))
+        self.assertEqual((evicted.in_memory(), len(evicted)), (20, 20))
+        self.assertEqual(spilled.pop(), {"n": 59})
+        self.assertEqual(square.cache_info().currsize, 0)
+        self.assertEqual(len(sample["actions"]), 3)
+        self.assertGreater(sample["traced_current"], 0)
+        with open(path) as f:
+            samples = [json.loads(line) for line in f]
+        self.assertEqual(len(samples), 2)
+        self.assertEqual(samples[1]["actions"], [])
+        self.assertIn("redo: 20 of 60 entries in memory", MemoryMonitor.format(samples[1]))
+
+    def test_history_cap_sets_the_depth(self):
+        self.assertFalse(MemoryCaps().any())
+        self.assertEqual(MemoryCaps().history_depth(200), 200)
+        self.assertTrue(MemoryCaps(cache_entries=50).any())
+        self.assertEqual(MemoryCaps(history_entries=100).history_depth(200), 100)
+        self.assertEqual(MemoryCaps(history_entries=3).history_depth(200), MIN_HISTORY_DEPTH)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import io
+import threading
+from contextlib import redirect_stderr
+from tennis_logger.events import EventBus, PointLogged, PointUndone, ScoreEdited
+
+class TestEventBus(unittest.TestCase):
+    def test_inline_subscribers_run_in_order_per_type(self):
+        bus = EventBus()
+        seen = []
+        bus.subscribe(PointLogged, lambda e: seen.append(("write", e.row["n"])))
+        bus.subscribe(PointLogged, lambda e: seen.append(("stats", e.row["n"])))
+        bus.subscribe(PointUndone, lambda e: seen.append(("undo", e.row["n"])))
+        bus.publish(PointLogged({"n": 1}, None))
+        bus.publish(PointUndone({"n": 1}))
+        bus.publish(ScoreEdited("0 - 0", (0, 0, 0, 0)))  # no subscribers
+        self.assertEqual(seen, [("write", 1), ("stats", 1), ("undo", 1)])
+        with self.assertRaises(ZeroDivisionError):
+            bus.subscribe(ScoreEdited, lambda e: 1 / 0)
+            bus.publish(ScoreEdited("0 - 0", (0, 0, 0, 0)))
+
+    def test_threaded_subscriber_backpressure(self):
+        bus = EventBus()
+        release = threading.Event()
+        handled = []
+        def slow(event):
+            release.wait()
+            handled.append(event.row)
+        sub = bus.subscribe(PointLogged, slow, threaded=True, queue_size=2)
+        def failing(event):
+            raise ValueError("boom")
+        bad = bus.subscribe(PointLogged, failing, threaded=True)
+
+        publisher = threading.Thread(target=lambda: [bus.publish(PointLogged(i, None)) for i in range(6)])
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            publisher.start()
+            publisher.join(0.2)
+            self.assertTrue(publisher.is_alive())  # blocked on the full queue
+            release.set()
+            publisher.join()
+            bus.drain()
+        self.assertEqual(stderr.getvalue().count("Traceback"), 6)
+        self.assertIn("ValueError: boom", stderr.getvalue())
+        self.assertEqual(handled, list(range(6)))
+        self.assertEqual(sub.stats()["max_queued"], 2)
+        self.assertGreater(sub.stats()["blocked_ms"], 0)
+        self.assertEqual(bad.stats()["errors"], 6)
+        bus.close()
+        self.assertFalse(sub.thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import json
+import os
+import tempfile
+from tennis_logger.export import normalize_row, iter_normalized, iter_columns, export_logs
+from tennis_logger.logger import MatchLogger
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logger = MatchLogger(base_filename=os.path.join(self.tmpdir.name, "tennis_log"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_normalize_gui_row(self):
+        row = normalize_row({
+            "set_no": "1", "game_no": "3", "server": "m", "serve_number": "2",
+            "serve_code": "Ace (A) [6]", "return_code": "N/A", "rally_len_shots": "Medium",
+            "pattern": "Net Play (N)|Pace (PC)", "tactic_code": "Net Play (N)|Pace (PC)",
+            "final_shot_type": "Unforced Error (UE)", "final_outcome": "L",
+        })
+        self.assertEqual(row["server"], "n")
+        self.assertEqual(row["serve_code"], "A")
+        self.assertEqual(row["return_code"], "")
+        self.assertEqual(row["rally_len_shots"], 5)
+        self.assertEqual(row["pattern"], "NET")
+        self.assertEqual(row["tactic_code"], "PACE")
+        self.assertEqual(row["final_outcome"], "PtLost|UE")
+        self.assertEqual(row["set_no"], 1)
+
+    def test_unknown_winner_and_double_fault(self):
+        self.assertEqual(normalize_row({"final_outcome": "U"})["final_outcome"], "")
+        row = normalize_row({"serve_code": "Double Fault (DF)", "final_outcome": "L"})
+        self.assertEqual(row["final_outcome"], "PtLost|DF")
+        self.assertEqual(normalize_row({"final_outcome": "W"})["final_outcome"], "PtWon")
+
+    def test_streaming_export(self):
+        for i in range(7):
+            self.logger.log_point({"server": "o", "rally_len_shots": "Long", "final_outcome": "W"})
+
+        chunks = list(iter_columns(iter_normalized(self.logger.filename), chunk_size=3))
+        self.assertEqual([len(c["point_id"]) for c in chunks], [3, 3, 1])
+
+        out = os.path.join(self.tmpdir.name, "out.jsonl")
+        self.assertEqual(export_logs([self.logger.filename], out, fmt="jsonl", chunk_size=2), 7)
+        with open(out) as f:
+            first = json.loads(f.readline())
+        self.assertEqual(first["final_outcome"], "PtWon")  # How? not tagged: no cause
+        self.assertEqual(first["rally_len_shots"], 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from tennis_logger.fuzz import ReferenceScorer, compare, engine_state, fuzz
+from tennis_logger.game_state import GameState
+
+def _win_games(gs, winner, games):
+    for _ in range(games * 4):
+        gs.add_point(winner)
+
+class LegacyGameState(GameState):
+    """The engine before the 6-6 tiebreak fix"""
+    def _check_set_end(self, tiebreak_winner=None):
+        if (self.games_me >= 6 or self.games_opponent >= 6) and abs(self.games_me - self.games_opponent) >= 2:
+            if self.games_me > self.games_opponent:
+                self.sets_me += 1
+            else:
+                self.sets_opponent += 1
+            self.games_me = self.games_opponent = 0
+            self.current_set += 1
+
+class TestFuzz(unittest.TestCase):
+    def test_tiebreak_at_six_all(self):
+        gs = GameState()
+        _win_games(gs, 'me', 5)
+        _win_games(gs, 'opponent', 6)
+        _win_games(gs, 'me', 1)
+        self.assertTrue(gs.is_tiebreak)
+        for _ in range(7):
+            gs.add_point('opponent')
+        self.assertEqual((gs.sets_opponent, gs.games_me, gs.games_opponent, gs.current_set), (1, 0, 0, 2))
+        self.assertFalse(gs.is_tiebreak)
+
+    def test_match_tiebreak_decides_the_set(self):
+        gs = GameState()
+        gs.games_me, gs.games_opponent, gs.is_tiebreak, gs.tiebreak_target = 2, 3, True, 10
+        for _ in range(10):
+            gs.add_point('me')
+        self.assertEqual((gs.sets_me, gs.games_me, gs.current_set), (1, 0, 2))
+
+    def test_undo_keeps_no_ad_default(self):
+        gs = GameState()
+        gs.match_history.append({k: v for k, v in gs.to_dict().items() if k != 'no_ad_mode'})
+        gs.no_ad_mode = False
+        gs.undo()
+        self.assertTrue(gs.no_ad_mode)
+
+    def test_engine_matches_reference(self):
+        for result in fuzz(matches=40, seed=3):
+            self.assertEqual(result["mismatches"], 0, result["first_mismatch"])
+            self.assertGreater(result["engine_pps"], 0)
+            self.assertGreater(result["reference_pps"], 0)
+
+    def test_divergence_is_reported(self):
+        events = ['me'] * 20 + ['opponent'] * 24 + ['me'] * 4 + ['opponent'] * 7
+        self.assertIsNone(compare(events, "One set"))
+        divergence = compare(events, "One set", engine=LegacyGameState)
+        self.assertEqual(divergence["event"], 47)
+        self.assertEqual(divergence["expected"][6], True)
+        results = fuzz(matches=60, seed=1, formats=["One set"], engine=LegacyGameState)
+        self.assertGreater(results[0]["mismatches"], 0)
+
+    def test_reference_state_shape(self):
+        self.assertEqual(ReferenceScorer().state(), engine_state(GameState()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import os
+import tempfile
+from tennis_logger.game_state import GameState
+from tennis_logger.history import BoundedHistory
+from tennis_logger.logger import MatchLogger
+
+class TestBoundedHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "history.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_spills_to_disk_with_constant_memory(self):
+        history = BoundedHistory(depth=3, path=self.path)
+        for i in range(10):
+            history.append({"i": i})
+        self.assertEqual(len(history), 10)
+        self.assertEqual(history.in_memory(), 3)
+        self.assertEqual([history.pop()["i"] for _ in range(10)], list(range(9, -1, -1)))
+        self.assertFalse(history)
+        self.assertEqual(os.path.getsize(self.path), 0)
+        with self.assertRaises(IndexError):
+            history.pop()
+
+    def test_survives_restart_and_torn_write(self):
+        history = BoundedHistory(depth=2, path=self.path)
+        for i in range(5):
+            history.append({"i": i})
+        with open(self.path, "ab") as f:
+            f.write(b'{"i":')  # crash mid-write
+        restored = BoundedHistory(depth=2, path=self.path)
+        self.assertEqual(len(restored), 5)
+        self.assertEqual(restored.peek(), {"i": 4})
+        self.assertEqual([restored.pop()["i"] for _ in range(5)], [4, 3, 2, 1, 0])
+
+    def test_memory_only_history_is_bounded(self):
+        history = BoundedHistory(depth=2)
+        for i in range(5):
+            history.append(i)
+        self.assertEqual(len(history), 2)
+        self.assertEqual([history.pop(), history.pop()], [4, 3])
+
+    def test_game_state_undo_after_restart(self):
+        gs = GameState(history_depth=2, history_path=self.path)
+        for winner in ['me', 'me', 'opponent', 'me']:
+            gs.add_point(winner)
+        self.assertEqual(gs.get_display_score(), "40 - 15")
+        restored = GameState(history_depth=2, history_path=self.path)
+        restored.undo()
+        self.assertEqual(restored.get_display_score(), "30 - 15")
+        for _ in range(3):
+            restored.undo()
+        self.assertEqual(restored.get_display_score(), "0 - 0")
+        self.assertFalse(restored.match_history)
+
+    def test_logger_redo_survives_restart(self):
+        base = os.path.join(self.tmpdir.name, "tennis_log")
+        logger = MatchLogger(base_filename=base, persist_history=True)
+        logger.log_point({"notes": "keep me"})
+        logger.undo_last_log()
+        restored = MatchLogger(base_filename=base, persist_history=True)
+        self.assertTrue(restored.can_redo())
+        self.assertEqual(restored.redo_last_log()["notes"], "keep me")
+        self.assertEqual(restored.get_last_point_data()["notes"], "keep me")
+
+if __name__ == '__main__':
+    unittest.main()
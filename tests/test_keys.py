@@ -0,0 +1,75 @@
+import unittest
+from tennis_logger.keys import KeyDispatcher, KeyTrie, TaggingTimer, default_bindings, option_code
+
+class TestKeys(unittest.TestCase):
+    def _type(self, dispatcher, keys):
+        fired = []
+        for key in keys:
+            fired += dispatcher.feed(key)
+        return fired
+
+    def test_codes_come_from_labels(self):
+        self.assertEqual(option_code("Double Fault (DF)"), "df")
+        self.assertEqual(option_code(("Serve + 1 (S1)\nServe then attack", "Serve + 1 (S1)")), "s1")
+        self.assertIsNone(option_code("Short"))
+        bindings = default_bindings()
+        self.assertEqual(bindings["sdf"], ("set", "serve_code", "Double Fault (DF)"))
+        self.assertEqual(bindings["hue"], ("set", "how", "Unforced Error (UE)"))
+        self.assertEqual(bindings["sa"], ("serve_winner", "Ace (A)"))
+        self.assertEqual(bindings["ps1"], ("toggle", "pattern", "Serve + 1 (S1)"))
+
+    def test_full_point(self):
+        dispatcher = KeyDispatcher()
+        fired = self._type(dispatcher, "o2sdf" + "rl" + "hue" + "l")
+        self.assertEqual(fired, [("set", "server", "Opponent"), ("set", "serve_number", "2"),
+                                 ("set", "serve_code", "Double Fault (DF)"), ("set", "rally", "Long"),
+                                 ("set", "how", "Unforced Error (UE)"), ("winner", "Opponent")])
+        self.assertEqual(dispatcher.buffer, "")
+
+    def test_prefix_waits_for_next_key_or_flush(self):
+        dispatcher = KeyDispatcher()
+        self.assertEqual(self._type(dispatcher, "pr"), [])
+        self.assertTrue(dispatcher.waiting)
+        self.assertEqual(dispatcher.feed("1"), [("toggle", "pattern", "Return + 1 (R1)")])
+        self._type(dispatcher, "pr")
+        self.assertEqual(dispatcher.feed("w"), [("toggle", "pattern", "Rally (R)"), ("winner", "Me")])
+        self._type(dispatcher, "pr")
+        self.assertEqual(dispatcher.flush(), [("toggle", "pattern", "Rally (R)")])
+        self.assertEqual(self._type(dispatcher, "qx"), [])
+        self.assertEqual(dispatcher.unknown, 2)
+
+    def test_duplicate_binding_rejected(self):
+        with self.assertRaises(ValueError):
+            KeyTrie({"ab": ("x",)}).insert("ab", ("y",))
+
+    def test_point_ending_sequence_is_never_a_prefix(self):
+        bindings = default_bindings()
+        self.assertEqual(bindings["sww"], ("serve_winner", "Winner (W)"))
+        self.assertEqual(bindings["swb"], ("set", "serve_code", "Wide (WB)"))
+        self.assertNotIn("sw", bindings)
+        dispatcher = KeyDispatcher()
+        self._type(dispatcher, "sw")
+        self.assertEqual(dispatcher.flush(), [])  # A pause mid-sequence logs nothing
+        with self.assertRaises(ValueError):
+            KeyTrie({"sw": ("serve_winner", "Winner (W)"), "swb": ("set", "serve_code", "Wide (WB)")})
+        with self.assertRaises(ValueError):
+            KeyTrie({"swb": ("set", "serve_code", "Wide (WB)"), "sw": ("winner", "Me")})
+        KeyTrie({"pr": ("toggle", "pattern", "Rally (R)"), "pr1": ("toggle", "pattern", "Return + 1 (R1)")})
+
+    def test_tagging_timer(self):
+        now = [0.0]
+        timer = TaggingTimer(clock=lambda: now[0])
+        self.assertIsNone(timer.commit())
+        for seconds in (2.0, 4.0, 3.0):
+            for _ in range(5):
+                timer.keystroke()
+                now[0] += seconds / 5
+            timer.commit()
+            now[0] += 20  # Between points: not counted
+        stats = timer.stats()
+        self.assertEqual(stats["points"], 3)
+        self.assertAlmostEqual(stats["median_s"], 3.0)
+        self.assertEqual(stats["keys_per_point"], 5.0)
+
+if __name__ == '__main__':
+    unittest.main()
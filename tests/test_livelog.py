@@ -0,0 +1,138 @@
+import unittest
+import os
+import tempfile
+import threading
+from tennis_logger.livelog import LiveLog, commit_record, lock_path, read_committed, writing
+from tennis_logger.logger import MatchLogger
+from tennis_logger.reader import MatchLogReader
+
+class TestLiveLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logger = MatchLogger(os.path.join(self.tmpdir.name, "tennis_log"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _point(self, i):
+        return {"server": "m", "final_outcome": "W", "notes": f"point {i}"}
+
+    def test_poll_appends_then_resets_on_undo(self):
+        live = LiveLog(self.logger.filename)
+        reset, rows = live.poll()
+        self.assertTrue(reset)
+        self.assertEqual(rows, [])
+        self.logger.log_points([self._point(1), self._point(2)])
+        reset, rows = live.poll()
+        self.assertFalse(reset)
+        self.assertEqual([r["notes"] for r in rows], ["point 1", "point 2"])
+        self.assertEqual(live.poll(), (False, []))
+        self.logger.undo_last_log()
+        reset, rows = live.poll()
+        self.assertTrue(reset)
+        self.assertEqual([r["notes"] for r in rows], ["point 1"])
+        self.logger.redo_last_log()
+        reset, rows = live.poll()
+        self.assertFalse(reset)
+        self.assertEqual([r["notes"] for r in rows], ["point 2"])
+        self.assertEqual(len(live.snapshot()), 2)
+
+    def test_torn_tail_is_hidden_and_repaired(self):
+        self.logger.log_points([self._point(1)])
+        with open(self.logger.filename, mode='ab') as f:
+            f.write(b"2025,half a ro")  # A writer that died mid-row
+        _, data = read_committed(self.logger.filename)
+        self.assertNotIn(b"half a ro", data)
+        live = LiveLog(self.logger.filename)
+        live.poll()
+        self.logger.log_points([self._point(2)])
+        with open(self.logger.filename, mode='rb') as f:
+            self.assertNotIn(b"half a ro", f.read())
+        reset, rows = live.poll()
+        self.assertTrue(reset)
+        self.assertEqual([r["notes"] for r in rows], ["point 1", "point 2"])
+
+    def _notes(self):
+        with open(self.logger.filename, mode='rb') as f:
+            return [r["notes"] for r in MatchLogReader.from_bytes(f.read())]
+
+    def test_external_edit_is_kept_and_restarts_readers(self):
+        self.logger.log_points([self._point(1)])
+        live = LiveLog(self.logger.filename)
+        live.poll()
+        generation = commit_record(self.logger.filename)[0]
+        with open(self.logger.filename, mode='rb') as f:
+            data = f.read()
+        with open(self.logger.filename, mode='wb') as f:  # A hand-corrected row, one row added
+            f.write(data.replace(b"point 1", b"point one") + data[data.find(b"\n") + 1:])
+        self.assertIsNone(commit_record(self.logger.filename)[0])
+        reset, rows = live.poll()
+        self.assertTrue(reset)
+        self.assertEqual([r["notes"] for r in rows], ["point one", "point 1"])
+        self.logger.log_points([self._point(2)])
+        self.assertEqual(self._notes(), ["point one", "point 1", "point 2"])
+        self.assertEqual(commit_record(self.logger.filename)[0], generation + 1)
+        reset, rows = live.poll()
+        self.assertTrue(reset)
+        self.assertEqual(len(rows), 3)
+
+    def test_edit_without_final_newline_is_terminated(self):
+        self.logger.log_points([self._point(1), self._point(2)])
+        with open(self.logger.filename, mode='rb') as f:
+            data = f.read()
+        with open(self.logger.filename, mode='wb') as f:  # Shorter, last row unterminated
+            f.write(data.replace(b"point 1", b"p1").rstrip(b"\r\n"))
+        self.assertEqual([r["notes"] for r in MatchLogReader.from_bytes(read_committed(self.logger.filename)[1])],
+                         ["p1"])
+        self.logger.log_points([self._point(3)])
+        self.assertEqual(self._notes(), ["p1", "point 2", "point 3"])
+
+    def test_recreated_log_bumps_the_generation(self):
+        self.logger.log_points([self._point(1), self._point(2)])
+        live = LiveLog(self.logger.filename)
+        live.poll()
+        generation = commit_record(self.logger.filename)[0]
+        with open(self.logger.filename, mode='rb') as f:
+            header = f.readline()
+        os.remove(self.logger.filename)  # The lock file stays behind
+        with open(self.logger.filename, mode='wb') as f:
+            f.write(header)
+        self.logger.log_points([self._point(3)])
+        self.assertEqual(commit_record(self.logger.filename)[0], generation + 1)
+        reset, rows = live.poll()
+        self.assertTrue(reset)
+        self.assertEqual([r["notes"] for r in rows], ["point 3"])
+
+    def test_reader_never_sees_partial_rows(self):
+        done = threading.Event()
+
+        def write():
+            for i in range(200):
+                self.logger.log_points([self._point(i)])
+                if i % 7 == 6:
+                    self.logger.undo_last_log()
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        live = LiveLog(self.logger.filename)
+        while not done.is_set():
+            live.refresh()
+            self.assertTrue(live.data.endswith(b"\n"))
+            for row in live.snapshot():
+                self.assertTrue(row["notes"].startswith("point "))
+        writer.join()
+        live.refresh()
+        self.assertEqual(len(live.snapshot()), 200 - 200 // 7)
+
+    def test_lock_file_holds_generation_and_length(self):
+        self.logger.log_points([self._point(1)])
+        generation, data = read_committed(self.logger.filename)
+        self.assertEqual(len(data), os.path.getsize(self.logger.filename))
+        with writing(self.logger.filename, truncating=True):
+            pass
+        self.assertEqual(read_committed(self.logger.filename)[0], generation + 1)
+        self.assertTrue(os.path.isfile(lock_path(self.logger.filename)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import csv
+import os
+import tempfile
+from tennis_logger.logger import MatchLogger
+from tennis_logger.merge import merge_logs
+from tennis_logger.reader import MatchLogReader
+
+DAY = "20250501"
+
+def _row(seconds, set_no, game_no, score, outcome="W", how="Winner (W)", serve=""):
+    minute, second = divmod(seconds, 60)
+    timestamp = f"2025-05-01 10:{minute:02d}:{second:02d}"
+    return {"point_id": f"{DAY}10{minute:02d}{second:02d}{seconds % 7:06d}", "timestamp": timestamp,
+            "set_no": set_no, "game_no": game_no, "score_before_point": score, "server": "m",
+            "serve_code": serve, "final_shot_type": how, "final_outcome": outcome}
+
+class TestMerge(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dirs = [os.path.join(self.tmpdir.name, name) for name in ("laptop1", "laptop2", "merged")]
+        for d in self.dirs[:2]:
+            os.makedirs(d)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, directory, rows, day=DAY):
+        path = os.path.join(directory, f"tennis_log_{day}.csv")
+        with open(path, mode='w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS, restval="")
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def _merged(self, day=DAY):
+        with MatchLogReader(os.path.join(self.dirs[2], f"tennis_log_{day}.csv")) as reader:
+            return reader[:]
+
+    def _report(self):
+        with open(os.path.join(self.dirs[2], "tennis_log_merge_report.csv"), newline='') as f:
+            return list(csv.DictReader(f))
+
+    def _two_devices(self):
+        a = [_row(0, 1, 1, "0 - 0"), _row(40, 1, 1, "15 - 0", "U", "Unknown (UNK)"),
+             _row(80, 1, 1, "15 - 0", "L", "Unforced Error (UE)")]
+        # The second laptop logs the same points a few seconds later, with more tags on the last one
+        b = [_row(3, 1, 1, "0 - 0"), _row(44, 1, 1, "15 - 0", "U", "Unknown (UNK)"),
+             _row(85, 1, 1, "15 - 0", "L", "Forced Error (FE)", serve="In (I)"), _row(130, 1, 1, "15 - 15")]
+        self._write(self.dirs[0], a)
+        self._write(self.dirs[1], b)
+
+    def test_same_match_on_two_devices(self):
+        self._two_devices()
+        stats, = merge_logs(self.dirs[:2], self.dirs[2])
+        self.assertEqual((stats["rows_in"], stats["rows_out"]), (7, 4))
+        self.assertEqual((stats["duplicates"], stats["conflicts"]), (2, 1))
+        rows = self._merged()
+        self.assertEqual([r["score_before_point"] for r in rows], ["0 - 0", "15 - 0", "15 - 0", "15 - 15"])
+        self.assertEqual(rows[2]["final_shot_type"], "Unforced Error (UE)")  # first input wins
+        conflict = [r for r in self._report() if r["kind"] == "conflict"][0]
+        self.assertEqual(conflict["fields"].split(), ["serve_code", "final_shot_type"])
+
+    def test_policies(self):
+        self._two_devices()
+        merge_logs(self.dirs[:2], self.dirs[2], policy="complete")
+        self.assertEqual(self._merged()[2]["final_shot_type"], "Forced Error (FE)")
+        merge_logs(self.dirs[:2], self.dirs[2], policy="both")
+        self.assertEqual(len(self._merged()), 5)
+        merge_logs(self.dirs[:2], self.dirs[2], policy="drop")
+        self.assertEqual(len(self._merged()), 3)
+
+    def test_copies_and_split_days(self):
+        morning = [_row(s, 1, 1, "0 - 0") for s in (0, 100, 200)]
+        afternoon = [dict(r, timestamp=r["timestamp"].replace("10:", "15:", 1), point_id=r["point_id"] + "1")
+                     for r in morning]
+        self._write(self.dirs[0], morning)
+        self._write(self.dirs[1], morning + afternoon)  # A copy of the first laptop's log, then more
+        self._write(self.dirs[1], morning, day="20250502")
+        results = merge_logs(self.dirs[:2], self.dirs[2])
+        self.assertEqual([r["day"] for r in results], [DAY, "20250502"])
+        self.assertEqual((results[0]["rows_out"], results[0]["duplicates"], results[0]["conflicts"]), (6, 3, 0))
+        rows = self._merged()
+        self.assertEqual(rows, sorted(rows, key=lambda r: (r["timestamp"], r["point_id"])))
+        self.assertEqual(len(self._merged("20250502")), 3)
+
+    def test_output_must_not_be_an_input(self):
+        self._write(self.dirs[0], [_row(0, 1, 1, "0 - 0")])
+        with self.assertRaises(ValueError):
+            merge_logs([self.dirs[0]], self.dirs[0])
+
+if __name__ == '__main__':
+    unittest.main()
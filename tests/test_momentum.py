@@ -0,0 +1,104 @@
+import unittest
+import random
+from tennis_logger.game_state import GameState
+from tennis_logger.momentum import MomentumTracker, RingWindow, game_winner, game_winners, score_counts
+
+def point(outcome, server="m", serve_number="1", how="Unknown (UNK)"):
+    return {"final_outcome": outcome, "server": server, "serve_number": serve_number,
+            "serve_code": "In (I)", "final_shot_type": how}
+
+class TestMomentum(unittest.TestCase):
+    def test_ring_window_undo_is_exact(self):
+        ring = RingWindow(window=3, undo_depth=5)
+        values = [1, 0, 1, 1, 0, 0, 1]
+        for v in values:
+            ring.push(v)
+        self.assertEqual((len(ring), ring.sum), (3, 1))
+        for i in range(len(values) - 1, 0, -1):
+            ring.pop()
+            expected = values[max(0, i - 3):i]
+            self.assertEqual((len(ring), ring.sum), (len(expected), sum(expected)))
+
+    def test_snapshot_matches_recomputation_through_random_undo(self):
+        rng = random.Random(7)
+        tracker = MomentumTracker(points_window=5, games_window=2, undo_depth=50)
+        pushed = []
+        for _ in range(300):
+            if pushed and rng.random() < 0.3:
+                tracker.pop()
+                pushed.pop()
+            else:
+                row = point(rng.choice("WWLU"), rng.choice("mo"), rng.choice("12"),
+                            rng.choice(["Unforced Error (UE)", "Forehand Winner (FW)"]))
+                tracker.push(row)
+                pushed.append(row)
+            window = pushed[-5:]
+            decided = [r for r in window if r["final_outcome"] in "WL"]
+            snap = tracker.snapshot()
+            self.assertEqual(snap["points"], len(window))
+            if decided:
+                won = sum(r["final_outcome"] == "W" for r in decided)
+                self.assertEqual(snap["win_rate"], round(100.0 * won / len(decided), 1))
+
+    def test_streak_and_games(self):
+        gs = GameState()
+        tracker = MomentumTracker(points_window=10, games_window=3)
+        for _ in range(4):
+            before = score_counts(gs)
+            gs.add_point('me')
+            tracker.push(point("W"), game_winner(before, gs))
+        snap = tracker.snapshot()
+        self.assertEqual((snap["streak"], snap["games"], snap["game_win_rate"]), (4, 1, 100.0))
+        tracker.pop()
+        self.assertEqual((tracker.snapshot()["streak"], tracker.snapshot()["games"]), (3, 0))
+        tracker.push(point("L", how="Unforced Error (UE)"))
+        self.assertEqual(tracker.snapshot()["streak"], -1)
+        self.assertEqual(tracker.snapshot()["unforced_rate"], 25.0)
+
+    def test_reset_starts_a_new_match(self):
+        tracker = MomentumTracker(points_window=5, games_window=3)
+        fresh = tracker.snapshot()
+        for outcome in "WWLW":
+            tracker.push(point(outcome), 'me')
+        tracker.reset()
+        self.assertEqual(tracker.snapshot(), fresh)
+        tracker.pop()  # Nothing left to undo
+        tracker.push(point("L"))
+        self.assertEqual((tracker.snapshot()["points"], tracker.snapshot()["streak"]), (1, -1))
+
+    def test_undo_past_the_depth_is_detected_and_rebuilt(self):
+        rng = random.Random(3)
+        gs = GameState()
+        tracker = MomentumTracker(points_window=5, games_window=2, undo_depth=3)
+        rows = []
+        for _ in range(40):
+            winner = rng.choice(["me", "opponent"])
+            row = dict(point("W" if winner == "me" else "L"), set_no=gs.current_set,
+                       game_no=gs.games_me + gs.games_opponent + 1)
+            before = score_counts(gs)
+            gs.add_point(winner)
+            tracker.push(row, game_winner(before, gs))
+            rows.append(row)
+        for _ in range(3):
+            tracker.pop()
+            gs.undo()
+            rows.pop()
+        self.assertTrue(tracker.exact())
+        for _ in range(5):
+            tracker.pop()
+            gs.undo()
+            rows.pop()
+        self.assertFalse(tracker.exact())
+        self.assertLess(tracker.snapshot()["points"], 5)
+        tracker.rebuild(game_winners(rows, (gs.current_set, gs.games_me + gs.games_opponent + 1)))
+        self.assertTrue(tracker.exact())
+        expected = MomentumTracker(points_window=5, games_window=2)
+        gs = GameState()
+        for row in rows:
+            before = score_counts(gs)
+            gs.add_point("me" if row["final_outcome"] == "W" else "opponent")
+            expected.push(row, game_winner(before, gs))
+        self.assertEqual(tracker.snapshot(), expected.snapshot())
+
+if __name__ == '__main__':
+    unittest.main()
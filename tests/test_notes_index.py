@@ -0,0 +1,81 @@
+import unittest
+import os
+import tempfile
+from tennis_logger.bitmap_index import BitmapIndex
+from tennis_logger.logfiles import day_of
+from tennis_logger.logger import MatchLogger
+from tennis_logger.notes_index import NotesIndex, parse_query, tokenize
+
+NOTES = [
+    ("W", "Short ball to the backhand, approached and volleyed"),
+    ("L", "He passed me down the line after a short approach"),
+    ("L", ""),
+    ("L", "Backhand slice into the net"),
+    ("W", "Ace out wide; he didn't move"),
+]
+
+class TestNotesIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logger = MatchLogger(os.path.join(self.tmpdir.name, "tennis_log"))
+        self.logger.log_points([{"final_outcome": outcome, "notes": note} for outcome, note in NOTES])
+        self.day = day_of(self.logger.filename)
+        self.index = NotesIndex(self.tmpdir.name)
+        self.index.refresh()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _rows(self, query, **kwargs):
+        return [row for _, row, _, _ in self.index.search(query, **kwargs)]
+
+    def test_tokens_and_query_parsing(self):
+        self.assertEqual(tokenize("Ace out wide; he didn't move"), ["ace", "out", "wide", "he", "didn't", "move"])
+        self.assertEqual(parse_query('"Short ball" appr* -slice'),
+                         [(False, ["short", "ball"]), (False, ["appr*"]), (True, ["slice"])])
+
+    def test_word_prefix_phrase_and_exclusion(self):
+        self.assertEqual(self._rows("backhand"), [0, 3])
+        self.assertEqual(self._rows("appr*"), [0, 1])
+        self.assertEqual(self._rows('"short ball"'), [0])
+        self.assertEqual(self._rows('"short appr*"'), [1])
+        self.assertEqual(self._rows("backhand -slice"), [0])
+        self.assertEqual(self._rows('"ball short"'), [])
+        day, row, point_id, text = self.index.search("didn't")[0]
+        self.assertEqual((day, row, text), (self.day, 4, NOTES[4][1]))
+        self.assertTrue(point_id)
+
+    def test_join_with_categorical_filters(self):
+        bitmaps = BitmapIndex(self.tmpdir.name)
+        bitmaps.refresh()
+        self.assertEqual(self._rows("short", bitmaps=bitmaps, final_outcome="L"), [1])
+        with self.assertRaises(ValueError):
+            self.index.search("short", final_outcome="L")
+
+    def test_incremental_and_persisted(self):
+        self.logger.log_point({"final_outcome": "L", "notes": "Short ball again"})
+        self.assertEqual(self.index.refresh(), [self.day])
+        self.assertEqual(self._rows("short"), [0, 1, 5])
+        self.logger.undo_last_log()
+        self.logger.log_point({"final_outcome": "L", "notes": "Lob over my head"})
+        self.index.refresh()
+        self.assertEqual(self._rows("short"), [0, 1])
+        reloaded = NotesIndex(self.tmpdir.name)
+        self.assertEqual(reloaded.refresh(), [])
+        self.assertEqual([row for _, row, _, _ in reloaded.search("lob")], [5])
+
+    def test_point_rewrites_only_todays_segment(self):
+        with open(self.logger.filename, "rb") as f:
+            header = f.readline()
+        with open(os.path.join(self.tmpdir.name, "tennis_log_20240101.csv"), "wb") as f:
+            f.write(header)
+        self.assertEqual(self.index.refresh(), ["20240101"])
+        old_segment = os.path.join(self.index.path, "20240101.seg")
+        os.utime(old_segment, (0, 0))
+        self.logger.log_point({"final_outcome": "W", "notes": "Short ball winner"})
+        self.assertEqual(self.index.refresh(), [self.day])
+        self.assertEqual(os.path.getmtime(old_segment), 0)
+        self.assertEqual([row for _, row, _, _ in NotesIndex(self.tmpdir.name).search("winner")], [5])
+
+if __name__ == '__main__':
+    unittest.main()
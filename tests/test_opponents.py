@@ -0,0 +1,80 @@
+import unittest
+import csv
+import os
+import tempfile
+from datetime import datetime, timedelta
+from tennis_logger.livelog import lock_path
+from tennis_logger.logger import MatchLogger
+from tennis_logger.matches import MatchRegistry
+from tennis_logger.opponents import OpponentStore
+from tennis_logger.reader import MatchLogReader
+
+class TestOpponents(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self.tmpdir.name, "tennis_log")
+        self.registry = MatchRegistry(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _play(self, logger, opponent, points, surface="Clay", now=None):
+        """points: [(server, serve_number, outcome)]"""
+        entry = self.registry.start(opponent, surface, "Best of 3", now=now)
+        logger.match_id = entry["match_id"]
+        logger.log_points([{"set_no": 1, "game_no": 1, "server": server, "serve_number": number,
+                            "final_outcome": outcome} for server, number, outcome in points])
+        self.registry.close(entry["match_id"])
+        return entry
+
+    def test_old_header_is_upgraded(self):
+        logger = MatchLogger(self.base)
+        os.remove(lock_path(logger.filename))  # A log written before commit records
+        old_columns = MatchLogger.SCHEMA_COLUMNS[:-1]
+        with open(logger.filename, mode='w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(old_columns)
+            writer.writerow(["1", "2025-05-01 10:00:00"] + [""] * (len(old_columns) - 2))
+        logger = MatchLogger(self.base)
+        logger.match_id = "20250501100000"
+        logger.log_point({"final_outcome": "W"})
+        with MatchLogReader(logger.filename) as reader:
+            self.assertEqual(reader.header, MatchLogger.SCHEMA_COLUMNS)
+            self.assertEqual([r["match_id"] for r in reader], ["", "20250501100000"])
+            self.assertEqual(reader[0]["timestamp"], "2025-05-01 10:00:00")
+        self.assertEqual(logger.undo_last_log()["match_id"], "20250501100000")
+
+    def test_registry(self):
+        now = datetime(2025, 5, 1, 10, 0, 0)
+        first = self.registry.start("J. Smith", "Clay", "Best of 3", now=now)
+        second = self.registry.start("A. Jones", "Hard", "One set", now=now)
+        self.assertNotEqual(first["match_id"], second["match_id"])
+        self.assertEqual(self.registry.current(), second)
+        self.registry.close(second["match_id"], now=now + timedelta(hours=1))
+        self.assertEqual(self.registry.current(), first)
+        reloaded = MatchRegistry(self.tmpdir.name)
+        self.assertEqual([m["match_id"] for m in reloaded.query(opponent="j. smith")], [first["match_id"]])
+        self.assertEqual(reloaded.query(closed=True), [second])
+        self.assertEqual(reloaded.opponents(), ["A. Jones", "J. Smith"])
+
+    def test_incremental_store(self):
+        logger = MatchLogger(self.base)
+        now = datetime.now()
+        self._play(logger, "J. Smith", [("m", "2", "L"), ("m", "2", "L"), ("m", "2", "W"), ("o", "1", "W")], now=now)
+        self._play(logger, "A. Jones", [("m", "2", "W")], now=now)
+        store = OpponentStore(self.tmpdir.name)
+        self.assertEqual(len(store.refresh()), 2)
+        self.assertEqual(store.refresh(), [])
+        self.assertAlmostEqual(store.their_win_rate("j. smith", "my_serve_2"), 66.7)
+        self.assertEqual(store.lookup("J. Smith", "their_serve_1")["won"], 1)
+        self.assertEqual(store.lookup("J. Smith", "surface_clay")["points"], 4)
+
+        self._play(logger, "J. Smith", [("m", "2", "W")], now=now + timedelta(seconds=1))
+        store = OpponentStore(self.tmpdir.name)
+        self.assertEqual(len(store.refresh()), 1)
+        self.assertEqual(store.their_win_rate("J. Smith", "my_serve_2"), 50.0)
+        self.assertEqual(store.report("J. Smith")[0]["situation"], "all")
+        self.assertIsNone(store.their_win_rate("Nobody"))
+
+if __name__ == '__main__':
+    unittest.main()
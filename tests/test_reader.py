@@ -0,0 +1,55 @@
+import unittest
+import os
+import tempfile
+from tennis_logger.logger import MatchLogger
+from tennis_logger.reader import MatchLogReader
+
+class TestMatchLogReader(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logger = MatchLogger(base_filename=os.path.join(self.tmpdir.name, "tennis_log"))
+        for game in range(1, 4):
+            for point in range(3):
+                self.logger.log_point({"set_no": 1, "game_no": game, "final_outcome": "W",
+                                       "notes": f"g{game}p{point}"})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_indexing_and_slicing(self):
+        with MatchLogReader(self.logger.filename) as reader:
+            self.assertEqual(len(reader), 9)
+            self.assertEqual(reader.header, MatchLogger.SCHEMA_COLUMNS)
+            self.assertEqual(reader[0]["notes"], "g1p0")
+            self.assertEqual(reader[-1]["notes"], "g3p2")
+            self.assertEqual([r["notes"] for r in reader[2:4]], ["g1p2", "g2p0"])
+            self.assertEqual([r["notes"] for r in reader.tail(2)], ["g3p1", "g3p2"])
+            self.assertEqual(list(reader.column("game_no", 0, 4)), ["1", "1", "1", "2"])
+            self.assertEqual(len(reader.points_of_game(2, set_no=1)), 3)
+
+    def test_quoted_newline_and_partial_row(self):
+        self.logger.log_point({"notes": "line one\nline two, with comma"})
+        with open(self.logger.filename, "a", newline="") as f:
+            f.write("partial,row")
+        with MatchLogReader(self.logger.filename) as reader:
+            self.assertEqual(len(reader), 10)
+            self.assertEqual(reader[-1]["notes"], "line one\nline two, with comma")
+
+    def test_refresh_and_undo_truncation(self):
+        with MatchLogReader(self.logger.filename) as reader:
+            self.logger.log_point({"notes": "late"})
+            self.assertEqual(reader.refresh(), 10)
+            self.assertEqual(reader[-1]["notes"], "late")
+
+        removed = self.logger.undo_last_log()
+        self.assertEqual(removed["notes"], "late")
+        self.assertEqual(self.logger.get_last_point_data()["notes"], "g3p2")
+        self.logger.redo_last_log()
+        self.assertEqual(self.logger.get_last_point_data()["notes"], "late")
+
+    def test_from_bytes(self):
+        reader = MatchLogReader.from_bytes(b"a,b\r\n1,2\r\n3,4\r\n")
+        self.assertEqual(reader[-1], {"a": "3", "b": "4"})
+
+if __name__ == '__main__':
+    unittest.main()
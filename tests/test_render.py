@@ -0,0 +1,54 @@
+import unittest
+from tennis_logger.render import RenderScheduler
+
+class FakeWidget:
+    def __init__(self):
+        self.idle = []
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+    def run_idle(self):
+        callbacks, self.idle = self.idle, []
+        for callback in callbacks:
+            callback()
+
+class FakeLabel:
+    def __init__(self):
+        self.configured = []
+
+    def configure(self, text):
+        self.configured.append(text)
+
+class TestRenderScheduler(unittest.TestCase):
+    def test_bursts_coalesce_into_one_frame(self):
+        widget = FakeWidget()
+        scheduler = RenderScheduler(widget)
+        calls = []
+        scheduler.register("score", lambda: calls.append("score"))
+        scheduler.register("timestamp", lambda: calls.append("timestamp"))
+
+        for _ in range(10):  # e.g. a burst of undo clicks
+            scheduler.mark_dirty("score")
+        scheduler.mark_dirty("timestamp")
+        self.assertEqual(len(widget.idle), 1)
+        widget.run_idle()
+        self.assertEqual(calls, ["score", "timestamp"])
+
+        stats = scheduler.stats()
+        self.assertEqual((stats["frames"], stats["requests"], stats["coalesced"]), (1, 11, 10))
+
+        scheduler.mark_dirty()
+        widget.run_idle()
+        self.assertEqual(calls[2:], ["score", "timestamp"])
+
+    def test_set_text_skips_unchanged_labels(self):
+        scheduler = RenderScheduler(FakeWidget())
+        label = FakeLabel()
+        self.assertTrue(scheduler.set_text(label, "15 - 0"))
+        self.assertFalse(scheduler.set_text(label, "15 - 0"))
+        scheduler.set_text(label, "30 - 0")
+        self.assertEqual(label.configured, ["15 - 0", "30 - 0"])
+
+if __name__ == '__main__':
+    unittest.main()
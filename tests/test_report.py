@@ -0,0 +1,55 @@
+import unittest
+import json
+import os
+import tempfile
+from tennis_logger.report import Report, build_reports
+
+def fake_render(spec, path):
+    with open(path, "w") as f:
+        json.dump(spec, f)
+    return path
+
+def make_report(directory, pattern_rates):
+    report = Report(directory, renderer=fake_render)
+    report.text("# Match KPIs\n")
+    report.chart("win_rate_by_server", "Win Rate by Server", ["m", "o"], [55.0, 40.0])
+    report.chart("win_rate_by_pattern", "Win Rate by Pattern", ["Rally (R)", "Net Play (N)"], pattern_rates)
+    report.section("Patterns", ["Rally (R)", "Net Play (N)"], pattern_rates)
+    return report
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_unchanged_charts_are_skipped(self):
+        report = make_report(self.dir, [50.0, 70.0])
+        md_path = report.build(html=True)
+        self.assertEqual(sorted(report.stats["rendered"]), ["win_rate_by_pattern", "win_rate_by_server"])
+        with open(md_path) as f:
+            md = f.read()
+        self.assertIn("![Win Rate by Pattern](figures/win_rate_by_pattern.png)", md)
+        self.assertIn("- Net Play (N): 70.0%", md)
+        self.assertTrue(os.path.isfile(os.path.join(self.dir, "match_kpis.html")))
+
+        report = make_report(self.dir, [50.0, 75.0])
+        report.build()
+        self.assertEqual((report.stats["rendered"], report.stats["skipped"]),
+                         (["win_rate_by_pattern"], ["win_rate_by_server"]))
+        with open(os.path.join(self.dir, "figures", "win_rate_by_pattern.png")) as f:
+            self.assertEqual(json.load(f)["values"], [50.0, 75.0])
+
+    def test_reports_share_a_process_pool(self):
+        reports = [make_report(os.path.join(self.dir, player), [float(i), 60.0])
+                   for i, player in enumerate(("alice", "bob"))]
+        paths = build_reports(reports, workers=2)
+        self.assertEqual([os.path.basename(p) for p in paths], ["match_kpis.md", "match_kpis.md"])
+        for report in reports:
+            self.assertEqual(len(report.stats["rendered"]), 2)
+            self.assertEqual(len(os.listdir(report.fig_dir)), 3)  # two charts + manifest
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import asyncio
+import os
+import tempfile
+import time
+from tennis_logger.game_state import GameState
+from tennis_logger.logger import MatchLogger
+from tennis_logger.reader import MatchLogReader
+from tennis_logger.server import IngestClient, IngestServer, apply_points, score_points
+
+def point(winner, server="m"):
+    return {"winner": winner, "server": server, "serve_number": "1", "serve_code": "In (I)", "pattern": "Rally (R)"}
+
+class TestIngestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logger = MatchLogger(os.path.join(self.tmpdir.name, "tennis_log"))
+        self.game_state = GameState()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_with_server(self, scenario, apply_batch=None, queue_size=1024):
+        async def run():
+            server = await IngestServer(apply_batch or (lambda pts: apply_points(self.logger, self.game_state, pts)),
+                                        port=0, queue_size=queue_size).start()
+            try:
+                return await scenario(server)
+            finally:
+                await server.stop()
+        return asyncio.run(run())
+
+    def test_batches_logged_in_order_with_idempotent_retries(self):
+        async def scenario(server):
+            phone = await IngestClient("phone", port=server.port).connect()
+            first = await phone.log([point("me"), point("me")])
+            retry = await phone.log([point("me"), point("me")], seq=first["seq"])
+            second = await phone.log([point("opponent"), point("unknown")])
+            await phone.close()
+            return first, retry, second, server.stats
+        first, retry, second, stats = self.run_with_server(scenario)
+        self.assertEqual(retry, dict(first, duplicate=True))
+        self.assertEqual(len(set(first["point_ids"] + second["point_ids"])), 4)
+        self.assertEqual((stats["points"], stats["duplicates"]), (4, 1))
+        with MatchLogReader(self.logger.filename) as reader:
+            rows = list(reader)
+        self.assertEqual([r["score_before_point"] for r in rows], ["0 - 0", "15 - 0", "30 - 0", "30 - 15"])
+        self.assertEqual([r["final_outcome"] for r in rows], ["W", "W", "L", "U"])
+        self.assertEqual(rows[0]["point_id"], first["point_ids"][0])
+        self.assertEqual(self.game_state.get_display_score(), "30 - 15")
+
+    def test_failed_and_out_of_order_batches_applied_on_retry(self):
+        fail = [True]
+        def flaky_apply(points):
+            if fail:
+                fail.pop()
+                raise OSError("disk full")
+            return apply_points(self.logger, self.game_state, points)
+        async def scenario(server):
+            phone = await IngestClient("phone", port=server.port).connect()
+            failed = await phone.log([point("me")], seq=1)
+            ahead = await phone.log([point("me")], seq=3)
+            retried = await phone.log([point("me")], seq=1)
+            late = await phone.log([point("opponent")], seq=2)
+            again = await phone.log([point("me")], seq=3)
+            await phone.close()
+            return failed, ahead, retried, late, again, server.stats
+        failed, ahead, retried, late, again, stats = self.run_with_server(scenario, apply_batch=flaky_apply)
+        self.assertIn("error", failed)
+        self.assertNotIn("point_ids", failed)
+        for reply in (ahead, retried, late):
+            self.assertEqual(len(reply["point_ids"]), 1)
+            self.assertNotIn("duplicate", reply)
+        self.assertEqual(again, dict(ahead, duplicate=True))
+        self.assertEqual((stats["points"], stats["duplicates"], stats["errors"]), (3, 1, 1))
+        with MatchLogReader(self.logger.filename) as reader:
+            self.assertEqual([r["final_outcome"] for r in reader], ["W", "W", "L"])
+
+    def test_invalid_seqs_rejected(self):
+        async def scenario(server):
+            phone = await IngestClient("phone", port=server.port).connect()
+            replies = [await phone.log([point("me")], seq=seq) for seq in (0, -1, "3", True, 1.0)]
+            logged = await phone.log([point("me")], seq=1)
+            await phone.close()
+            return replies, logged, server.stats
+        replies, logged, stats = self.run_with_server(scenario)
+        for reply in replies:
+            self.assertIn("bad seq", reply["error"])
+            self.assertNotIn("point_ids", reply)
+        self.assertEqual(len(logged["point_ids"]), 1)
+        self.assertEqual((stats["points"], stats["duplicates"], stats["errors"]), (1, 0, 5))
+
+    def test_stop_closes_open_connections(self):
+        async def scenario(server):
+            phone = await IngestClient("phone", port=server.port).connect()
+            await phone.log([point("me")])
+            await asyncio.wait_for(server.stop(), timeout=5)
+            closed = await asyncio.wait_for(phone._reader.read(), timeout=5)
+            return closed, server._handlers
+        closed, handlers = self.run_with_server(scenario)
+        self.assertEqual(closed, b"")
+        self.assertEqual(handlers, set())
+
+    def test_failed_write_rolls_back_the_score(self):
+        apply_points(self.logger, self.game_state, [point("me")])
+        def failing_write(rows):
+            raise OSError("disk full")
+        with self.assertRaises(OSError):
+            score_points(self.game_state, [point("me"), point("unknown"), point("opponent")], failing_write)
+        self.assertEqual(self.game_state.get_display_score(), "15 - 0")
+        self.assertEqual(len(self.game_state.match_history), 1)
+        rows = apply_points(self.logger, self.game_state, [point("me")])
+        self.assertEqual(rows[0]["score_before_point"], "15 - 0")
+
+    def test_throughput_from_several_clients(self):
+        batches, size = 50, 20
+        async def scenario(server):
+            clients = [await IngestClient(f"device-{i}", port=server.port).connect() for i in range(3)]
+            started = time.perf_counter()
+            async def pump(client):
+                for _ in range(batches):
+                    await client.send([point("me") for _ in range(size)])
+                return [await client.receive() for _ in range(batches)]
+            replies = await asyncio.gather(*(pump(c) for c in clients))
+            elapsed = time.perf_counter() - started
+            for client in clients:
+                await client.close()
+            return replies, elapsed
+        replies, elapsed = self.run_with_server(scenario)
+        for client_replies in replies:
+            self.assertEqual([r["seq"] for r in client_replies], list(range(1, batches + 1)))
+        total = 3 * batches * size
+        self.assertGreater(total / elapsed, 1000)  # events/sec
+        with MatchLogReader(self.logger.filename) as reader:
+            self.assertEqual(len(reader), total)
+
+    def test_backpressure_on_slow_writer(self):
+        applied = []
+        async def slow_apply(points):
+            await asyncio.sleep(0.01)
+            applied.append(len(points))
+            return [{"point_id": str(len(applied))}]
+        async def scenario(server):
+            client = await IngestClient("tablet", port=server.port).connect()
+            for _ in range(10):
+                await client.send([point("me")])
+            await asyncio.sleep(0.02)
+            queued = server._queue.qsize()
+            replies = [await client.receive() for _ in range(10)]
+            await client.close()
+            return queued, replies
+        queued, replies = self.run_with_server(scenario, apply_batch=slow_apply, queue_size=2)
+        self.assertLessEqual(queued, 2)
+        self.assertEqual([r["point_ids"] for r in replies], [[str(i)] for i in range(1, 11)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import os
+import tempfile
+import threading
+from tennis_logger.reader import MatchLogReader
+from tennis_logger.sessions import SessionRegistry, session_base
+
+def point(winner):
+    return {"winner": winner, "server": "m", "serve_number": "1", "serve_code": "In (I)"}
+
+class TestSessions(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.registry = SessionRegistry(self.tmpdir.name, writers=4)
+
+    def tearDown(self):
+        self.registry.shutdown()
+        self.tmpdir.cleanup()
+
+    def test_sessions_are_isolated_partitions(self):
+        self.registry.log_point("court1", point("me")).result()
+        row = self.registry.log_point("court2", point("opponent")).result()
+        self.assertEqual(row["score_before_point"], "0 - 0")
+        court1, court2 = self.registry.get("court1"), self.registry.get("court2")
+        self.assertEqual((court1.game_state.points_me, court2.game_state.points_opponent), (1, 1))
+        self.assertNotEqual(court1.logger.filename, court2.logger.filename)
+        self.assertIn("tennis_log_court1_", os.path.basename(court1.logger.filename))
+        with self.assertRaises(ValueError):
+            session_base("tennis_log", "../court")
+
+    def test_concurrent_producers_keep_per_session_order(self):
+        courts = [f"court{i}" for i in range(12)]
+        futures = {court: [] for court in courts}
+
+        def produce(court):
+            for n in range(40):
+                futures[court].append(self.registry.log_point(court, dict(point("me"), notes=str(n))))
+
+        threads = [threading.Thread(target=produce, args=(court,)) for court in courts]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for court in courts:
+            ids = [f.result()["point_id"] for f in futures[court]]
+            session = self.registry.get(court)
+            with MatchLogReader(session.logger.filename) as reader:
+                self.assertEqual(list(reader.column("notes")), [str(n) for n in range(40)])
+                self.assertEqual(list(reader.column("point_id")), ids)
+            self.assertEqual(session.points, 40)
+            # 40 points won in a row: 10 games
+            self.assertEqual(session.game_state.games_me, 4)
+            self.assertEqual(session.game_state.sets_me, 1)
+
+    def test_bad_batch_fails_only_its_own_future(self):
+        session = self.registry.open("court1")
+        with session.lock:  # Hold the writer so the batches queue up and share a round
+            good = self.registry.log_points("court1", [point("me")])
+            bad = self.registry.log_points("court1", [point("me"), "not a point"])
+            later = self.registry.log_points("court1", [point("me")])
+        self.assertEqual(len(good.result()), 1)
+        self.assertEqual(later.result()[0]["score_before_point"], "15 - 0")
+        self.assertIsNotNone(bad.exception())
+        self.assertEqual(session.game_state.get_display_score(), "30 - 0")
+        self.assertEqual(session.points, 2)
+        with MatchLogReader(session.logger.filename) as reader:
+            self.assertEqual(len(reader), 2)
+
+    def test_persisted_score_history_not_resumed(self):
+        registry = SessionRegistry(self.tmpdir.name, writers=1, persist_history=True)
+        registry.log_point("court1", point("me")).result()
+        self.assertEqual(len(registry.get("court1").game_state.match_history), 1)
+        registry.shutdown()
+        reopened = SessionRegistry(self.tmpdir.name, writers=1, persist_history=True)
+        session = reopened.open("court1")
+        self.assertEqual(len(session.game_state.match_history), 0)  # Would undo into the old score
+        reopened.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
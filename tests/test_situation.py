@@ -0,0 +1,41 @@
+import unittest
+from tennis_logger.export import normalize_row
+from tennis_logger.game_state import (GameState, BREAK_POINT, GAME_POINT, DEUCE, SET_POINT,
+                                      MATCH_POINT, SERVING_FOR_SET, decode_situation, situation_mask)
+
+class TestSituationFlags(unittest.TestCase):
+    def test_break_and_game_point(self):
+        gs = GameState()
+        gs.points_me, gs.points_opponent = 1, 3  # 15 - 40
+        self.assertEqual(gs.situation_flags('me'), BREAK_POINT)
+        self.assertEqual(gs.situation_flags('opponent'), GAME_POINT)
+        self.assertEqual(gs.get_display_score(), "15 - 40")  # looking ahead leaves the score alone
+        self.assertEqual(len(gs.match_history), 0)
+
+    def test_no_ad_deciding_point(self):
+        gs = GameState()
+        gs.points_me = gs.points_opponent = 3
+        flags = gs.situation_flags('me')
+        self.assertEqual(flags, DEUCE | GAME_POINT | BREAK_POINT)
+        gs.no_ad_mode = False
+        self.assertEqual(gs.situation_flags('me'), DEUCE)
+
+    def test_set_match_point_and_serving_for_set(self):
+        gs = GameState()
+        gs.sets_me = 1
+        gs.games_me, gs.games_opponent = 5, 3
+        self.assertTrue(gs.situation_flags('me') & SERVING_FOR_SET)
+        self.assertFalse(gs.situation_flags('opponent') & SERVING_FOR_SET)
+        gs.points_me = 3
+        flags = gs.situation_flags('me')
+        self.assertEqual(flags & (GAME_POINT | SET_POINT | MATCH_POINT), GAME_POINT | SET_POINT | MATCH_POINT)
+        self.assertEqual(decode_situation(str(flags)), ['GAME_POINT', 'SET_POINT', 'MATCH_POINT', 'SERVING_FOR_SET'])
+        self.assertEqual(flags & situation_mask('MATCH_POINT'), MATCH_POINT)
+
+    def test_export_decodes_bitfield(self):
+        row = normalize_row({"pressure_flags": str(BREAK_POINT | DEUCE)})
+        self.assertEqual(row["pressure_flags"], "BREAK_POINT;DEUCE")
+        self.assertEqual(normalize_row({"pressure_flags": "0"})["pressure_flags"], "")
+
+if __name__ == '__main__':
+    unittest.main()
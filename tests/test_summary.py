@@ -0,0 +1,57 @@
+import unittest
+import csv
+import os
+import tempfile
+from tennis_logger.logger import MatchLogger
+from tennis_logger.summary import SummaryStore
+
+def row(set_no, game_no, outcome, server="m", serve_number="1", pattern="Rally (R)"):
+    return {"set_no": set_no, "game_no": game_no, "final_outcome": outcome, "server": server,
+            "serve_number": serve_number, "pattern": pattern, "timestamp": f"10:{game_no:02d}"}
+
+class TestSummaryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, day, rows):
+        with open(os.path.join(self.dir, f"tennis_log_{day}.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def test_day_and_match_rows(self):
+        self.write("20250101", [
+            row(1, 1, "W"), row(1, 1, "L", serve_number="2"), row(1, 2, "W", server="o", pattern="Approach (A)|Net Play (N)"),
+            row(1, 1, "W", server="o"), row(1, 1, "U"),  # score went back: second match
+        ])
+        store = SummaryStore(self.dir)
+        self.assertEqual(store.refresh(), ["20250101"])
+        day, = store.rows("day")
+        self.assertEqual((day["matches"], day["points"], day["won"], day["lost"]), (2, 5, 3, 1))
+        self.assertEqual((day["serve_points"], day["serve_won"], day["return_points"], day["return_won"]), (2, 1, 2, 2))
+        self.assertEqual((day["second_serve_points"], day["second_serve_won"]), (1, 0))
+        self.assertEqual((day["pattern_R"], day["pattern_N"], day["pattern_N_won"]), (4, 1, 1))
+        self.assertEqual(day["win_rate"], 75.0)
+        matches = store.rows("match")
+        self.assertEqual([(m["match_no"], m["points"]) for m in matches], [(1, 3), (2, 2)])
+        self.assertEqual(matches[0]["first_timestamp"], "10:01")
+
+    def test_incremental_and_persisted(self):
+        self.write("20250101", [row(1, 1, "W")])
+        SummaryStore(self.dir).refresh()
+        store = SummaryStore(self.dir)
+        self.assertEqual(store.refresh(), [])
+        self.write("20250102", [row(1, 1, "L"), row(1, 1, "W")])
+        self.assertEqual(store.refresh(), ["20250102"])
+        self.assertEqual(store.total()["points"], 3)
+        self.assertEqual(store.total(since="20250102")["won"], 1)
+        os.remove(os.path.join(self.dir, "tennis_log_20250101.csv"))
+        store.refresh()
+        self.assertEqual([r["date"] for r in SummaryStore(self.dir).rows()], ["20250102"])
+
+if __name__ == '__main__':
+    unittest.main()
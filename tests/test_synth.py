@@ -0,0 +1,62 @@
+import unittest
+import io
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime
+from tennis_logger.logger import MatchLogger
+from tennis_logger.reader import MatchLogReader
+from tennis_logger.synth import MatchSimulator, log_matches, main, write_daily_logs
+
+class TestSynth(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_deterministic_complete_match(self):
+        rows = list(MatchSimulator(seed=5).match())
+        self.assertEqual(rows, list(MatchSimulator(seed=5).match()))
+        self.assertNotEqual(rows, list(MatchSimulator(seed=6).match()))
+        self.assertGreater(len(rows), 40)
+        self.assertEqual(rows[0]["score_before_point"], "0 - 0")
+        self.assertIn(rows[-1]["set_no"], (2, 3))
+        self.assertEqual(len({r["point_id"] for r in rows}), len(rows))
+        for row in rows:
+            if row["serve_code"] == "Double Fault (DF)":
+                self.assertEqual((row["serve_number"], row["final_shot_type"]), ("2", "Double Fault (DF)"))
+                self.assertIn(row["final_outcome"], ("W" if row["server"] == "o" else "L", "U"))
+
+    def test_bulk_files_and_logger(self):
+        paths = write_daily_logs(self.dir, days=3, matches_per_day=2, seed=1, start=datetime(2025, 1, 30))
+        self.assertEqual([os.path.basename(p) for p in paths],
+                         ["tennis_log_20250130.csv", "tennis_log_20250131.csv", "tennis_log_20250201.csv"])
+        with MatchLogReader(paths[0]) as reader:
+            self.assertEqual(reader.header, MatchLogger.SCHEMA_COLUMNS)
+            self.assertTrue(reader[0]["timestamp"].startswith("2025-01-30 09:"))
+
+        logger = MatchLogger(os.path.join(self.dir, "live"))
+        count = log_matches(logger, matches=1, seed=1)
+        with MatchLogReader(logger.filename) as reader:
+            self.assertEqual(len(reader), count)
+
+    def test_existing_logs_are_not_overwritten(self):
+        path, = write_daily_logs(self.dir, days=1, seed=1, start=datetime(2025, 1, 31))
+        with open(path, mode='rb') as f:
+            original = f.read()
+        with self.assertRaises(FileExistsError):
+            write_daily_logs(self.dir, days=2, seed=2, start=datetime(2025, 1, 30))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "tennis_log_20250130.csv")))  # Nothing written
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["--dir", self.dir, "--start", "20250131"])
+        with open(path, mode='rb') as f:
+            self.assertEqual(f.read(), original)
+        with redirect_stdout(io.StringIO()):
+            main(["--dir", self.dir, "--start", "20250131", "--seed", "2", "--force"])
+        with open(path, mode='rb') as f:
+            self.assertNotEqual(f.read(), original)
+
+if __name__ == '__main__':
+    unittest.main()
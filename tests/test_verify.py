@@ -0,0 +1,64 @@
+import unittest
+import csv
+import os
+import tempfile
+from datetime import datetime
+from tennis_logger.logger import MatchLogger
+from tennis_logger.synth import write_daily_logs
+from tennis_logger.verify import format_divergences, main, verify_logs
+
+class TestVerify(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.paths = write_daily_logs(self.dir, days=3, matches_per_day=2, seed=11, start=datetime(2025, 5, 1))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_consistent_logs_pass(self):
+        results = verify_logs(self.dir, workers=2)
+        self.assertEqual([r["day"] for r in results], ["20250501", "20250502", "20250503"])
+        self.assertEqual([len(r["matches"]) for r in results], [2, 2, 2])
+        self.assertEqual(format_divergences(results), [])
+
+    def test_first_divergence_per_match(self):
+        with open(self.paths[1], newline="") as f:
+            rows = list(csv.DictReader(f))
+        # An "Unknown" winner that really was a point won: the next row's score no longer replays
+        i = next(i for i, r in enumerate(rows[5:], start=5) if r["final_outcome"] == "W"
+                 and rows[i + 1]["game_no"] == r["game_no"])
+        rows[i]["final_outcome"] = "U"
+        rows[i + 3]["final_outcome"] = "U"  # later drift in the same match is not reported again
+        with open(self.paths[1], "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        results = verify_logs(self.dir, workers=1)
+        drifted = [(r["day"], n, m["divergence"]) for r in results for n, m in enumerate(r["matches"])
+                   if m["divergence"]]
+        self.assertEqual(len(drifted), 1)
+        day, match_no, divergence = drifted[0]
+        self.assertEqual((day, match_no, divergence["row"], divergence["field"]),
+                         ("20250502", 0, i + 1, "score_before_point"))
+        self.assertEqual(main(["--dir", self.dir, "--workers", "1"]), 1)
+
+    def test_legacy_score_after_point(self):
+        legacy_dir = os.path.join(self.dir, "legacy")
+        path, = write_daily_logs(legacy_dir, days=1, seed=4)
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        # Old logs recorded the score after add_point: each row holds the next row's "before" score
+        for row, after in zip(rows, rows[1:]):
+            for field in ("set_no", "game_no", "score_before_point"):
+                row[field] = after[field]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=MatchLogger.SCHEMA_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows[:-1])
+        self.assertEqual(main(["--dir", legacy_dir, "--legacy-after"]), 0)
+        self.assertEqual(main(["--dir", legacy_dir]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime
+from tennis_logger.archive import list_log_days
+from tennis_logger.synth import write_daily_logs
+from tennis_logger.video import VideoClock, VideoIndex, main
+
+class TestVideoIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        write_daily_logs(self.dir, days=1, seed=2, start=datetime(2025, 5, 1))
+        self.source, = list_log_days(self.dir)
+        with self.source.open() as reader:
+            self.rows = list(reader)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_clock_interpolates_sync_marks(self):
+        clock = VideoClock("2025-05-01 09:00:00", [("2025-05-01 10:00:00", 3500), ("2025-05-01 11:00:00", 7200)])
+        start = datetime(2025, 5, 1, 9, 0).timestamp()
+        self.assertEqual(clock.offset(start + 1800), 1700)  # before the first mark: its shift
+        self.assertEqual(clock.offset(start + 5400), 5350)  # halfway between the marks
+        self.assertEqual(VideoClock("2025-05-01 09:00:00").offset(start + 60), 60)
+
+    def test_seek_range_and_exports(self):
+        index = VideoIndex.build(self.source, "2025-05-01 08:59:00", video_path="court 1.mp4")
+        path = VideoIndex.path_for(self.dir, "tennis_log", "20250501")
+        index.save(path)
+        index = VideoIndex.load(path)
+        self.assertEqual(len(index), len(self.rows))
+
+        first = self.rows[0]
+        self.assertEqual(index.seek(first["point_id"]), index.offset_of_row(0))
+        self.assertGreater(index.offset_of_row(0), 60)
+        self.assertIsNone(index.seek("nope"))
+        window = index.points_between(index.offset_of_row(3), index.offset_of_row(6))
+        self.assertEqual([row for _, row in window], [3, 4, 5, 6])
+
+        errors = [i for i, r in enumerate(self.rows) if r["final_shot_type"] == "Unforced Error (UE)"]
+        cuts = index.cut_list(errors, pre=5, post=1)
+        self.assertEqual(cuts.count("file 'court 1.mp4'"), len(errors))
+        self.assertIn("inpoint", cuts)
+        chapters = index.chapters(pre=60)  # overlapping clips merge
+        self.assertLess(chapters.count("[CHAPTER]"), len(self.rows))
+
+        out = os.path.join(self.dir, "cuts.txt")
+        main(["export", "20250501", "final_shot_type=Unforced Error (UE)", "--dir", self.dir,
+              "--format", "ffmpeg", "--pre", "5", "--post", "1", "--out", out])
+        with open(out) as f:
+            self.assertEqual(f.read(), cuts)
+
+if __name__ == '__main__':
+    unittest.main()